@@ -1,19 +1,48 @@
+import functools
+import json
 import logging
 import os
 import re
-from typing import Optional, Dict, Any, Tuple, List
-
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from types import MappingProxyType
+from typing import Optional, Dict, Any, Iterable, Tuple, List
+
+import requests
+from google.api_core.exceptions import (
+    BadGateway, GatewayTimeout, InternalServerError, ServiceUnavailable, TooManyRequests
+)
 from google.cloud import bigquery
-from google.cloud.exceptions import GoogleCloudError
+from google.cloud.exceptions import GoogleCloudError, NotFound
+
+from utils.retry import retry_transient
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_DATASET_PREFIX = 'snowflake_'
 DEFAULT_LOCATION = 'EU'
+DEFAULT_MAX_WORKERS = 16
+DEFAULT_HTTP_POOL_SIZE = 64
+DATASET_CACHE_TTL_SECONDS = 300
+DEFAULT_JOB_LABELS = {'source': 'snowflake'}
 PARQUET_FORMAT = bigquery.SourceFormat.PARQUET
 WRITE_TRUNCATE = bigquery.WriteDisposition.WRITE_TRUNCATE
 
-SNOWFLAKE_TO_BIGQUERY_TYPES = {
+SELECT_FROM_PATTERN = re.compile(r'SELECT\s+(.*?)\s+FROM', re.IGNORECASE | re.DOTALL)
+COLUMN_ALIAS_PATTERN = re.compile(r'AS\s+"([^"]*)"', re.IGNORECASE)
+# Anything that is not a letter, digit or underscore (same set as str.isalnum() plus '_')
+INVALID_COLUMN_CHAR_PATTERN = re.compile(r'\W')
+UNDERSCORE_RUN_PATTERN = re.compile(r'_+')
+DEFAULT_PARTITION_TYPE = 'DAY'
+SUPPORTED_PARTITION_TYPES = frozenset({'DAY', 'HOUR', 'MONTH', 'YEAR'})
+BQ_TABLE_OPTION_KEYS = ('custom_schema', 'partition_field', 'partition_type', 'cluster_fields')
+RESERVED_COLUMN_PREFIXES = ('_table_', '_file_', '_partition_')
+TRANSIENT_ERRORS = (TooManyRequests, InternalServerError, BadGateway, ServiceUnavailable, GatewayTimeout)
+# Job error reasons that go away on retry: https://cloud.google.com/bigquery/docs/error-messages
+TRANSIENT_ERROR_REASONS = frozenset({'backendError', 'internalError', 'rateLimitExceeded'})
+
+SNOWFLAKE_TO_BIGQUERY_TYPES = MappingProxyType({
     'NUMBER': 'NUMERIC',
     'DECIMAL': 'NUMERIC', 
     'NUMERIC': 'NUMERIC',
@@ -53,7 +82,90 @@ SNOWFLAKE_TO_BIGQUERY_TYPES = {
     'ARRAY': 'JSON',
     
     'GEOGRAPHY': 'GEOGRAPHY',
-}
+})
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_schema_fields(custom_schema_json: str) -> Tuple[bigquery.SchemaField, ...]:
+    """Parse a custom schema JSON string into SchemaFields, once per distinct schema."""
+    return tuple(
+        bigquery.SchemaField(field['name'], field['type'], field.get('mode', 'NULLABLE'))
+        for field in json.loads(custom_schema_json)
+    )
+
+
+@functools.lru_cache(maxsize=1024)
+def _normalize_column_name_v2(column_name: str) -> str:
+    """Normalize a column name with BigQuery V2 rules, once per distinct name."""
+    if not column_name:
+        return '_'
+        
+    name = column_name.strip()
+    if name.startswith('"') and name.endswith('"'):
+        name = name[1:-1]
+    name = name.strip()
+    
+    name = name.replace('""', '"')
+    
+    normalized = INVALID_COLUMN_CHAR_PATTERN.sub('_', name)
+    
+    if normalized and normalized[0].isdigit():
+        normalized = '_' + normalized
+        
+    if not normalized or not (normalized[0].isalpha() or normalized[0] == '_'):
+        normalized = '_' + normalized if normalized else '_'
+        
+    normalized = UNDERSCORE_RUN_PATTERN.sub('_', normalized).rstrip('_')
+    
+    if not normalized or normalized == '_':
+        normalized = '_'
+        
+    if len(normalized) > 300:
+        normalized = normalized[:300]
+        
+    normalized = normalized.lower()
+    
+    # Avoid reserved prefixes by adding suffix if needed
+    if normalized.startswith(RESERVED_COLUMN_PREFIXES):
+        normalized = normalized + '_'
+            
+    return normalized
+
+
+@functools.lru_cache(maxsize=256)
+def _extract_column_aliases(copy_query: str) -> Tuple[str, ...]:
+    """Extract the column aliases of a COPY query's SELECT, once per distinct query."""
+    if not copy_query:
+        logger.warning("Empty copy_query provided")
+        return ()
+    
+    try:
+        select_match = SELECT_FROM_PATTERN.search(copy_query)
+        if not select_match:
+            logger.warning("Could not find SELECT statement in copy_query")
+            return ()
+        
+        select_part = select_match.group(1)
+        
+        aliases = tuple(COLUMN_ALIAS_PATTERN.findall(select_part))
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Extracted %d column aliases from copy_query", len(aliases))
+        return aliases
+        
+    except Exception as e:
+        logger.error(f"Error extracting column aliases from copy_query: {e}")
+        return ()
+
+
+def _is_transient_error(error: Exception) -> bool:
+    """Whether a failed API call or load job is worth retrying (rate limits, 5xx, backend errors)."""
+    if isinstance(error, TRANSIENT_ERRORS):
+        return True
+    return any(
+        isinstance(err, dict) and err.get('reason') in TRANSIENT_ERROR_REASONS
+        for err in getattr(error, 'errors', None) or []
+    )
 
 
 class BigQueryConnectionError(Exception):
@@ -88,7 +200,11 @@ class BigQueryClient:
         gcs_uri: str, 
         location: str = DEFAULT_LOCATION,
         gcp_connection_file_path: Optional[str] = None,
-        dataset_prefix: str = DEFAULT_DATASET_PREFIX
+        dataset_prefix: str = DEFAULT_DATASET_PREFIX,
+        use_inferred_schema: bool = False,
+        labels: Optional[Dict[str, str]] = None,
+        reservation: Optional[str] = None,
+        http_pool_size: int = DEFAULT_HTTP_POOL_SIZE
     ):
         """
         Initialize BigQuery client.
@@ -99,21 +215,36 @@ class BigQueryClient:
             location: BigQuery dataset location (e.g., 'EU', 'US')
             gcp_connection_file_path: Path to GCP service account JSON file
             dataset_prefix: Prefix for BigQuery dataset names
+            use_inferred_schema: Load Parquet files with the schema inferred from the Snowflake
+                                 columns instead of letting BigQuery autodetect it
+            labels: Labels attached to every load job (e.g. migration_run_id), for cost attribution
+            reservation: BigQuery reservation the load jobs run in, instead of the project default
+            http_pool_size: Number of keep-alive HTTPS connections shared by the worker threads
         """
         self.project_id = project_id
         self.gcs_uri = gcs_uri.rstrip('/')
         self.location = location
         self.gcp_connection_file_path = gcp_connection_file_path
-        self.dataset_prefix = dataset_prefix
+        self.dataset_prefix = dataset_prefix.lower()
+        self.use_inferred_schema = use_inferred_schema
+        self.labels = {**DEFAULT_JOB_LABELS, **(labels or {})}
+        self.reservation = reservation
+        self.http_pool_size = http_pool_size
         self.client: Optional[bigquery.Client] = None
+        self._ensured_datasets: Dict[str, float] = {}  # dataset_id -> monotonic expiry time
+        self._ensured_datasets_lock = threading.Lock()
 
     def __enter__(self):
-        """Connect to BigQuery when entering context manager."""
+        """Connect to BigQuery when entering context manager, reusing an existing client."""
+        if self.client is not None:
+            return self
+        
         try:
             if self.gcp_connection_file_path:
                 os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = self.gcp_connection_file_path
             
             self.client = bigquery.Client(project=self.project_id, location=self.location)
+            self._configure_http_pool()
             logger.info("BigQuery client initialized successfully.")
             return self
             
@@ -125,7 +256,11 @@ class BigQueryClient:
             raise BigQueryConnectionError(f"Unexpected connection error: {e}")
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """Close BigQuery connection when exiting context manager."""
+        """Keep the BigQuery client open so re-entering the context skips auth and handshake."""
+        return False
+
+    def close(self) -> None:
+        """Close the underlying BigQuery client."""
         if self.client:
             try:
                 self.client.close()
@@ -133,30 +268,58 @@ class BigQueryClient:
             except Exception as e:
                 logger.warning(f"Error closing BigQuery client: {e}")
         self.client = None
-        return False
+
+    def _configure_http_pool(self) -> None:
+        """
+        Size the client's HTTP connection pool for the worker threads.
+
+        requests keeps only 10 connections per host by default, so concurrent API calls
+        beyond that open a new TCP+TLS connection each time instead of reusing one.
+        """
+        session = self.client._http
+        if getattr(session, 'is_mtls', False):
+            # The mTLS adapter carries the client certificate and must not be replaced
+            return
+        
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=self.http_pool_size, pool_maxsize=self.http_pool_size
+        )
+        session.mount('https://', adapter)
 
     def _ensure_client(self) -> None:
         """Ensure we have an active BigQuery client."""
         if not self.client:
             raise BigQueryConnectionError("No active BigQuery client")
 
+    def _lowered_names(self, table_info: Dict[str, Any]) -> Tuple[str, str, str]:
+        """Return the lowercased (database, schema, table) names that BigQuery identifiers are built from."""
+        return table_info['database'].lower(), table_info['schema'].lower(), table_info['table'].lower()
+
     def _build_dataset_id(self, database: str, schema: str) -> str:
-        """Build BigQuery dataset ID from database and schema names."""
-        dataset_id = f"{self.dataset_prefix}{database}_{schema}".replace('-', '_').lower()
-        return dataset_id
+        """Build BigQuery dataset ID from already lowercased database and schema names."""
+        return f"{self.dataset_prefix}{database}_{schema}".replace('-', '_')
 
     def _build_gcs_source_uri(self, database: str, schema: str, table: str) -> str:
-        """Build GCS source URI for table data."""
-        return f"{self.gcs_uri}/{database.lower()}/{schema.lower()}/{table.lower()}/*"
+        """Build GCS source URI for table data from already lowercased names."""
+        return f"{self.gcs_uri}/{database}/{schema}/{table}/*"
+
+    def _build_table_ref(self, dataset_id: str, table_id: str) -> bigquery.TableReference:
+        """Build a reference to a table in this client's project."""
+        return bigquery.TableReference(bigquery.DatasetReference(self.project_id, dataset_id), table_id)
 
     def _create_dataset_if_needed(self, dataset_id: str) -> None:
-        """Create dataset if it doesn't exist."""
+        """Create dataset if it doesn't exist. Datasets ensured by this client within the cache TTL are skipped."""
+        with self._ensured_datasets_lock:
+            if self._ensured_datasets.get(dataset_id, 0) > time.monotonic():
+                return
+        
         try:
-            dataset_ref = self.client.dataset(dataset_id)
-            dataset = bigquery.Dataset(dataset_ref)
+            dataset = bigquery.Dataset(bigquery.DatasetReference(self.project_id, dataset_id))
             dataset.location = self.location
             
             self.client.create_dataset(dataset, exists_ok=True)
+            with self._ensured_datasets_lock:
+                self._ensured_datasets[dataset_id] = time.monotonic() + DATASET_CACHE_TTL_SECONDS
             logger.debug(f"Ensured dataset {dataset_id} exists in location {self.location}")
             
         except GoogleCloudError as e:
@@ -168,25 +331,38 @@ class BigQueryClient:
             logger.error(error_msg)
             raise BigQueryDatasetError(error_msg)
 
-    def _create_load_job_config(self, custom_schema: Optional[str] = None) -> bigquery.LoadJobConfig:
-        """Create configuration for BigQuery load job."""
+    def _schema_fields_from_json(self, custom_schema: str) -> List[bigquery.SchemaField]:
+        """Build BigQuery schema fields from a custom schema JSON string."""
+        return list(_parse_schema_fields(custom_schema))
+
+    def _create_load_job_config(
+        self, 
+        custom_schema: Optional[str] = None, 
+        source_format: str = PARQUET_FORMAT,
+        schema: Optional[List[bigquery.SchemaField]] = None
+    ) -> bigquery.LoadJobConfig:
+        """
+        Create configuration for BigQuery load job.
+
+        Args:
+            custom_schema: Custom schema JSON string, takes precedence over schema
+            source_format: Format of the files in GCS (a bigquery.SourceFormat value)
+            schema: Explicit schema fields to use when there is no custom schema
+
+        Returns:
+            bigquery.LoadJobConfig: Load job configuration; autodetect is only enabled
+            when no schema is given
+        """
         job_config = bigquery.LoadJobConfig(
-            source_format=PARQUET_FORMAT,
+            source_format=source_format,
             write_disposition=WRITE_TRUNCATE,
             column_name_character_map="V2"
         )
         
         if custom_schema:
-            import json
-            schema_data = json.loads(custom_schema)
-            schema_fields = []
-            for field in schema_data:
-                schema_fields.append(bigquery.SchemaField(
-                    field['name'], 
-                    field['type'], 
-                    field.get('mode', 'NULLABLE')
-                ))
-            job_config.schema = schema_fields
+            job_config.schema = self._schema_fields_from_json(custom_schema)
+        elif schema:
+            job_config.schema = schema
         else:
             job_config.autodetect = True
             
@@ -194,46 +370,81 @@ class BigQueryClient:
 
 
 
+    def _ensure_dataset_ids(self, dataset_ids: Iterable[str]) -> Dict[str, Optional[BigQueryDatasetError]]:
+        """Ensure each distinct dataset exists once and return the error per dataset, if any."""
+        dataset_errors: Dict[str, Optional[BigQueryDatasetError]] = {}
+        for dataset_id in dataset_ids:
+            if dataset_id in dataset_errors:
+                continue
+            try:
+                self._create_dataset_if_needed(dataset_id)
+                dataset_errors[dataset_id] = None
+            except BigQueryDatasetError as e:
+                dataset_errors[dataset_id] = e
+        return dataset_errors
+
+    def ensure_datasets(self, table_infos: Iterable[Dict[str, Any]]) -> Dict[str, Optional[BigQueryDatasetError]]:
+        """
+        Ensure the datasets of a batch of tables exist before any table is loaded.
+
+        Each distinct dataset is created (or found) once; later per-table loads hit the
+        dataset cache instead of calling the API again.
+
+        Args:
+            table_infos: Table information dictionaries (database, schema, table)
+
+        Returns:
+            Dict mapping each dataset ID to the error raised for it, or None on success
+        """
+        self._ensure_client()
+        return self._ensure_dataset_ids(
+            self._build_dataset_id(database, schema)
+            for database, schema, _ in map(self._lowered_names, table_infos)
+        )
+
+    def invalidate_dataset_cache(self, dataset_id: Optional[str] = None) -> None:
+        """Forget that a dataset (or, without an ID, every dataset) is known to exist, e.g. after dropping it."""
+        with self._ensured_datasets_lock:
+            if dataset_id is None:
+                self._ensured_datasets.clear()
+            else:
+                self._ensured_datasets.pop(dataset_id, None)
+
+    def _build_time_partitioning(self, partition_field: str, partition_type: str) -> bigquery.TimePartitioning:
+        """
+        Build the time partitioning spec for a partition column.
+
+        Args:
+            partition_field: Column to partition on
+            partition_type: One of SUPPORTED_PARTITION_TYPES
+
+        Returns:
+            bigquery.TimePartitioning: Partitioning spec for a table or load job
+
+        Raises:
+            BigQueryTableError: If partition_type is not supported
+        """
+        if partition_type not in SUPPORTED_PARTITION_TYPES:
+            raise BigQueryTableError(
+                f"Unsupported partition type '{partition_type}' for field '{partition_field}'. "
+                f"Supported types: {', '.join(sorted(SUPPORTED_PARTITION_TYPES))}"
+            )
+        return bigquery.TimePartitioning(
+            type_=getattr(bigquery.TimePartitioningType, partition_type),
+            field=partition_field
+        )
+
     def _create_table_with_options(self, table_ref: bigquery.TableReference, bq_options: Dict[str, Any]) -> None:
         """Create an empty table with partitioning and clustering options."""
         table = bigquery.Table(table_ref)
         
         if 'custom_schema' in bq_options:
-            import json
-            schema_data = json.loads(bq_options['custom_schema'])
-            schema_fields = []
-            for field in schema_data:
-                schema_fields.append(bigquery.SchemaField(
-                    field['name'], 
-                    field['type'], 
-                    field.get('mode', 'NULLABLE')
-                ))
-            table.schema = schema_fields
+            table.schema = self._schema_fields_from_json(bq_options['custom_schema'])
         
         if 'partition_field' in bq_options:
             partition_field = bq_options['partition_field']
-            partition_type = bq_options.get('partition_type', 'DAY')
-            
-            if partition_type == 'DAY':
-                table.time_partitioning = bigquery.TimePartitioning(
-                    type_=bigquery.TimePartitioningType.DAY,
-                    field=partition_field
-                )
-            elif partition_type == 'HOUR':
-                table.time_partitioning = bigquery.TimePartitioning(
-                    type_=bigquery.TimePartitioningType.HOUR,
-                    field=partition_field
-                )
-            elif partition_type == 'MONTH':
-                table.time_partitioning = bigquery.TimePartitioning(
-                    type_=bigquery.TimePartitioningType.MONTH,
-                    field=partition_field
-                )
-            elif partition_type == 'YEAR':
-                table.time_partitioning = bigquery.TimePartitioning(
-                    type_=bigquery.TimePartitioningType.YEAR,
-                    field=partition_field
-                )
+            partition_type = bq_options.get('partition_type', DEFAULT_PARTITION_TYPE)
+            table.time_partitioning = self._build_time_partitioning(partition_field, partition_type)
             
             logger.info(f"Will create table with {partition_type} partitioning on field '{partition_field}'")
         
@@ -245,9 +456,29 @@ class BigQueryClient:
         self.client.create_table(table)
         logger.info(f"Created table {table_ref.dataset_id}.{table_ref.table_id} with specified options")
 
-    def get_table_row_count(self, dataset_id: str, table_id: str) -> int:
-        """Get row count from BigQuery table."""
-        query = f"SELECT COUNT(*) as count FROM `{self.project_id}.{dataset_id}.{table_id}`"
+    def get_table_row_count(self, dataset_id: str, table_id: str, exact: bool = False) -> int:
+        """
+        Get row count from BigQuery table.
+
+        By default the count is read from table metadata, which needs no query job.
+
+        Args:
+            dataset_id: BigQuery dataset ID
+            table_id: BigQuery table ID
+            exact: Run a COUNT(*) query instead, e.g. to include rows still in the streaming buffer
+
+        Returns:
+            int: Number of rows, or 0 if the table does not exist
+        """
+        table_path = f"{self.project_id}.{dataset_id}.{table_id}"
+        
+        if not exact:
+            try:
+                return self.client.get_table(table_path).num_rows or 0
+            except NotFound:
+                return 0
+        
+        query = f"SELECT COUNT(*) as count FROM `{table_path}`"
         
         try:
             result = self.client.query(query).result()
@@ -257,102 +488,228 @@ class BigQueryClient:
                 return 0
             raise
 
-    def create_bq_table(self, table_info: Dict[str, Any]) -> Tuple[bool, Optional[str], int]:
+    def _bulk_delete_tables(
+        self, 
+        refs: List[bigquery.TableReference], 
+        max_workers: int = DEFAULT_MAX_WORKERS
+    ) -> None:
         """
-        Load Parquet files from GCS into a BigQuery table.
+        Delete several tables concurrently, ignoring tables that do not exist.
+
+        Args:
+            refs: References of the tables to delete
+            max_workers: Maximum number of delete requests in flight at the same time
+        """
+        def delete(table_ref: bigquery.TableReference) -> None:
+            try:
+                self.client.delete_table(table_ref, not_found_ok=True)
+                logger.info(f"Deleted existing table {table_ref.dataset_id}.{table_ref.table_id}")
+            except Exception as e:
+                logger.debug(f"Table {table_ref.dataset_id}.{table_ref.table_id} could not be deleted: {e}")
+        
+        if not refs:
+            return
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(delete, refs))
+
+    def _start_load_job(self, table_info: Dict[str, Any], table_deleted: bool = False) -> bigquery.LoadJob:
+        """
+        Prepare the destination table and submit its load job without waiting for it.
+
+        The table's dataset must already exist.
 
         Args:
             table_info: Dictionary containing table information (database, schema, table)
                        May also contain BigQuery options: custom_schema, partition_field, 
-                       partition_type, cluster_fields
+                       partition_type, cluster_fields, the GCS file source_format
+                       (defaults to Parquet) and extra job labels. gcs_uris may list
+                       the exact staged files or prefixes to load in this one job;
+                       by default the table's whole GCS folder is loaded via a wildcard
+            table_deleted: Whether an existing destination table was already deleted
 
         Returns:
-            Tuple of (success: bool, error_message: Optional[str], row_count: int)
+            bigquery.LoadJob: The submitted (still running) load job
         """
-        self._ensure_client()
-        
-        database = table_info['database']
-        schema = table_info['schema']
-        table = table_info['table']
+        database, schema, table = self._lowered_names(table_info)
         
         bq_options = {}
-        for key in ['custom_schema', 'partition_field', 'partition_type', 'cluster_fields']:
+        for key in BQ_TABLE_OPTION_KEYS:
             if key in table_info:
                 bq_options[key] = table_info[key]
         
-        try:
-            dataset_id = self._build_dataset_id(database, schema)
-            self._create_dataset_if_needed(dataset_id)
-            
-            table_id = table.lower()
-            table_ref = self.client.dataset(dataset_id).table(table_id)
-            source_uri = self._build_gcs_source_uri(database, schema, table)
-            
-            has_custom_schema = 'custom_schema' in bq_options
-            has_partition_or_cluster = 'partition_field' in bq_options or 'cluster_fields' in bq_options
-            
-            if bq_options:
+        dataset_id = self._build_dataset_id(database, schema)
+        table_ref = self._build_table_ref(dataset_id, table)
+        source_uris = table_info.get('gcs_uris') or [self._build_gcs_source_uri(database, schema, table)]
+        
+        has_custom_schema = 'custom_schema' in bq_options
+        has_partition_or_cluster = 'partition_field' in bq_options or 'cluster_fields' in bq_options
+        
+        if bq_options:
+            if not table_deleted:
                 try:
                     self.client.delete_table(table_ref, not_found_ok=True)
-                    logger.info(f"Deleted existing table {dataset_id}.{table_id}")
+                    logger.info(f"Deleted existing table {dataset_id}.{table}")
                 except Exception as e:
-                    logger.debug(f"Table {dataset_id}.{table_id} did not exist or could not be deleted: {e}")
-                
-                if has_custom_schema:
-                    self._create_table_with_options(table_ref, bq_options)
-            
-            logger.info(f"Loading {database}.{schema}.{table} from GCS...")
-            
-            job_config = bigquery.LoadJobConfig(
-                source_format=PARQUET_FORMAT,
-                write_disposition=WRITE_TRUNCATE,
-                column_name_character_map="V2"
-            )
+                    logger.debug(f"Table {dataset_id}.{table} did not exist or could not be deleted: {e}")
             
             if has_custom_schema:
-                import json
-                schema_data = json.loads(bq_options['custom_schema'])
-                schema_fields = []
-                for field in schema_data:
-                    schema_fields.append(bigquery.SchemaField(
-                        field['name'], 
-                        field['type'], 
-                        field.get('mode', 'NULLABLE')
-                    ))
-                job_config.schema = schema_fields
-            else:
-                job_config.autodetect = True
-                
-                if has_partition_or_cluster:
-                    if 'partition_field' in bq_options:
-                        partition_type = bq_options.get('partition_type', 'DAY')
-                        job_config.time_partitioning = bigquery.TimePartitioning(
-                            type_=getattr(bigquery.TimePartitioningType, partition_type),
-                            field=bq_options['partition_field']
-                        )
-                    
-                    if 'cluster_fields' in bq_options:
-                        job_config.clustering_fields = bq_options['cluster_fields']
-            
-            load_job = self.client.load_table_from_uri(source_uri, table_ref, job_config=job_config)
-            load_job.result()
+                self._create_table_with_options(table_ref, bq_options)
+        
+        logger.info(f"Loading {database}.{schema}.{table} from GCS...")
+        
+        source_format = table_info.get('source_format', PARQUET_FORMAT)
+        inferred_schema = None
+        if (not has_custom_schema and self.use_inferred_schema 
+                and source_format == PARQUET_FORMAT and table_info.get('columns')):
+            inferred_schema = self.infer_schema_from_table_info(table_info)
+        
+        job_config = self._create_load_job_config(
+            bq_options.get('custom_schema'), source_format, inferred_schema
+        )
+        job_config.labels = {**self.labels, **table_info.get('labels', {})}
+        if self.reservation:
+            job_config.reservation = self.reservation
+        
+        if not has_custom_schema and has_partition_or_cluster:
+            if 'partition_field' in bq_options:
+                job_config.time_partitioning = self._build_time_partitioning(
+                    bq_options['partition_field'],
+                    bq_options.get('partition_type', DEFAULT_PARTITION_TYPE)
+                )
             
-            destination_table = self.client.get_table(table_ref)
-            row_count = destination_table.num_rows
+            if 'cluster_fields' in bq_options:
+                job_config.clustering_fields = bq_options['cluster_fields']
+        
+        return self.client.load_table_from_uri(source_uris, table_ref, job_config=job_config)
+
+    def _wait_for_load_job(self, load_job: bigquery.LoadJob) -> Tuple[bool, Optional[str], int]:
+        """Block until a submitted load job finishes and return its result tuple."""
+        load_job.result()
+        
+        destination = load_job.destination
+        row_count = load_job.output_rows or 0
+        
+        logger.info(f"Successfully loaded {row_count} rows into {destination.dataset_id}.{destination.table_id}")
+        return True, None, row_count
+
+    def _load_failure(self, table_info: Dict[str, Any], error: Exception) -> Tuple[bool, Optional[str], int]:
+        """Convert an exception raised while loading a table into a failed result tuple."""
+        if isinstance(error, (BigQueryDatasetError, BigQueryTableError)):
+            return False, str(error), 0
+        
+        table_name = f"{table_info['database']}.{table_info['schema']}.{table_info['table']}"
+        if isinstance(error, GoogleCloudError):
+            error_msg = f"BigQuery error loading {table_name}: {error}"
+        else:
+            error_msg = f"Unexpected error loading {table_name}: {error}"
+        logger.error(error_msg)
+        return False, error_msg, 0
+
+    def create_bq_table(self, table_info: Dict[str, Any]) -> Tuple[bool, Optional[str], int]:
+        """
+        Load Parquet files from GCS into a BigQuery table.
+
+        Transient failures (rate limits, 5xx responses, backend errors) are retried with
+        exponential backoff before a failure is returned.
+
+        Args:
+            table_info: Dictionary containing table information (database, schema, table)
+                       May also contain BigQuery options: custom_schema, partition_field, 
+                       partition_type, cluster_fields
+
+        Returns:
+            Tuple of (success: bool, error_message: Optional[str], row_count: int)
+        """
+        self._ensure_client()
+        
+        try:
+            database, schema, _ = self._lowered_names(table_info)
+            self._create_dataset_if_needed(self._build_dataset_id(database, schema))
             
-            logger.info(f"Successfully loaded {row_count} rows into {dataset_id}.{table_id}")
-            return True, None, row_count
+            return self._load_table(table_info)
             
-        except (BigQueryDatasetError, BigQueryTableError) as e:
-            return False, str(e), 0
-        except GoogleCloudError as e:
-            error_msg = f"BigQuery error loading {database}.{schema}.{table}: {e}"
-            logger.error(error_msg)
-            return False, error_msg, 0
         except Exception as e:
-            error_msg = f"Unexpected error loading {database}.{schema}.{table}: {e}"
-            logger.error(error_msg)
-            return False, error_msg, 0
+            return self._load_failure(table_info, e)
+
+    @retry_transient(_is_transient_error)
+    def _load_table(self, table_info: Dict[str, Any]) -> Tuple[bool, Optional[str], int]:
+        """Run a load job to completion, re-running it with backoff if it fails transiently."""
+        load_job = self._start_load_job(table_info)
+        return self._wait_for_load_job(load_job)
+
+    def create_bq_tables(
+        self, 
+        table_infos: List[Dict[str, Any]], 
+        max_workers: int = DEFAULT_MAX_WORKERS
+    ) -> List[Tuple[bool, Optional[str], int]]:
+        """
+        Load several tables from GCS into BigQuery concurrently.
+
+        Datasets are ensured once each and tables being replaced are deleted up front in
+        one concurrent pass, then all load jobs are submitted from a thread pool so
+        BigQuery runs them in parallel; the wall clock is bounded by the slowest load
+        instead of the sum of all loads.
+
+        This is a library entry point for callers that have already staged a batch of
+        tables. The migration workflow does not use it: it loads each table with
+        create_bq_table as soon as that table is staged, so it can check its row count
+        and record its result right away.
+
+        Args:
+            table_infos: List of table information dictionaries (see create_bq_table)
+            max_workers: Maximum number of load jobs submitted at the same time
+
+        Returns:
+            List of (success, error_message, row_count) tuples, in the order of table_infos
+        """
+        self._ensure_client()
+        
+        results: List[Optional[Tuple[bool, Optional[str], int]]] = [None] * len(table_infos)
+        
+        names = [self._lowered_names(table_info) for table_info in table_infos]
+        dataset_ids = [self._build_dataset_id(database, schema) for database, schema, _ in names]
+        
+        dataset_errors = self._ensure_dataset_ids(dataset_ids)
+        
+        pending = []
+        refs_to_delete = []
+        for i, table_info in enumerate(table_infos):
+            dataset_id = dataset_ids[i]
+            dataset_error = dataset_errors[dataset_id]
+            if dataset_error:
+                results[i] = self._load_failure(table_info, dataset_error)
+                continue
+            pending.append(i)
+            if any(key in table_info for key in BQ_TABLE_OPTION_KEYS):
+                refs_to_delete.append(self._build_table_ref(dataset_id, names[i][2]))
+        
+        self._bulk_delete_tables(refs_to_delete, max_workers)
+        
+        load_jobs = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self._start_load_job, table_infos[i], True): i
+                for i in pending
+            }
+            
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    load_jobs[i] = future.result()
+                except Exception as e:
+                    results[i] = self._load_failure(table_infos[i], e)
+        
+        for i, load_job in load_jobs.items():
+            try:
+                results[i] = self._wait_for_load_job(load_job)
+            except Exception as e:
+                if _is_transient_error(e):
+                    logger.warning(f"Load job {load_job.job_id} failed with a transient error, retrying: {e}")
+                    results[i] = self.create_bq_table(table_infos[i])
+                else:
+                    results[i] = self._load_failure(table_infos[i], e)
+        
+        return results
 
     def _create_external_config(self, source_uri: str) -> bigquery.ExternalConfig:
         """Create external configuration for BigQuery external table."""
@@ -382,16 +739,14 @@ class BigQueryClient:
         """
         self._ensure_client()
         
-        database = table_info['database']
-        schema = table_info['schema']
-        table = table_info['table']
+        database, schema, table = self._lowered_names(table_info)
         
         try:
             dataset_id = self._build_dataset_id(database, schema)
             self._create_dataset_if_needed(dataset_id)
             
-            table_name = f"{table}_external".lower()
-            table_ref = self.client.dataset(dataset_id).table(table_name)
+            table_name = f"{table}_external"
+            table_ref = self._build_table_ref(dataset_id, table_name)
             source_uri = self._build_gcs_source_uri(database, schema, table)
             
             self._delete_table_if_exists(table_ref)
@@ -427,11 +782,12 @@ class BigQueryClient:
         Returns:
             str: Corresponding BigQuery data type
         """
-        base_type = snowflake_type.upper().split('(')[0].strip()
+        base_type = snowflake_type.upper().partition('(')[0].strip()
         
         bigquery_type = SNOWFLAKE_TO_BIGQUERY_TYPES.get(base_type, 'STRING')
         
-        logger.debug(f"Converted Snowflake type '{snowflake_type}' -> BigQuery type '{bigquery_type}'")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Converted Snowflake type '%s' -> BigQuery type '%s'", snowflake_type, bigquery_type)
         return bigquery_type
 
     def _extract_column_aliases_from_copy_query(self, copy_query: str) -> List[str]:
@@ -444,27 +800,7 @@ class BigQueryClient:
         Returns:
             List[str]: List of column aliases as they appear in the query
         """
-        if not copy_query:
-            logger.warning("Empty copy_query provided")
-            return []
-        
-        try:
-            select_match = re.search(r'SELECT\s+(.*?)\s+FROM', copy_query, re.IGNORECASE | re.DOTALL)
-            if not select_match:
-                logger.warning("Could not find SELECT statement in copy_query")
-                return []
-            
-            select_part = select_match.group(1)
-            
-            alias_pattern = r'AS\s+"([^"]*)"'
-            aliases = re.findall(alias_pattern, select_part, re.IGNORECASE)
-            
-            logger.debug(f"Extracted {len(aliases)} column aliases from copy_query")
-            return aliases
-            
-        except Exception as e:
-            logger.error(f"Error extracting column aliases from copy_query: {e}")
-            return []
+        return list(_extract_column_aliases(copy_query))
 
     def _normalize_column_name_v2(self, column_name: str) -> str:
         """
@@ -477,49 +813,7 @@ class BigQueryClient:
         Returns:
             str: Normalized column name that follows BigQuery naming conventions
         """
-        if not column_name:
-            return '_'
-            
-        name = column_name.strip()
-        if name.startswith('"') and name.endswith('"'):
-            name = name[1:-1]
-        name = name.strip()
-        
-        name = name.replace('""', '"')
-        
-        normalized = ''
-        for char in name:
-            if char.isalnum() or char == '_':
-                normalized += char
-            else:
-                normalized += '_'
-        
-        if normalized and normalized[0].isdigit():
-            normalized = '_' + normalized
-            
-        if not normalized or not (normalized[0].isalpha() or normalized[0] == '_'):
-            normalized = '_' + normalized if normalized else '_'
-            
-        while '__' in normalized:
-            normalized = normalized.replace('__', '_')
-        normalized = normalized.rstrip('_')
-        
-        if not normalized or normalized == '_':
-            normalized = '_'
-            
-        if len(normalized) > 300:
-            normalized = normalized[:300]
-            
-        # Avoid reserved prefixes by adding suffix if needed
-        reserved_prefixes = ['_TABLE_', '_FILE_', '_PARTITION_']
-        for prefix in reserved_prefixes:
-            if normalized.upper().startswith(prefix):
-                normalized = normalized + '_'
-                break
-
-        normalized = normalized.lower()
-                
-        return normalized
+        return _normalize_column_name_v2(column_name)
 
     def infer_schema_from_table_info(self, table_info: Dict[str, Any]) -> List[bigquery.SchemaField]:
         """
@@ -541,27 +835,34 @@ class BigQueryClient:
         # Extract column aliases from copy query
         aliases = self._extract_column_aliases_from_copy_query(copy_query)
         
+        alias_count = len(aliases)
+        base_field_names = [
+            self._normalize_column_name_v2(
+                aliases[i] if i < alias_count else column.get('column_name', f'column_{i}')
+            )
+            for i, column in enumerate(columns)
+        ]
+        
         schema_fields = []
         used_names = set()  # Track used names to handle duplicates
+        next_suffix: Dict[str, int] = {}  # Next numeric suffix to try per base name
+        renamed_count = 0
         
-        for i, column in enumerate(columns):
-            column_name = column.get('column_name', f'column_{i}')
+        for column, base_field_name in zip(columns, base_field_names):
             data_type = column.get('data_type', 'STRING')
             
-            if i < len(aliases):
-                base_field_name = self._normalize_column_name_v2(aliases[i])
-            else:
-                base_field_name = self._normalize_column_name_v2(column_name)
-            
-            # Handle duplicate column names by appending numbers
+            # Handle duplicate column names by appending numbers, resuming from the last
+            # suffix used for this base name instead of rescanning from 2
             field_name = base_field_name
-            counter = 2
-            while field_name in used_names:
-                if base_field_name == "_":
-                    field_name = f"_{counter}"
-                else:
-                    field_name = f"{base_field_name}_{counter}"
-                counter += 1
+            if field_name in used_names:
+                prefix = "_" if base_field_name == "_" else f"{base_field_name}_"
+                counter = next_suffix.get(base_field_name, 2)
+                field_name = f"{prefix}{counter}"
+                while field_name in used_names:
+                    counter += 1
+                    field_name = f"{prefix}{counter}"
+                next_suffix[base_field_name] = counter + 1
+                renamed_count += 1
             
             used_names.add(field_name)
             bigquery_type = self._convert_snowflake_type_to_bigquery(data_type)
@@ -574,10 +875,8 @@ class BigQueryClient:
             
             schema_fields.append(schema_field)
         
-        original_count = len(columns)
-        unique_count = len(used_names)
-        if original_count != unique_count:
-            logger.warning(f"Handled {original_count - unique_count} duplicate column names during schema inference")
+        if renamed_count:
+            logger.warning(f"Handled {renamed_count} duplicate column names during schema inference")
         
         logger.info(f"Inferred schema with {len(schema_fields)} fields")
         return schema_fields
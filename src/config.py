@@ -1,7 +1,7 @@
 import os
 from datetime import datetime
 from pathlib import Path
-from typing import Tuple
+from typing import Callable, Optional, Tuple, Union
 
 from dotenv import load_dotenv
 
@@ -11,6 +11,46 @@ DEFAULT_BQ_LOCATION = 'EU'
 DEFAULT_BQ_PREFIX = 'snowflake_'
 DEFAULT_LOGS_PATH = 'logs'
 DEFAULT_SAMPLE_LIMIT = 100
+DEFAULT_PARALLELISM = 1
+DEFAULT_UNLOAD_COMPRESSION = 'SNAPPY'
+SUPPORTED_UNLOAD_COMPRESSIONS = ('SNAPPY', 'LZO', 'AUTO', 'NONE')
+DEFAULT_DRY_RUN_FORMAT = 'yaml'
+SUPPORTED_DRY_RUN_FORMATS = ('yaml', 'jsonl')
+DEFAULT_RESULT_FILE_FORMAT = 'yaml'
+SUPPORTED_RESULT_FILE_FORMATS = ('yaml', 'jsonl')
+DEFAULT_METADATA_CACHE_DIR = '~/.cache/sf2bq'
+DEFAULT_METADATA_CACHE_TTL_HOURS = 0
+
+_DOTENV_LOADED = False
+
+
+def _number_from_env(
+    name: str, 
+    default: Optional[Union[int, float]], 
+    convert: Callable[[str], Union[int, float]] = int
+) -> Optional[Union[int, float]]:
+    """
+    Read a numeric environment variable.
+
+    Args:
+        name: Environment variable name
+        default: Value used when the variable is unset or empty
+        convert: int or float
+
+    Returns:
+        The converted value, or default
+
+    Raises:
+        ValueError: If the value is not a valid number, naming the variable
+    """
+    value = os.getenv(name)
+    if not value:
+        return default
+    try:
+        return convert(value)
+    except ValueError:
+        kind = 'an integer' if convert is int else 'a number'
+        raise ValueError(f"{name} must be {kind}, got '{value}'") from None
 
 
 class MigrationConfig:
@@ -18,7 +58,10 @@ class MigrationConfig:
     
     def __init__(self) -> None:
         """Load configuration from environment variables."""
-        load_dotenv()
+        global _DOTENV_LOADED
+        if not _DOTENV_LOADED:
+            load_dotenv()
+            _DOTENV_LOADED = True
         
         self.config_file_path = os.getenv('CONFIG_FILE_PATH', DEFAULT_CONFIG_PATH)
         self.snowflake_connection_name = os.getenv('SNOWFLAKE_CONNECTION_NAME', DEFAULT_CONNECTION_NAME)
@@ -28,11 +71,31 @@ class MigrationConfig:
         self.bigquery_data_location = os.getenv('BIGQUERY_DATA_LOCATION', DEFAULT_BQ_LOCATION)
         self.bigquery_dataset_prefix = os.getenv('BIGQUERY_DATASET_PREFIX', DEFAULT_BQ_PREFIX)
         self.logs_path = os.getenv('LOGS_PATH', DEFAULT_LOGS_PATH)
+        self.bigquery_reservation = os.getenv('BIGQUERY_RESERVATION')
+        self.bigquery_use_inferred_schema = os.getenv('BIGQUERY_USE_INFERRED_SCHEMA', 'false').lower() == 'true'
+        self.verify_source_row_count = os.getenv('VERIFY_SOURCE_ROW_COUNT', 'false').lower() == 'true'
+        self.parallelism = max(1, _number_from_env('MIGRATION_PARALLELISM', DEFAULT_PARALLELISM))
+        self.unload_compression = os.getenv('UNLOAD_COMPRESSION', DEFAULT_UNLOAD_COMPRESSION).upper()
+        self.sample_limit = _number_from_env('SAMPLE_LIMIT', DEFAULT_SAMPLE_LIMIT)
+        self.unload_max_file_size: Optional[int] = _number_from_env('UNLOAD_MAX_FILE_SIZE', None)
+        self.dry_run_format = os.getenv('DRY_RUN_FORMAT', DEFAULT_DRY_RUN_FORMAT).lower()
+        self.result_file_format = os.getenv('RESULT_FILE_FORMAT', DEFAULT_RESULT_FILE_FORMAT).lower()
+        self.metadata_cache_dir = os.getenv('METADATA_CACHE_DIR', DEFAULT_METADATA_CACHE_DIR)
+        self.metadata_cache_ttl_hours = _number_from_env(
+            'METADATA_CACHE_TTL_HOURS', DEFAULT_METADATA_CACHE_TTL_HOURS, float
+        )
         
         self.dry_run: bool = False
         self.interactive: bool = False
         self.sample: bool = False
         self.verbose: bool = False
+        self.batch_confirm: int = 1
+        self.refresh_metadata: bool = False
+        self.result_writer = None  # utils.file_utils.ResultFileWriter of a real (non dry) run
+        
+        self._run_id: Optional[str] = None
+        self._logs_dir = Path(self.logs_path)
+        self._logs_dir_ready = False
         
     def validate(self) -> None:
         """Validate required configuration values."""
@@ -42,22 +105,47 @@ class MigrationConfig:
             raise ValueError("PROJECT_ID environment variable is required")
         if not self.gcs_uri:
             raise ValueError("GCS_URI environment variable is required")
+        if self.unload_compression not in SUPPORTED_UNLOAD_COMPRESSIONS:
+            raise ValueError(
+                f"UNLOAD_COMPRESSION must be one of {', '.join(SUPPORTED_UNLOAD_COMPRESSIONS)}, "
+                f"got '{self.unload_compression}'"
+            )
+        if self.dry_run_format not in SUPPORTED_DRY_RUN_FORMATS:
+            raise ValueError(
+                f"DRY_RUN_FORMAT must be one of {', '.join(SUPPORTED_DRY_RUN_FORMATS)}, "
+                f"got '{self.dry_run_format}'"
+            )
+        if self.result_file_format not in SUPPORTED_RESULT_FILE_FORMATS:
+            raise ValueError(
+                f"RESULT_FILE_FORMAT must be one of {', '.join(SUPPORTED_RESULT_FILE_FORMATS)}, "
+                f"got '{self.result_file_format}'"
+            )
 
     def _generate_run_id(self) -> str:
-        """Generate timestamp-based run ID for log files."""
-        return datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
+        """Generate timestamp-based run ID for log files, shared by all files of this run."""
+        if self._run_id is None:
+            self._run_id = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
+        return self._run_id
+    
+    @property
+    def run_id(self) -> str:
+        """Timestamp identifying this migration run."""
+        return self._generate_run_id()
     
     def _ensure_logs_dir(self) -> None:
-        """Ensure logs directory exists."""
-        Path(self.logs_path).mkdir(parents=True, exist_ok=True)
+        """Ensure logs directory exists, creating it at most once."""
+        if not self._logs_dir_ready:
+            self._logs_dir.mkdir(parents=True, exist_ok=True)
+            self._logs_dir_ready = True
     
     def create_log_files(self) -> Tuple[str, str]:
         """Create migration log file paths with timestamp."""
         run_id = self._generate_run_id()
         self._ensure_logs_dir()
         
-        succeeded_file = f"{self.logs_path}/succeeded_tables_{run_id}.yml"
-        failed_file = f"{self.logs_path}/failed_tables_{run_id}.yml"
+        extension = 'jsonl' if self.result_file_format == 'jsonl' else 'yml'
+        succeeded_file = str(self._logs_dir / f"succeeded_tables_{run_id}.{extension}")
+        failed_file = str(self._logs_dir / f"failed_tables_{run_id}.{extension}")
         
         return succeeded_file, failed_file
     
@@ -66,4 +154,5 @@ class MigrationConfig:
         run_id = self._generate_run_id()
         self._ensure_logs_dir()
         
-        return f"{self.logs_path}/dry_mode_{run_id}.yml"
+        extension = 'jsonl' if self.dry_run_format == 'jsonl' else 'yml'
+        return str(self._logs_dir / f"dry_mode_{run_id}.{extension}")
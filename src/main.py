@@ -1,19 +1,17 @@
 import argparse
-import atexit
 import logging
 import os
 import sys
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any, Tuple
-
-import yaml
+from typing import List, Dict, Any, Optional, Tuple
 
 from bigquery.bigquery_client import BigQueryClient
 from snowflake.snowflake_client import SnowflakeClient
 from config import MigrationConfig, DEFAULT_SAMPLE_LIMIT
 from utils.user_interaction import ask_user_permission_per_table, ask_user_for_retry, format_table_name
-from utils.file_utils import log_table_counts, write_results_on_exit
+from utils.file_utils import ResultFileWriter, log_table_counts
+from utils.metadata_cache import MetadataCache
 from migration_workflow import run_dry_mode, run_migration_workflow
 
 MSG_TABLES_RETURNED = "No tables were returned. Exiting."
@@ -31,7 +29,19 @@ logging.getLogger('snowflake').setLevel(logging.WARNING)
 logging.getLogger('google.cloud.bigquery').setLevel(logging.WARNING)
 
 
-def main(dry_run: bool, interactive: bool, sample: bool, verbose: bool = False) -> None:
+def _create_metadata_cache(config: MigrationConfig) -> Optional[MetadataCache]:
+    """Create the table metadata cache, or None when METADATA_CACHE_TTL_HOURS is not set."""
+    if config.metadata_cache_ttl_hours <= 0:
+        return None
+    return MetadataCache(
+        directory=config.metadata_cache_dir,
+        ttl_seconds=config.metadata_cache_ttl_hours * 3600,
+        refresh=config.refresh_metadata
+    )
+
+
+def main(dry_run: bool, interactive: bool, sample: bool, verbose: bool = False, batch_confirm: int = 1,
+         refresh_metadata: bool = False) -> None:
     """
     Main function to orchestrate the migration process.
     
@@ -40,28 +50,34 @@ def main(dry_run: bool, interactive: bool, sample: bool, verbose: bool = False)
         interactive: Whether to ask for user permission per table
         sample: Whether to use sample data only
         verbose: Whether to show cleaning and copy queries during execution
+        batch_confirm: Ask for permission once per this many tables (implies interactive when above 1)
+        refresh_metadata: Query Snowflake for table metadata even if it is cached
     """
+    config = None
+    bq = None
     try:
         config = MigrationConfig()
         config.dry_run = dry_run
-        config.interactive = interactive
+        config.interactive = interactive or batch_confirm > 1
         config.sample = sample
         config.verbose = verbose
+        config.batch_confirm = batch_confirm
+        config.refresh_metadata = refresh_metadata
         config.validate()
         
         if not dry_run:
             succeeded_file, failed_file = config.create_log_files()
-            succeeded_tables = []
-            failed_tables = []
-            
-            atexit.register(write_results_on_exit, succeeded_tables, failed_tables, 
-                           succeeded_file, failed_file)
+            config.result_writer = ResultFileWriter(succeeded_file, failed_file, config.result_file_format)
         
-        with SnowflakeClient(connection_name=config.snowflake_connection_name) as sf, \
+        with SnowflakeClient(connection_name=config.snowflake_connection_name,
+                             metadata_cache=_create_metadata_cache(config)) as sf, \
              BigQueryClient(project_id=config.gcp_project_id, 
                            gcs_uri=config.gcs_uri,
                            location=config.bigquery_data_location,
-                           dataset_prefix=config.bigquery_dataset_prefix) as bq:
+                           dataset_prefix=config.bigquery_dataset_prefix,
+                           use_inferred_schema=config.bigquery_use_inferred_schema,
+                           labels={'migration_run_id': config.run_id},
+                           reservation=config.bigquery_reservation) as bq:
             
             table_list = sf.list_tables_from_yaml(file_path=config.config_file_path)
 
@@ -71,21 +87,26 @@ def main(dry_run: bool, interactive: bool, sample: bool, verbose: bool = False)
 
             log_table_counts(table_list)
             table_list_with_queries = sf.generate_copy_queries(
-                table_list, config.external_stage, sample=sample
+                table_list, config.external_stage, sample=sample,
+                compression=config.unload_compression,
+                sample_limit=config.sample_limit,
+                max_file_size=config.unload_max_file_size
             )
             
             if dry_run:
                 run_dry_mode(table_list_with_queries, config)
             else:
-                succeeded, failed = run_migration_workflow(
-                    table_list_with_queries, sf, bq, config
-                )
-                succeeded_tables.extend(succeeded)
-                failed_tables.extend(failed)
+                run_migration_workflow(table_list_with_queries, sf, bq, config)
                 
     except Exception as e:
         logger.error(f"Unexpected error: {e}")
         raise
+    finally:
+        # BigQueryClient.__exit__ keeps the client open for re-entry, so close it here
+        if bq is not None:
+            bq.close()
+        if config is not None and config.result_writer is not None:
+            config.result_writer.close()
 
 
 def parse_arguments() -> argparse.Namespace:
@@ -120,6 +141,18 @@ def parse_arguments() -> argparse.Namespace:
         action="store_true",
         help="Show cleaning and copy queries during execution in all modes"
     )
+    parser.add_argument(
+        "--batch_confirm", 
+        type=int,
+        default=1,
+        metavar="N",
+        help="Interactive mode that shows the plan for N tables at a time and asks once per batch"
+    )
+    parser.add_argument(
+        "--refresh_metadata", 
+        action="store_true",
+        help="Query Snowflake for table metadata even if it is cached (see METADATA_CACHE_TTL_HOURS)"
+    )
     
     return parser.parse_args()
 
@@ -133,4 +166,5 @@ if __name__ == "__main__":
     logger.info(f"Starting migration (dry_run={args.dry_run}, "
                f"interactive={args.interactive}, sample={args.sample})")
     
-    main(dry_run=args.dry_run, interactive=args.interactive, sample=args.sample, verbose=args.verbose)
+    main(dry_run=args.dry_run, interactive=args.interactive, sample=args.sample, verbose=args.verbose,
+         batch_confirm=args.batch_confirm, refresh_metadata=args.refresh_metadata)
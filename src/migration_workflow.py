@@ -1,57 +1,77 @@
+import io
+import json
 import logging
-from typing import List, Dict, Any, Tuple
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from contextlib import ExitStack
+from itertools import chain, islice
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import yaml
 
 from bigquery.bigquery_client import BigQueryClient
-from snowflake.snowflake_client import SnowflakeClient
+from snowflake.snowflake_client import SnowflakeClient, SnowflakeQueryError
 from config import MigrationConfig
-from utils.user_interaction import ask_user_permission_per_table, ask_user_for_retry, format_table_name
+from utils.file_utils import ResultFileWriter, SafeDumper
+from utils.user_interaction import (
+    ask_bigquery_table_permission,
+    ask_user_for_retry,
+    ask_user_permission_per_batch,
+    ask_user_permission_per_table,
+    edit_cleaning_query,
+    edit_copy_query,
+    format_table_name,
+)
 
 logger = logging.getLogger(__name__)
 
 MSG_DRY_RUN = "Dry run mode enabled - showing migration plan without executing queries."
 MSG_INTERRUPTED = "Migration process interrupted by user (Ctrl+C)."
+MSG_ABORTED_CTRL_C = 'Aborted by user (Ctrl+C)'
 
+SECTION_SEPARATOR = '=' * 60
+QUERY_SEPARATOR = '-' * 40
 
-def migrate_single_table(
+
+def _write_query_block(buf: io.StringIO, title: str, query: str) -> None:
+    """Write a titled, separator-framed query to a log buffer."""
+    buf.write(f"\n{title}:\n{QUERY_SEPARATOR}\n{query}\n{QUERY_SEPARATOR}\n")
+
+
+def stage_table_in_snowflake(
     table_info: Dict[str, Any], 
     sf_client: SnowflakeClient, 
-    bq_client: BigQueryClient,
     config: MigrationConfig
-) -> Tuple[bool, str]:
+) -> Tuple[bool, str, int]:
     """
-    Migrate a single table from Snowflake to BigQuery.
+    Unload a single table from Snowflake to the external stage.
+
+    The returned row count is the number of rows the COPY unloaded, or the source
+    table's own row count when config.verify_source_row_count is set.
 
     Args:
         table_info: Table information dictionary
         sf_client: Connected Snowflake client
-        bq_client: Connected BigQuery client
         config: Migration configuration
         
     Returns:
-        Tuple of (success: bool, error_message: str)
+        Tuple of (success: bool, error_message: str, snowflake_row_count: int)
     """
     table_name = format_table_name(table_info)
     logger.info(f"Processing table {table_name}...")
     
     if config.verbose and not config.interactive:
-        logger.info(f"\n{'='*60}")
-        logger.info(f"Executing migration for: {table_name}")
-        logger.info(f"{'='*60}")
+        buf = io.StringIO()
+        buf.write(f"\n{SECTION_SEPARATOR}\n")
+        buf.write(f"Executing migration for: {table_name}\n")
+        buf.write(f"{SECTION_SEPARATOR}\n")
         
         if 'cleaning_query' in table_info:
-            logger.info(f"\nCleaning Query:")
-            logger.info(f"{'-'*40}")
-            logger.info(table_info['cleaning_query'])
-            logger.info(f"{'-'*40}")
+            _write_query_block(buf, "Cleaning Query", table_info['cleaning_query'])
         
         if 'copy_query' in table_info:
-            logger.info(f"\nCopy Query:")
-            logger.info(f"{'-'*40}")
-            logger.info(table_info['copy_query'])
-            logger.info(f"{'-'*40}")
-        logger.info()
+            _write_query_block(buf, "Copy Query", table_info['copy_query'])
+        logger.info(buf.getvalue())
     
     while True:
         success, error_msg = sf_client.run_cleaning_query(table_info, config.external_stage)
@@ -62,18 +82,12 @@ def migrate_single_table(
             action = ask_user_for_retry(table_info, "Snowflake cleaning")
             if action == 'retry':
                 continue
-            elif action == 'edit':
-                from utils.user_interaction import edit_cleaning_query
-                if edit_cleaning_query(table_info):
-                    continue
-                else:
-                    return False, f"Snowflake cleaning failed: {error_msg}"
-                return False, f"Snowflake cleaning failed: {error_msg}"
-        else:
-            return False, f"Snowflake cleaning failed: {error_msg}"
+            elif action == 'edit' and edit_cleaning_query(table_info):
+                continue
+        return False, f"Snowflake cleaning failed: {error_msg}", 0
     
     while True:
-        success, error_msg = sf_client.run_copy_query(table_info, config.external_stage)
+        success, error_msg, rows_unloaded = sf_client.run_copy_query(table_info, config.external_stage)
         
         if success:
             break
@@ -81,31 +95,41 @@ def migrate_single_table(
             action = ask_user_for_retry(table_info, "Snowflake COPY")
             if action == 'retry':
                 continue
-            elif action == 'edit':
-                from utils.user_interaction import edit_copy_query
-                if edit_copy_query(table_info):
-                    continue
-                else:
-                    return False, f"Snowflake COPY failed: {error_msg}"
-                return False, f"Snowflake COPY failed: {error_msg}"
-        else:
-            return False, f"Snowflake COPY failed: {error_msg}"
+            elif action == 'edit' and edit_copy_query(table_info):
+                continue
+        return False, f"Snowflake COPY failed: {error_msg}", 0
     
-    if config.interactive:
-        from utils.user_interaction import ask_bigquery_table_permission
-        proceed, abort = ask_bigquery_table_permission(table_info)
+    if config.verify_source_row_count:
+        sf_count = sf_client.get_table_row_count(
+            table_info['database'],
+            table_info['schema'],
+            table_info['table']
+        )
+    else:
+        sf_count = rows_unloaded
+    return True, "", sf_count
+
+
+def load_table_into_bigquery(
+    table_info: Dict[str, Any], 
+    sf_count: int,
+    bq_client: BigQueryClient,
+    config: MigrationConfig
+) -> Tuple[bool, str]:
+    """
+    Load a staged table into BigQuery and check its row count against Snowflake.
+
+    Args:
+        table_info: Table information dictionary
+        sf_count: Number of rows unloaded from Snowflake
+        bq_client: Connected BigQuery client
+        config: Migration configuration
         
-        if abort:
-            return False, "BigQuery loading aborted by user"
-        elif not proceed:
-            return False, "BigQuery loading skipped by user"
+    Returns:
+        Tuple of (success: bool, error_message: str)
+    """
+    table_name = format_table_name(table_info)
     
-    sf_count = sf_client.get_table_row_count(
-        table_info['database'],
-        table_info['schema'],
-        table_info['table']
-    )
-
     while True:
         success, error_msg, bq_count = bq_client.create_bq_table(table_info)
         
@@ -119,7 +143,6 @@ def migrate_single_table(
             logger.info(f"{sf_count} rows migrated successfully")
             break
         elif config.interactive:
-            from utils.user_interaction import ask_bigquery_table_permission
             logger.info(f"\nBigQuery table creation failed: {error_msg}")
             proceed, abort = ask_bigquery_table_permission(table_info)
             
@@ -136,12 +159,49 @@ def migrate_single_table(
     return True, ""
 
 
+def migrate_single_table(
+    table_info: Dict[str, Any], 
+    sf_client: SnowflakeClient, 
+    bq_client: BigQueryClient,
+    config: MigrationConfig,
+    confirm_load: bool = True
+) -> Tuple[bool, str]:
+    """
+    Migrate a single table from Snowflake to BigQuery.
+
+    Args:
+        table_info: Table information dictionary
+        sf_client: Connected Snowflake client
+        bq_client: Connected BigQuery client
+        config: Migration configuration
+        confirm_load: In interactive runs, ask before loading into BigQuery (e.g. to
+                      edit partitioning); off for tables the user approved as a batch
+        
+    Returns:
+        Tuple of (success: bool, error_message: str)
+    """
+    success, error_msg, sf_count = stage_table_in_snowflake(table_info, sf_client, config)
+    if not success:
+        return False, error_msg
+    
+    if config.interactive and confirm_load:
+        proceed, abort = ask_bigquery_table_permission(table_info)
+        
+        if abort:
+            return False, "BigQuery loading aborted by user"
+        elif not proceed:
+            return False, "BigQuery loading skipped by user"
+    
+    return load_table_into_bigquery(table_info, sf_count, bq_client, config)
+
+
 def handle_table_result(
     table_info: Dict[str, Any], 
     success: bool, 
     error_msg: str,
     succeeded_tables: List[Dict], 
-    failed_tables: List[Dict]
+    failed_tables: List[Dict],
+    result_writer: Optional[ResultFileWriter] = None
 ) -> None:
     """
     Handle the result of a table migration attempt.
@@ -152,25 +212,102 @@ def handle_table_result(
         error_msg: Error message if failed
         succeeded_tables: List to append successful tables
         failed_tables: List to append failed tables
+        result_writer: Writer that records the result in the result files right away
     """
     if success:
         succeeded_tables.append(table_info)
     else:
         table_info['error'] = error_msg
         failed_tables.append(table_info)
+    
+    if result_writer is not None:
+        result_writer.write(table_info, success)
+
 
+def _table_key(table_info: Dict[str, Any]) -> Tuple[str, str, str]:
+    """Identify a table by its (database, schema, table) names."""
+    return table_info['database'], table_info['schema'], table_info['table']
 
-def write_dry_run_file(table_list_with_queries: List[Dict[str, Any]], dry_run_file: str) -> None:
+
+def _abort_unfinished_tables(
+    table_infos: Iterable[Dict[str, Any]], 
+    succeeded_tables: List[Dict], 
+    failed_tables: List[Dict],
+    result_writer: Optional[ResultFileWriter] = None
+) -> None:
     """
-    Write dry run table information to a timestamped YAML file.
+    Record every table that has no result yet as aborted by Ctrl+C.
+
+    Args:
+        table_infos: Tables that were started or are still to come
+        succeeded_tables: List of successful tables so far
+        failed_tables: List of failed tables so far
+        result_writer: Writer that records the results in the result files
+    """
+    processed_keys = set(map(_table_key, chain(succeeded_tables, failed_tables)))
+    for table_info in table_infos:
+        key = _table_key(table_info)
+        if key not in processed_keys:
+            processed_keys.add(key)
+            handle_table_result(table_info, False, MSG_ABORTED_CTRL_C, succeeded_tables, failed_tables,
+                              result_writer)
+
+
+def _record_finished_futures(
+    futures: Dict[Future, Dict[str, Any]], 
+    succeeded_tables: List[Dict], 
+    failed_tables: List[Dict],
+    result_writer: Optional[ResultFileWriter] = None,
+    wait_for_all: bool = False
+) -> None:
+    """
+    Record the result of every finished table future and stop tracking it.
+
+    Cancelled futures are left in futures, so the caller can record them as aborted.
+
+    Args:
+        futures: Futures returning (success, error_message), mapped to their tables
+        succeeded_tables: List to append successful tables
+        failed_tables: List to append failed tables
+        result_writer: Writer that records the results in the result files
+        wait_for_all: Wait for every future and record each as it finishes, instead
+                      of only recording the ones already finished
+    """
+    if wait_for_all:
+        finished = as_completed(list(futures))
+    else:
+        finished = [future for future in futures if future.done() and not future.cancelled()]
+    
+    for future in finished:
+        table_info = futures.pop(future)
+        try:
+            success, error_msg = future.result()
+        except Exception as e:
+            success, error_msg = False, f"Unexpected error: {e}"
+        handle_table_result(table_info, success, error_msg, succeeded_tables, failed_tables, result_writer)
+
+
+def write_dry_run_file(
+    table_list_with_queries: List[Dict[str, Any]], 
+    dry_run_file: str, 
+    file_format: str = 'yaml'
+) -> None:
+    """
+    Write dry run table information to a timestamped file.
 
     Args:
         table_list_with_queries: List of tables with generated queries
         dry_run_file: Full path to the dry run file
+        file_format: 'yaml' for one YAML list, or 'jsonl' for one JSON document per table,
+                     which is much faster to write for thousands of tables
     """
     with open(dry_run_file, 'w') as f:
-        if table_list_with_queries:
-            yaml.dump(table_list_with_queries, f, default_flow_style=False, sort_keys=False, allow_unicode=True)
+        if file_format == 'jsonl':
+            for table_info in table_list_with_queries:
+                f.write(json.dumps(table_info, ensure_ascii=False))
+                f.write('\n')
+        elif table_list_with_queries:
+            yaml.dump(table_list_with_queries, f, Dumper=SafeDumper, default_flow_style=False, sort_keys=False, allow_unicode=True)
         else:
             f.write('')
     
@@ -178,6 +315,24 @@ def write_dry_run_file(table_list_with_queries: List[Dict[str, Any]], dry_run_fi
     logger.info(f"Table analysis saved to: {dry_run_file}")
 
 
+def _format_table_plan(table_info: Dict[str, Any], position: int, total: int, show_query: bool = True) -> str:
+    """Render a table's migration plan (names, type and COPY query) as one log message."""
+    buf = io.StringIO()
+    buf.write(f"\n{SECTION_SEPARATOR}\n")
+    buf.write(f"Table {position}/{total}: {format_table_name(table_info)}\n")
+    buf.write(f"{SECTION_SEPARATOR}\n")
+    buf.write(f"Database: {table_info['database']}\n")
+    buf.write(f"Schema:   {table_info['schema']}\n")
+    buf.write(f"Table:    {table_info['table']}\n")
+    
+    if 'table_type' in table_info:
+        buf.write(f"Type:     {table_info['table_type']}\n")
+    
+    if show_query:
+        _write_query_block(buf, "Generated COPY Query", table_info['copy_query'])
+    return buf.getvalue().rstrip('\n')
+
+
 def run_dry_mode(table_list_with_queries: List[Dict[str, Any]], config: MigrationConfig) -> None:
     """
     Run in dry mode - show complete table information and queries without executing.
@@ -190,32 +345,154 @@ def run_dry_mode(table_list_with_queries: List[Dict[str, Any]], config: Migratio
     logger.info(MSG_DRY_RUN)
     logger.info("Tables to be migrated:")
     
+    table_count = len(table_list_with_queries)
     for i, table_info in enumerate(table_list_with_queries, 1):
-        table_name = format_table_name(table_info)
-        
-        logger.info(f"\n{'='*60}")
-        logger.info(f"Table {i}/{len(table_list_with_queries)}: {table_name}")
-        logger.info(f"{'='*60}")
-        logger.info(f"Database: {table_info['database']}")
-        logger.info(f"Schema:   {table_info['schema']}")
-        logger.info(f"Table:    {table_info['table']}")
-        
-        if 'table_type' in table_info:
-            logger.info(f"Type:     {table_info['table_type']}")
-        
-        logger.info(f"\nGenerated COPY Query:")
-        logger.info(f"{'-'*40}")
-        logger.info(table_info['copy_query'])
-        logger.info(f"{'-'*40}")
+        logger.info(_format_table_plan(table_info, i, table_count))
     
     dry_run_file = config.create_dry_run_file()
-    write_dry_run_file(table_list_with_queries, dry_run_file)
+    write_dry_run_file(table_list_with_queries, dry_run_file, config.dry_run_format)
     
     logger.info(f"\nDry run complete! Found {len(table_list_with_queries)} table(s) ready for migration.")
 
 
+def _run_pipelined_migration(
+    table_list: Iterable[Dict[str, Any]], 
+    sf_client: SnowflakeClient,
+    bq_client: BigQueryClient, 
+    config: MigrationConfig,
+    succeeded_tables: List[Dict],
+    failed_tables: List[Dict]
+) -> None:
+    """
+    Migrate tables with Snowflake unloads and BigQuery loads overlapping.
+
+    Tables are staged one after another on the caller's Snowflake session; as soon as a
+    table is staged its BigQuery load is handed to a background thread, so the next
+    table's COPY runs while the previous one loads. Finished loads are recorded after
+    every staged table, and on Ctrl+C once the running loads are done.
+
+    Args:
+        table_list: Tables with COPY queries, consumed as they are produced
+        sf_client: Connected Snowflake client
+        bq_client: Connected BigQuery client
+        config: Migration configuration
+        succeeded_tables: List to append successful tables
+        failed_tables: List to append failed tables
+    """
+    bq_pool = ThreadPoolExecutor(max_workers=config.parallelism)
+    futures = {}
+    tables = iter(table_list)
+    started_tables = []
+    
+    try:
+        for table_info in tables:
+            started_tables.append(table_info)
+            success, error_msg, sf_count = stage_table_in_snowflake(table_info, sf_client, config)
+            if not success:
+                handle_table_result(table_info, False, error_msg, succeeded_tables, failed_tables,
+                                    config.result_writer)
+            else:
+                futures[bq_pool.submit(load_table_into_bigquery, table_info, sf_count, bq_client, config)] = table_info
+            _record_finished_futures(futures, succeeded_tables, failed_tables, config.result_writer)
+        
+        _record_finished_futures(futures, succeeded_tables, failed_tables, config.result_writer,
+                                 wait_for_all=True)
+    except KeyboardInterrupt:
+        logger.warning(MSG_INTERRUPTED)
+        logger.info("Waiting for running BigQuery loads to finish...")
+        bq_pool.shutdown(cancel_futures=True)
+        _record_finished_futures(futures, succeeded_tables, failed_tables, config.result_writer)
+        _abort_unfinished_tables(chain(started_tables, tables), succeeded_tables, failed_tables,
+                                 config.result_writer)
+    finally:
+        bq_pool.shutdown(cancel_futures=True)
+
+
+def _largest_tables_first(table_list: Iterable[Dict[str, Any]], sf_client: SnowflakeClient) -> List[Dict[str, Any]]:
+    """
+    Order tables by their Snowflake metadata row count, largest first.
+
+    Starting the longest migrations first keeps a big table from being picked up last
+    and running alone while the other workers sit idle.
+
+    Args:
+        table_list: Tables to migrate
+        sf_client: Connected Snowflake client
+
+    Returns:
+        List of the tables, largest first; tables without a row count (views) keep
+        their relative order at the end
+    """
+    table_list = list(table_list)
+    try:
+        row_counts = sf_client.get_table_row_counts(table_list)
+    except SnowflakeQueryError as e:
+        logger.warning(f"Could not get table row counts, keeping the configured table order: {e}")
+        return table_list
+    
+    table_list.sort(key=lambda table_info: row_counts.get(_table_key(table_info), 0), reverse=True)
+    return table_list
+
+
+def _run_parallel_migration(
+    table_list: Iterable[Dict[str, Any]], 
+    bq_client: BigQueryClient, 
+    config: MigrationConfig,
+    succeeded_tables: List[Dict],
+    failed_tables: List[Dict]
+) -> None:
+    """
+    Migrate tables concurrently on config.parallelism worker threads.
+
+    Snowflake connections keep per-session state (cursor, current database), so every
+    worker opens its own SnowflakeClient on first use; the BigQuery client is shared.
+    Results are recorded from the calling thread only.
+
+    Args:
+        table_list: Tables with COPY queries
+        bq_client: Connected BigQuery client
+        config: Migration configuration
+        succeeded_tables: List to append successful tables
+        failed_tables: List to append failed tables
+    """
+    worker_state = threading.local()
+    sf_connections = ExitStack()
+    sf_connections_lock = threading.Lock()
+    
+    def migrate_in_worker(table_info: Dict[str, Any]) -> Tuple[bool, str]:
+        sf_client = getattr(worker_state, 'sf_client', None)
+        if sf_client is None:
+            sf_client = SnowflakeClient(connection_name=config.snowflake_connection_name)
+            sf_client.__enter__()
+            with sf_connections_lock:
+                sf_connections.push(sf_client)
+            worker_state.sf_client = sf_client
+        return migrate_single_table(table_info, sf_client, bq_client, config)
+    
+    table_list = list(table_list)
+    bq_client.ensure_datasets(table_list)
+    
+    executor = ThreadPoolExecutor(max_workers=config.parallelism)
+    futures = {executor.submit(migrate_in_worker, table_info): table_info for table_info in table_list}
+    
+    try:
+        _record_finished_futures(futures, succeeded_tables, failed_tables, config.result_writer,
+                                 wait_for_all=True)
+    except KeyboardInterrupt:
+        logger.warning(MSG_INTERRUPTED)
+        logger.info("Waiting for running table migrations to finish...")
+        # Workers may still be running a COPY on their Snowflake session, so they must
+        # finish before the sessions are closed below
+        executor.shutdown(cancel_futures=True)
+        _record_finished_futures(futures, succeeded_tables, failed_tables, config.result_writer)
+        _abort_unfinished_tables(table_list, succeeded_tables, failed_tables, config.result_writer)
+    finally:
+        executor.shutdown(cancel_futures=True)
+        sf_connections.close()
+
+
 def run_migration_workflow(
-    table_list: List[Dict[str, Any]], 
+    table_list: Iterable[Dict[str, Any]], 
     sf_client: SnowflakeClient,
     bq_client: BigQueryClient, 
     config: MigrationConfig
@@ -223,8 +500,15 @@ def run_migration_workflow(
     """
     Execute the full migration workflow for all tables.
     
+    Interactive runs migrate tables one by one, asking for each table or, when
+    config.batch_confirm is above 1, once per batch of that many tables. Otherwise
+    tables are migrated concurrently on config.parallelism threads, largest first,
+    when that is above 1, or else unloaded one by one with each BigQuery load overlapping the
+    next unload.
+    
     Args:
-        table_list: List of tables with COPY queries
+        table_list: Tables with COPY queries; may be a lazy iterator, in which case
+                    tables are migrated as they are produced
         sf_client: Connected Snowflake client
         bq_client: Connected BigQuery client
         config: Migration configuration
@@ -234,34 +518,70 @@ def run_migration_workflow(
     """
     succeeded_tables = []
     failed_tables = []
+    
+    if not config.interactive:
+        if config.parallelism > 1:
+            table_list = _largest_tables_first(table_list, sf_client)
+            _run_parallel_migration(table_list, bq_client, config, succeeded_tables, failed_tables)
+        else:
+            _run_pipelined_migration(table_list, sf_client, bq_client, config, succeeded_tables, failed_tables)
+        return succeeded_tables, failed_tables
 
+    batch_size = max(1, config.batch_confirm)
+    tables = iter(table_list)
+    batch = []
+    aborted = False
     try:
-        for i, table_info in enumerate(table_list):
-            if config.interactive:
-                proceed, abort = ask_user_permission_per_table(table_info, config.verbose)
+        while not aborted:
+            batch = list(islice(tables, batch_size))
+            if not batch:
+                break
+            
+            action = 'review'
+            if batch_size > 1:
+                for position, table_info in enumerate(batch, 1):
+                    logger.info(_format_table_plan(table_info, position, len(batch), show_query=config.verbose))
+                action = ask_user_permission_per_batch(batch)
+            
+            if action in ('skip', 'abort'):
+                aborted = action == 'abort'
+                error_msg = 'Aborted by user' if aborted else 'Skipped by user'
+                for table_info in batch:
+                    handle_table_result(table_info, False, error_msg, succeeded_tables, failed_tables,
+                                        config.result_writer)
+                continue
+            
+            for table_info in batch:
+                proceed = True
+                if action == 'review' and not aborted:
+                    proceed, aborted = ask_user_permission_per_table(table_info, config.verbose)
+                
+                if aborted:
+                    handle_table_result(table_info, False, 'Aborted by user',
+                                      succeeded_tables, failed_tables, config.result_writer)
+                    continue
                 
-                if abort:
-                    for remaining_table in table_list[i:]:
-                        handle_table_result(remaining_table, False, 'Aborted by user', 
-                                          succeeded_tables, failed_tables)
-                    break
-                    
                 if not proceed:
                     handle_table_result(table_info, False, 'Skipped by user',
-                                      succeeded_tables, failed_tables)
+                                      succeeded_tables, failed_tables, config.result_writer)
                     continue
-            
-            success, error_msg = migrate_single_table(table_info, sf_client, bq_client, config)
-            handle_table_result(table_info, success, error_msg, succeeded_tables, failed_tables)
+                
+                success, error_msg = migrate_single_table(
+                    table_info, sf_client, bq_client, config, confirm_load=(action == 'review')
+                )
+                handle_table_result(table_info, success, error_msg, succeeded_tables, failed_tables,
+                                    config.result_writer)
 
-            logger.info("---------------------------------------------------------------------------------------------")
+                logger.info("---------------------------------------------------------------------------------------------")
+        
+        if aborted:
+            for remaining_table in tables:
+                handle_table_result(remaining_table, False, 'Aborted by user', 
+                                  succeeded_tables, failed_tables, config.result_writer)
                 
     except KeyboardInterrupt:
         logger.warning(MSG_INTERRUPTED)
-        for remaining_table in table_list[i:]:
-            if remaining_table not in succeeded_tables and remaining_table not in failed_tables:
-                handle_table_result(remaining_table, False, 'Aborted by user (Ctrl+C)',
-                                  succeeded_tables, failed_tables)
+        _abort_unfinished_tables(chain(batch, tables), succeeded_tables, failed_tables,
+                                 config.result_writer)
     
     return succeeded_tables, failed_tables
-
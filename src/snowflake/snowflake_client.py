@@ -1,16 +1,168 @@
-import os
+import atexit
+import functools
+import io
 import logging
-from typing import Optional, Dict, List, Tuple, Any
+import queue
+import re
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Iterable, Iterator, List, Tuple, Any
 
 import yaml
 import snowflake.connector
 from snowflake.connector.errors import ProgrammingError, OperationalError
 
+from config import DEFAULT_SAMPLE_LIMIT, DEFAULT_UNLOAD_COMPRESSION
+from utils.metadata_cache import MetadataCache
+from utils.retry import retry_transient
+
+try:
+    from yaml import CSafeLoader as YAML_LOADER
+except ImportError:
+    from yaml import SafeLoader as YAML_LOADER
+
 logger = logging.getLogger(__name__)
 
 TIMESTAMP_TYPES = {'TIMESTAMP_TZ', 'TIMESTAMP_LTZ'}
 BASE_TABLE_TYPE = 'BASE TABLE'
 VIEW_TYPE = 'VIEW'
+DEFAULT_METADATA_WORKERS = 8
+QUERY_FETCH_BATCH_SIZE = 10000
+MAX_POOLED_CONNECTIONS = 8
+
+# Shared by every database: the COLUMNS and TABLES views are passed as IDENTIFIER(%s)
+# bind values. The connector's default pyformat binding interpolates them on the client,
+# so this only handles quoting; Snowflake still receives different text per database.
+TABLE_METADATA_QUERY = """
+            SELECT 
+                c.table_catalog AS database_name,
+                c.table_schema AS schema_name,
+                c.table_name,
+                c.column_name,
+                c.data_type,
+                t.table_type AS table_type
+            FROM 
+                IDENTIFIER(%s) c
+            JOIN
+                IDENTIFIER(%s) t
+                ON c.table_name = t.table_name
+                AND c.table_schema = t.table_schema
+        """
+NON_WORD_CHARACTERS = re.compile(r'\W')
+UNDERSCORE_RUNS = re.compile(r'_{2,}')
+
+
+def _is_fully_qualified(object_name: str) -> bool:
+    """Whether a schema object name includes its database and schema (e.g. DB.SCHEMA.stage)."""
+    return len(object_name.split('.')) == 3
+
+
+def _is_transient_error(error: Exception) -> bool:
+    """Whether a failed statement is worth retrying (network and connection-level failures)."""
+    return isinstance(error, OperationalError)
+
+
+_idle_connections: Dict[str, List[snowflake.connector.connection.SnowflakeConnection]] = {}
+_idle_connections_lock = threading.Lock()
+
+
+def _acquire_pooled_connection(connection_name: str) -> Optional[snowflake.connector.connection.SnowflakeConnection]:
+    """Take an open idle connection for the given profile from the pool, if there is one."""
+    with _idle_connections_lock:
+        idle = _idle_connections.get(connection_name, [])
+        while idle:
+            conn = idle.pop()
+            if conn.is_closed() is False:
+                return conn
+    return None
+
+
+def _release_connection(connection_name: str, conn: snowflake.connector.connection.SnowflakeConnection) -> bool:
+    """
+    Return a connection to the pool so the next client using the same profile skips authentication.
+
+    Returns:
+        bool: False if the pool is full, in which case the caller should close the connection
+    """
+    with _idle_connections_lock:
+        idle = _idle_connections.setdefault(connection_name, [])
+        if len(idle) >= MAX_POOLED_CONNECTIONS:
+            return False
+        idle.append(conn)
+        return True
+
+
+def close_pooled_connections() -> None:
+    """Close every idle pooled connection. Runs automatically at interpreter exit."""
+    with _idle_connections_lock:
+        connections = [conn for idle in _idle_connections.values() for conn in idle]
+        _idle_connections.clear()
+    
+    for conn in connections:
+        try:
+            conn.close()
+        except Exception as e:
+            logger.warning(f"Error closing pooled connection: {e}")
+    if connections:
+        logger.info(f"Closed {len(connections)} pooled Snowflake connection(s).")
+
+
+atexit.register(close_pooled_connections)
+
+
+@functools.lru_cache(maxsize=4096)
+def _normalize_column_name(column_name: str) -> str:
+    """Cached implementation of SnowflakeClient._normalize_column_name_for_bigquery (column names repeat across tables)."""
+    if not column_name:
+        return '_'
+        
+    name = column_name.strip()
+    if name.startswith('"') and name.endswith('"'):
+        name = name[1:-1]
+    name = name.strip()
+    
+    name = name.replace('""', '"')
+    
+    # \W is exactly "not str.isalnum() and not '_'", so non-ASCII letters are kept
+    normalized = NON_WORD_CHARACTERS.sub('_', name)
+    
+    if normalized and normalized[0].isdigit():
+        normalized = '_' + normalized
+        
+    if not normalized or not (normalized[0].isalpha() or normalized[0] == '_'):
+        normalized = '_' + normalized if normalized else '_'
+        
+    normalized = UNDERSCORE_RUNS.sub('_', normalized)
+    normalized = normalized.rstrip('_')
+    
+    if not normalized or normalized == '_':
+        normalized = '_'
+        
+    if len(normalized) > 300:
+        normalized = normalized[:300]
+        
+    reserved_prefixes = ['_TABLE_', '_FILE_', '_PARTITION_']
+    for prefix in reserved_prefixes:
+        if normalized.upper().startswith(prefix):
+            normalized = normalized + '_'
+            break
+
+    return normalized.lower()
+
+
+@functools.lru_cache(maxsize=4096)
+def _column_expression(col_name: str, data_type: str, cast_timestamp_to_string: bool) -> str:
+    """Cached implementation of SnowflakeClient._build_column_expression, reused when queries are regenerated."""
+    escaped_col_name = col_name.replace('"', '""')
+    quoted_col = f'"{escaped_col_name}"'
+    
+    quoted_alias = f'"{_normalize_column_name(quoted_col)}"'
+    
+    if cast_timestamp_to_string and data_type in TIMESTAMP_TYPES:
+        return f'{quoted_col}::TIMESTAMP_NTZ AS {quoted_alias}'
+    else:
+        return f'{quoted_col} AS {quoted_alias}'
 
 
 class SnowflakeConnectionError(Exception):
@@ -34,23 +186,44 @@ class SnowflakeClient:
     - Handle database context switching
     """
 
-    def __init__(self, connection_name: str = "default"):
+    def __init__(
+        self,
+        connection_name: str = "default",
+        metadata_workers: int = DEFAULT_METADATA_WORKERS,
+        metadata_cache: Optional[MetadataCache] = None
+    ):
         """
         Initialize the Snowflake client.
 
         Args:
             connection_name: Name of the connection profile in connections.toml
+            metadata_workers: Maximum number of databases whose metadata is queried concurrently
+            metadata_cache: Local cache of table metadata queries (always query Snowflake when None)
         """
         self.connection_name = connection_name
+        self.metadata_workers = max(1, metadata_workers)
+        self.metadata_cache = metadata_cache
         self.conn: Optional[snowflake.connector.connection.SnowflakeConnection] = None
         self.cursor: Optional[snowflake.connector.cursor.SnowflakeCursor] = None
         self.current_db: Optional[str] = None
+        self._idle_cursors: "queue.LifoQueue[snowflake.connector.cursor.SnowflakeCursor]" = queue.LifoQueue()
 
     def __enter__(self):
-        """Connect to Snowflake when entering context manager."""
+        """Connect to Snowflake when entering context manager, reusing a pooled connection if possible."""
+        pooled_conn = _acquire_pooled_connection(self.connection_name)
+        if pooled_conn is not None:
+            logger.info(f"Reusing pooled Snowflake connection: '{self.connection_name}'")
+            self.conn = pooled_conn
+            self.cursor = self.conn.cursor()
+            return self
+        
         try:
             logger.info(f"Connecting to Snowflake using connection: '{self.connection_name}'...")
-            self.conn = snowflake.connector.connect(connection_name=self.connection_name)
+            # Keep-alive stops the session from expiring while long BigQuery loads leave it idle
+            self.conn = snowflake.connector.connect(
+                connection_name=self.connection_name,
+                client_session_keep_alive=True
+            )
             self.cursor = self.conn.cursor()
             logger.info("Connected successfully.")
             return self
@@ -62,59 +235,139 @@ class SnowflakeClient:
             raise SnowflakeConnectionError(f"Unexpected connection error: {e}")
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """Close Snowflake connection when exiting context manager."""
+        """
+        Return the Snowflake connection to the pool when exiting context manager.
+
+        The connection is closed instead when the block raised (its session may be in
+        an unknown state) or when the pool is full.
+        """
         if self.conn:
+            self._close_idle_cursors()
+            if self.cursor is not None:
+                try:
+                    self.cursor.close()
+                except Exception as e:
+                    logger.warning(f"Error closing cursor: {e}")
+            
+            if exc_type is None and _release_connection(self.connection_name, self.conn):
+                logger.debug("Snowflake connection returned to the pool.")
+            else:
+                try:
+                    self.conn.close()
+                    logger.info("Snowflake connection closed.")
+                except Exception as e:
+                    logger.warning(f"Error closing connection: {e}")
+            self.conn = None
+            self.cursor = None
+        return False
+
+    @contextmanager
+    def _acquire_cursor(self) -> Iterator[snowflake.connector.cursor.SnowflakeCursor]:
+        """
+        Borrow a cursor that no other thread is using, for statements run concurrently.
+
+        Cursors are created on demand and kept for reuse until the client exits.
+        """
+        try:
+            cursor = self._idle_cursors.get_nowait()
+        except queue.Empty:
+            cursor = self.conn.cursor()
+        try:
+            yield cursor
+        finally:
+            self._idle_cursors.put(cursor)
+
+    def _close_idle_cursors(self) -> None:
+        """Close the cursors kept by _acquire_cursor."""
+        while True:
+            try:
+                cursor = self._idle_cursors.get_nowait()
+            except queue.Empty:
+                return
             try:
-                self.conn.close()
-                logger.info("Snowflake connection closed.")
+                cursor.close()
             except Exception as e:
-                logger.warning(f"Error closing connection: {e}")
-        return False
+                logger.warning(f"Error closing cursor: {e}")
 
     def _ensure_connection(self) -> None:
         """Ensure we have an active connection."""
         if not self.conn:
             raise SnowflakeConnectionError("No active Snowflake connection")
 
-    def _switch_database_if_needed(self, database: str) -> None:
-        """Switch to database if different from current."""
+    def _switch_database_if_needed(self, database: str, external_stage: Optional[str] = None) -> None:
+        """
+        Switch to database if different from current.
+
+        Statements only depend on the current database to resolve a stage name that is not
+        fully qualified (database.schema.stage), so the round-trip is skipped for such stages.
+        """
+        if external_stage is not None and _is_fully_qualified(external_stage):
+            return
         if database != self.current_db:
             logger.debug(f"Switching database to: {database}")
             try:
-                self.cursor.execute(f"USE DATABASE {database}")
+                self.cursor.execute("USE DATABASE IDENTIFIER(%s)", (database,))
                 self.current_db = database
             except Exception as e:
                 logger.error(f"Failed to switch to database {database}: {e}")
                 raise SnowflakeQueryError(f"Database switch failed: {e}")
 
-    def execute_query(self, query: str) -> List[Dict]:
+    def execute_query(
+        self,
+        query: str,
+        params: Optional[List[Any]] = None,
+        cursor: Optional[snowflake.connector.cursor.SnowflakeCursor] = None
+    ) -> Iterator[Dict]:
         """
-        Execute a SQL query and return results as list of dictionaries.
+        Execute a SQL query and stream its results as dictionaries.
+
+        The query runs immediately; rows are then fetched lazily in batches of
+        QUERY_FETCH_BATCH_SIZE, so the full result set is never held in memory at once.
 
         Args:
             query: SQL query to execute
+            params: Values bound to the query's %s placeholders
+            cursor: Cursor to run the query on (defaults to the client's cursor)
 
         Returns:
-            List of dictionaries containing query results
+            Iterator of dictionaries keyed by column name
 
         Raises:
-            SnowflakeQueryError: If query execution fails
+            SnowflakeQueryError: If query execution or fetching fails
         """
         self._ensure_connection()
         
+        if cursor is None:
+            cursor = self.cursor
+        
         try:
-            self.cursor.execute(query)
+            cursor.execute(query, params)
             logger.debug(f"Query executed successfully: {query[:100]}...")
-            return self.cursor.fetch_pandas_all().to_dict('records')
         except Exception as e:
             logger.error(f"Query execution failed: {e}")
             raise SnowflakeQueryError(f"Query failed: {e}")
+        
+        return self._iter_rows(cursor)
+
+    def _iter_rows(self, cursor: snowflake.connector.cursor.SnowflakeCursor) -> Iterator[Dict]:
+        """Yield the rows of the cursor's last query as dictionaries, fetching them in batches."""
+        column_names = [column[0] for column in cursor.description]
+        try:
+            while True:
+                rows = cursor.fetchmany(QUERY_FETCH_BATCH_SIZE)
+                if not rows:
+                    return
+                for row in rows:
+                    yield dict(zip(column_names, row))
+        except Exception as e:
+            logger.error(f"Fetching query results failed: {e}")
+            raise SnowflakeQueryError(f"Query failed: {e}")
 
     def _load_yaml_config(self, file_path: str) -> List[Dict[str, Any]]:
         """Load and validate YAML configuration file."""
         try:
             with open(file_path, 'r') as file:
-                data = yaml.safe_load(file)
+                data = yaml.load(file, Loader=YAML_LOADER)
         except FileNotFoundError:
             raise FileNotFoundError(f"Configuration file '{file_path}' not found")
         except yaml.YAMLError as e:
@@ -125,55 +378,75 @@ class SnowflakeClient:
 
         return data
 
-    def _build_table_query(self, config: Dict[str, Any]) -> str:
-        """Build SQL query to get table metadata based on configuration."""
-        database = config['database']
+    def _build_item_conditions(self, config: Dict[str, Any]) -> Tuple[List[str], List[str]]:
+        """Build the WHERE conditions selecting the tables of one configuration item, with their bind values."""
         schema = config.get('schema')
         table = config.get('table')
         exclude_schema_like = config.get('exclude_schema_like', [])
         exclude_table_like = config.get('exclude_table_like', [])
         with_views = config.get('with_views', False)
 
-        base_query = f"""
-            SELECT 
-                c.table_catalog AS database_name,
-                c.table_schema AS schema_name,
-                c.table_name,
-                c.column_name,
-                c.data_type,
-                t.table_type AS table_type
-            FROM 
-                {database}.INFORMATION_SCHEMA.COLUMNS c
-            JOIN
-                {database}.INFORMATION_SCHEMA.TABLES t
-                ON c.table_name = t.table_name
-                AND c.table_schema = t.table_schema
-        """
-
         where_clauses = []
+        params = []
 
         if not with_views:
-            where_clauses.append(f"t.table_type = '{BASE_TABLE_TYPE}'")
+            where_clauses.append("t.table_type = %s")
+            params.append(BASE_TABLE_TYPE)
 
         if schema:
-            where_clauses.append(f"c.table_schema = '{schema.upper()}'")
+            where_clauses.append("c.table_schema = %s")
+            params.append(schema.upper())
         if table:
-            where_clauses.append(f"c.table_name = '{table.upper()}'")
+            where_clauses.append("c.table_name = %s")
+            params.append(table.upper())
 
-        for pattern in exclude_schema_like:
-            if pattern:
-                where_clauses.append(f"c.table_schema NOT LIKE '{pattern.upper()}'")
-        
-        for pattern in exclude_table_like:
-            if pattern:
-                where_clauses.append(f"c.table_name NOT LIKE '{pattern.upper()}'")
+        # One LIKE ANY per column instead of a chain of NOT LIKE conditions
+        for column, patterns in (('c.table_schema', exclude_schema_like), ('c.table_name', exclude_table_like)):
+            patterns = [pattern.upper() for pattern in patterns if pattern]
+            if patterns:
+                placeholders = ", ".join(["%s"] * len(patterns))
+                where_clauses.append(f"NOT ({column} LIKE ANY ({placeholders}))")
+                params.extend(patterns)
+
+        return where_clauses, params
+
+    def _build_batched_table_query(self, database: str, items: List[Dict[str, Any]]) -> Tuple[str, List[str]]:
+        """
+        Build one SQL query getting table metadata for all configuration items of a database.
 
-        full_query = base_query
-        if where_clauses:
-            full_query += " WHERE " + " AND ".join(where_clauses)
+        The conditions of each item are AND-ed and the items are OR-ed together, so a single
+        INFORMATION_SCHEMA query replaces one query per item. Names and patterns are passed
+        as bind values so the connector quotes and escapes them; with its default pyformat
+        binding they are interpolated on the client, not bound on the server.
+
+        Args:
+            database: Database shared by the items
+            items: Validated configuration items targeting that database
+
+        Returns:
+            Tuple of (SQL query string, bind values)
+        """
+        params = [f"{database}.INFORMATION_SCHEMA.COLUMNS", f"{database}.INFORMATION_SCHEMA.TABLES"]
+
+        item_predicates = []
+        item_params = []
+        for item in items:
+            where_clauses, where_params = self._build_item_conditions(item)
+            if not where_clauses:
+                # This item selects every table, which makes the other items redundant
+                item_predicates = []
+                item_params = []
+                break
+            item_predicates.append("(" + " AND ".join(where_clauses) + ")")
+            item_params.extend(where_params)
+
+        full_query = TABLE_METADATA_QUERY
+        if item_predicates:
+            full_query += " WHERE " + " OR ".join(item_predicates)
+            params.extend(item_params)
 
         full_query += " ORDER BY c.table_schema, c.table_name, c.ordinal_position"
-        return full_query
+        return full_query, params
 
     def _validate_config_item(self, item: Dict[str, Any]) -> bool:
         """Validate a single configuration item."""
@@ -195,46 +468,72 @@ class SnowflakeClient:
 
         return True
 
-    def _process_query_results(self, results: List[Dict]) -> Dict[Tuple[str, str, str], Dict[str, Any]]:
-        """Process query results into organized table structure."""
+    def _process_query_results(self, results: Iterable[Dict]) -> Dict[Tuple[str, str, str], Dict[str, Any]]:
+        """
+        Fold query result rows (one per column) into organized table structure.
+
+        Rows are consumed one at a time, so a streamed result is never materialized as a list.
+        """
         tables_with_columns = {}
 
         for row in results:
-            db_name = row['DATABASE_NAME']
-            schema_name = row['SCHEMA_NAME']
-            table_name = row['TABLE_NAME']
-            column_name = row['COLUMN_NAME']
-            data_type = row['DATA_TYPE']
-            table_type = row['TABLE_TYPE']
-
-            table_key = (db_name, schema_name, table_name)
-
-            if table_key not in tables_with_columns:
-                tables_with_columns[table_key] = {}
-                tables_with_columns[table_key]['database'] = db_name
-                tables_with_columns[table_key]['schema'] = schema_name
-                tables_with_columns[table_key]['table'] = table_name
-                tables_with_columns[table_key]['table_type'] = table_type
-
-                tables_with_columns[table_key]['columns'] = []
-
-            column_info = {
-                'column_name': column_name,
-                'data_type': data_type
-            }
-            tables_with_columns[table_key]['columns'].append(column_info)
+            table_key = (row['DATABASE_NAME'], row['SCHEMA_NAME'], row['TABLE_NAME'])
+
+            # A lookup first, so the table dict is only built for the first column of each table
+            table_info = tables_with_columns.get(table_key)
+            if table_info is None:
+                table_info = tables_with_columns[table_key] = {
+                    'database': row['DATABASE_NAME'],
+                    'schema': row['SCHEMA_NAME'],
+                    'table': row['TABLE_NAME'],
+                    'table_type': row['TABLE_TYPE'],
+                    'columns': []
+                }
+
+            table_info['columns'].append({
+                'column_name': row['COLUMN_NAME'],
+                'data_type': row['DATA_TYPE']
+            })
 
         return tables_with_columns
 
-    def list_tables_from_yaml(self, file_path: str) -> List[Dict[str, Any]]:
+    def _query_database_tables(self, database: str, items: List[Dict[str, Any]]) -> Dict[Tuple[str, str, str], Dict[str, Any]]:
+        """Query the metadata of one database on a borrowed cursor, so databases can be queried concurrently."""
+        query, params = self._build_batched_table_query(database, items)
+        
+        if self.metadata_cache is not None:
+            cached_tables = self.metadata_cache.get(self.connection_name, query, params)
+            if cached_tables is not None:
+                logger.info(f"Using cached table metadata for database: {database}")
+                return {
+                    (table_info['database'], table_info['schema'], table_info['table']): table_info
+                    for table_info in cached_tables
+                }
+        
+        logger.info(f"Querying tables for database: {database} ({len(items)} configuration item(s))")
+        
+        with self._acquire_cursor() as cursor:
+            table_data = self._process_query_results(self.execute_query(query, params, cursor=cursor))
+        
+        if self.metadata_cache is not None:
+            self.metadata_cache.set(self.connection_name, query, params, list(table_data.values()))
+        return table_data
+
+    def iter_tables_from_yaml(self, file_path: str) -> Iterator[Dict[str, Any]]:
         """
-        Parse YAML configuration and query Snowflake for table metadata.
+        Parse YAML configuration and lazily yield table metadata from Snowflake.
+
+        Configuration items are grouped by database and each database is queried once.
+        Up to metadata_workers databases are queried concurrently. Tables are yielded
+        in configuration order as soon as their database's query returns, so callers
+        can start working before every database has been queried. A table matched by
+        several items is yielded once.
 
         Args:
             file_path: Path to the YAML configuration file
 
-        Returns:
-            List of dictionaries, each representing a table with its columns
+        Yields:
+            Dictionary representing a table with its columns
 
         Raises:
             FileNotFoundError: If YAML file is not found
@@ -245,33 +544,58 @@ class SnowflakeClient:
         
         config_items = self._load_yaml_config(file_path)
         
-        all_tables = {}
+        items_by_database: Dict[str, List[Dict[str, Any]]] = {}
+        for item in config_items:
+            if self._validate_config_item(item):
+                items_by_database.setdefault(item['database'], []).append(item)
+        
+        if not items_by_database:
+            return
+        
+        seen_tables = set()
         
         logger.info("Processing table configuration...")
-        for item in config_items:
-            if not self._validate_config_item(item):
-                continue
-
-            try:
-                query = self._build_table_query(item)
-                logger.info(f"Querying tables for database: {item['database']}")
-                
-                query_results = self.execute_query(query)
-                
-                table_data = self._process_query_results(query_results)
-                
-                all_tables.update(table_data)
+        max_workers = min(self.metadata_workers, len(items_by_database))
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sf-metadata") as executor:
+            futures = [
+                (database, executor.submit(self._query_database_tables, database, items))
+                for database, items in items_by_database.items()
+            ]
+            
+            for database, future in futures:
+                try:
+                    table_data = future.result()
+                except (ProgrammingError, SnowflakeQueryError) as e:
+                    logger.error(f"Database error for database {database}: {e}")
+                    continue
+                except Exception as e:
+                    logger.error(f"Unexpected error processing database {database}: {e}")
+                    continue
                 
-            except (ProgrammingError, SnowflakeQueryError) as e:
-                logger.error(f"Database error for item {item}: {e}")
-                continue
-            except Exception as e:
-                logger.error(f"Unexpected error processing item {item}: {e}")
-                continue
+                for table_key, table_info in table_data.items():
+                    if table_key not in seen_tables:
+                        seen_tables.add(table_key)
+                        yield table_info
 
-        return list(all_tables.values())
+    def list_tables_from_yaml(self, file_path: str) -> List[Dict[str, Any]]:
+        """
+        Parse YAML configuration and query Snowflake for table metadata.
 
-    def _normalize_column_name_for_bigquery(self, column_name: str) -> str:
+        Args:
+            file_path: Path to the YAML configuration file
+
+        Returns:
+            List of dictionaries, each representing a table with its columns
+
+        Raises:
+            FileNotFoundError: If YAML file is not found
+            ValueError: If YAML file is invalid
+            SnowflakeQueryError: If database queries fail
+        """
+        return list(self.iter_tables_from_yaml(file_path))
+
+    @staticmethod
+    def _normalize_column_name_for_bigquery(column_name: str) -> str:
         """
         Normalize column name using BigQuery V2 character mapping rules.
         This matches the behavior of column_name_character_map="V2" in BigQuery load jobs.
@@ -282,64 +606,14 @@ class SnowflakeClient:
         Returns:
             Normalized column name that follows BigQuery naming conventions
         """
-        if not column_name:
-            return '_'
-            
-        name = column_name.strip()
-        if name.startswith('"') and name.endswith('"'):
-            name = name[1:-1]
-        name = name.strip()
-        
-        name = name.replace('""', '"')
-        
-        normalized = ''
-        for char in name:
-            if char.isalnum() or char == '_':
-                normalized += char
-            else:
-                normalized += '_'
-        
-        if normalized and normalized[0].isdigit():
-            normalized = '_' + normalized
-            
-        if not normalized or not (normalized[0].isalpha() or normalized[0] == '_'):
-            normalized = '_' + normalized if normalized else '_'
-            
-        while '__' in normalized:
-            normalized = normalized.replace('__', '_')
-        normalized = normalized.rstrip('_')
-        
-        if not normalized or normalized == '_':
-            normalized = '_'
-            
-        if len(normalized) > 300:
-            normalized = normalized[:300]
-            
-        reserved_prefixes = ['_TABLE_', '_FILE_', '_PARTITION_']
-        for prefix in reserved_prefixes:
-            if normalized.upper().startswith(prefix):
-                normalized = normalized + '_'
-                break
-
-        normalized = normalized.lower()
-
+        normalized = _normalize_column_name(column_name)
         logger.debug(f"Normalized column name: '{column_name}' -> '{normalized}'")
         return normalized
 
-    def _build_column_expression(self, column: Dict[str, str], cast_timestamp_to_string: bool = True) -> str:
+    @staticmethod
+    def _build_column_expression(column: Dict[str, str], cast_timestamp_to_string: bool = True) -> str:
         """Build a column expression for SELECT query."""
-        col_name = column["column_name"]
-        data_type = column["data_type"]
-        
-        quoted_col = f'"{col_name.replace('"', '""')}"'
-        
-        normalized_alias = self._normalize_column_name_for_bigquery(quoted_col)
-        quoted_alias = f'"{normalized_alias}"'
-        
-        if cast_timestamp_to_string and data_type in TIMESTAMP_TYPES:
-            return f'{quoted_col}::TIMESTAMP_NTZ AS {quoted_alias}'
-        else:
-            return f'{quoted_col} AS {quoted_alias}'
+        return _column_expression(column["column_name"], column["data_type"], cast_timestamp_to_string)
 
     def _build_gcs_path(self, database: str, schema: str, table: str) -> str:
         """Build GCS path for table data."""
@@ -353,7 +627,10 @@ class SnowflakeClient:
         table: str,
         columns: List[Dict[str, str]], 
         sample: bool = False, 
-        cast_timestamp_to_string: bool = True
+        cast_timestamp_to_string: bool = True,
+        compression: str = DEFAULT_UNLOAD_COMPRESSION,
+        sample_limit: int = DEFAULT_SAMPLE_LIMIT,
+        max_file_size: Optional[int] = None
     ) -> str:
         """
         Generate a Snowflake COPY INTO query to unload table data to GCS.
@@ -364,36 +641,42 @@ class SnowflakeClient:
             schema: Schema name  
             table: Table name
             columns: List of column info dicts with 'column_name' and 'data_type'
-            sample: If True, limit rows to SAMPLE_LIMIT environment variable
+            sample: If True, limit rows to sample_limit
             cast_timestamp_to_string: If True, cast timestamp columns to strings
+            compression: Parquet compression codec of the unloaded files (SNAPPY, LZO, AUTO or NONE)
+            sample_limit: Number of rows to copy when sampling (config.sample_limit in a migration run)
+            max_file_size: Upper size limit in bytes of each unloaded file (Snowflake's default when None)
 
         Returns:
             Formatted COPY INTO query string
         """
-        sample_limit = int(os.getenv('SAMPLE_LIMIT', 100))
         fully_qualified_table = f"{db}.{schema}.{table}"
 
-        column_expressions = [
-            self._build_column_expression(col, cast_timestamp_to_string) 
-            for col in columns
-        ]
-        
         gcs_path = self._build_gcs_path(db, schema, table)
 
-        formatted_select = f"""    SELECT
-        {(',\n        '.join(column_expressions))}
-    FROM {fully_qualified_table}"""
+        select = io.StringIO()
+        select.write("    SELECT\n        ")
+        for i, column in enumerate(columns):
+            if i:
+                select.write(",\n        ")
+            select.write(self._build_column_expression(column, cast_timestamp_to_string))
+        select.write(f"\n    FROM {fully_qualified_table}")
         
         if sample:
-            formatted_select += f"\n    LIMIT {sample_limit}"
+            select.write(f"\n    LIMIT {sample_limit}")
+        formatted_select = select.getvalue()
+
+        file_size_options = ""
+        if max_file_size:
+            file_size_options = f"\nSINGLE = FALSE\nMAX_FILE_SIZE = {max_file_size}"
 
         query = f"""COPY INTO @{external_stage}/{gcs_path}
 FROM (
 {formatted_select}
 )
-FILE_FORMAT = (TYPE = PARQUET, SNAPPY_COMPRESSION = TRUE)
+FILE_FORMAT = (TYPE = PARQUET, COMPRESSION = {compression})
 OVERWRITE = TRUE
-HEADER = TRUE;"""
+HEADER = TRUE{file_size_options};"""
 
         return query
 
@@ -402,24 +685,30 @@ HEADER = TRUE;"""
         gcs_path = self._build_gcs_path(db, schema, table)
         return f"REMOVE @{external_stage}/{gcs_path}"
 
-    def generate_copy_queries(
+    def iter_copy_queries(
         self, 
-        table_list: List[Dict[str, Any]], 
+        table_list: Iterable[Dict[str, Any]], 
         external_stage: str, 
         sample: bool = False,
-        cast_timestamp_to_string: bool = True
-    ) -> List[Dict[str, Any]]:
+        cast_timestamp_to_string: bool = True,
+        compression: str = DEFAULT_UNLOAD_COMPRESSION,
+        sample_limit: int = DEFAULT_SAMPLE_LIMIT,
+        max_file_size: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
         """
-        Generate COPY queries for a list of tables.
+        Lazily generate COPY queries, one table at a time.
 
         Args:
-            table_list: List of table dictionaries
+            table_list: Table dictionaries, e.g. from iter_tables_from_yaml
             external_stage: Name of the external stage
             sample: Whether to sample data (limit rows)
             cast_timestamp_to_string: Whether to cast timestamps to strings
+            compression: Parquet compression codec of the unloaded files
+            sample_limit: Number of rows to copy when sampling
+            max_file_size: Upper size limit in bytes of each unloaded file
 
-        Returns:
-            Updated table list with 'copy_query' added to each table
+        Yields:
+            Each table dictionary, updated in place with 'cleaning_query' and 'copy_query'
         """
         for table_info in table_list:
             try:
@@ -435,7 +724,10 @@ HEADER = TRUE;"""
                     table=table_info['table'],
                     columns=table_info['columns'],
                     sample=sample,
-                    cast_timestamp_to_string=cast_timestamp_to_string
+                    cast_timestamp_to_string=cast_timestamp_to_string,
+                    compression=compression,
+                    sample_limit=sample_limit,
+                    max_file_size=max_file_size
                 )
 
                 ordered_table_info = {
@@ -469,22 +761,115 @@ HEADER = TRUE;"""
                 table_info.clear()
                 table_info.update(ordered_table_info)
 
-        return table_list
+            yield table_info
+
+    def generate_copy_queries(
+        self, 
+        table_list: List[Dict[str, Any]], 
+        external_stage: str, 
+        sample: bool = False,
+        cast_timestamp_to_string: bool = True,
+        compression: str = DEFAULT_UNLOAD_COMPRESSION,
+        sample_limit: int = DEFAULT_SAMPLE_LIMIT,
+        max_file_size: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate COPY queries for a list of tables.
+
+        Args:
+            table_list: List of table dictionaries
+            external_stage: Name of the external stage
+            sample: Whether to sample data (limit rows)
+            cast_timestamp_to_string: Whether to cast timestamps to strings
+            compression: Parquet compression codec of the unloaded files
+            sample_limit: Number of rows to copy when sampling
+            max_file_size: Upper size limit in bytes of each unloaded file
+
+        Returns:
+            Updated table list with 'copy_query' added to each table
+        """
+        return list(self.iter_copy_queries(
+            table_list, external_stage, sample, cast_timestamp_to_string, compression, sample_limit, max_file_size
+        ))
+
+    def get_table_row_count(self, db: str, schema: str, table: str, exact: bool = False) -> int:
+        """
+        Get row count for a table.
+
+        By default the count is read from INFORMATION_SCHEMA.TABLES.ROW_COUNT, which Snowflake
+        maintains as metadata, so no table scan is needed. Views have no such metadata and
+        are counted with COUNT(*).
 
-    def get_table_row_count(self, db: str, schema: str, table: str) -> int:
-        """Get row count for a table."""
+        Args:
+            db: Database name
+            schema: Schema name
+            table: Table name
+            exact: Always run a COUNT(*) query instead of reading metadata
+
+        Returns:
+            int: Number of rows
+        """
         self._ensure_connection()
         
-        query = f"SELECT COUNT(*) as count FROM {db}.{schema}.{table}"
+        if not exact:
+            counts = self.get_table_row_counts([{'database': db, 'schema': schema, 'table': table}])
+            if (db, schema, table) in counts:
+                return counts[(db, schema, table)]
+        
+        query = "SELECT COUNT(*) as count FROM IDENTIFIER(%s)"
         
         try:
-            self.cursor.execute(query)
+            self.cursor.execute(query, (f"{db}.{schema}.{table}",))
             result = self.cursor.fetchone()
             return result[0] if result else 0
         except Exception as e:
             logger.error(f"Error getting row count: {e}")
             raise SnowflakeQueryError(f"Failed to get row count: {e}")
 
+    def get_table_row_counts(self, table_infos: Iterable[Dict[str, Any]]) -> Dict[Tuple[str, str, str], int]:
+        """
+        Get metadata row counts for many tables with one INFORMATION_SCHEMA query per database.
+
+        Args:
+            table_infos: Table info dictionaries with database, schema and table names
+
+        Returns:
+            Dict mapping (database, schema, table) to its row count. Views and tables
+            without metadata are left out.
+        """
+        self._ensure_connection()
+        
+        tables_by_database: Dict[str, List[Tuple[str, str]]] = {}
+        for table_info in table_infos:
+            tables_by_database.setdefault(table_info['database'], []).append(
+                (table_info['schema'], table_info['table'])
+            )
+        
+        counts = {}
+        for database, tables in tables_by_database.items():
+            placeholders = ", ".join(["(%s, %s)"] * len(tables))
+            query = (
+                f"SELECT TABLE_SCHEMA, TABLE_NAME, ROW_COUNT FROM IDENTIFIER(%s) "
+                f"WHERE (TABLE_SCHEMA, TABLE_NAME) IN ({placeholders}) AND ROW_COUNT IS NOT NULL"
+            )
+            params = [f"{database}.INFORMATION_SCHEMA.TABLES"]
+            params.extend(name for schema_and_table in tables for name in schema_and_table)
+            
+            try:
+                self.cursor.execute(query, params)
+                for schema, table, row_count in self.cursor.fetchall():
+                    counts[(database, schema, table)] = row_count
+            except Exception as e:
+                logger.error(f"Error getting row counts for database {database}: {e}")
+                raise SnowflakeQueryError(f"Failed to get row counts: {e}")
+        
+        return counts
+
+    @retry_transient(_is_transient_error)
+    def _execute_with_retry(self, query: str) -> None:
+        """Execute a statement, retrying transient failures with exponential backoff."""
+        self.cursor.execute(query)
+
     def run_cleaning_query(self, table_info: Dict[str, Any], external_stage: str) -> Tuple[bool, Optional[str]]:
         """
         Execute cleaning query for a table to remove existing data from GCS.
@@ -512,11 +897,11 @@ HEADER = TRUE;"""
             return False, error_msg
 
         try:
-            self._switch_database_if_needed(db)
+            self._switch_database_if_needed(db, external_stage)
             
             logger.info(f"Cleaning existing data for {db}.{schema}.{table}...")
             logger.info(f"DEBUG: About to execute cleaning query: {cleaning_query}")
-            self.cursor.execute(cleaning_query)
+            self._execute_with_retry(cleaning_query)
             
             logger.info(f"Successfully cleaned data for {db}.{schema}.{table}")
             return True, None
@@ -530,7 +915,19 @@ HEADER = TRUE;"""
             logger.error(f"Unexpected error cleaning data for {db}.{schema}.{table}: {error_msg}")
             return False, error_msg
 
-    def run_copy_query(self, table_info: Dict[str, Any], external_stage: str) -> Tuple[bool, Optional[str]]:
+    def _fetch_rows_unloaded(self) -> int:
+        """Sum the unloaded row counts reported by the last COPY INTO <location> result."""
+        if not self.cursor.description:
+            return 0
+        
+        column_names = [column[0].lower() for column in self.cursor.description]
+        for count_column in ('rows_unloaded', 'row_count'):  # summary / DETAILED_OUTPUT result
+            if count_column in column_names:
+                index = column_names.index(count_column)
+                return sum(row[index] or 0 for row in self.cursor.fetchall())
+        return 0
+
+    def run_copy_query(self, table_info: Dict[str, Any], external_stage: str) -> Tuple[bool, Optional[str], int]:
         """
         Execute COPY query for a table.
 
@@ -539,7 +936,7 @@ HEADER = TRUE;"""
             external_stage: Name of the external stage
 
         Returns:
-            Tuple of (success: bool, error_message: Optional[str])
+            Tuple of (success: bool, error_message: Optional[str], rows_unloaded: int)
 
         Raises:
             SnowflakeConnectionError: If no active connection
@@ -554,19 +951,20 @@ HEADER = TRUE;"""
         if not copy_query:
             error_msg = "No copy query available for table"
             logger.error(f"{error_msg}: {db}.{schema}.{table}")
-            return False, error_msg
+            return False, error_msg, 0
 
         try:
-            self._switch_database_if_needed(db)
+            self._switch_database_if_needed(db, external_stage)
             
             logger.info(f"Copying data for {db}.{schema}.{table}...")
             logger.info(f"DEBUG: About to execute copy query: {copy_query}")
-            self.cursor.execute(copy_query)
+            self._execute_with_retry(copy_query)
+            rows_unloaded = self._fetch_rows_unloaded()
             
-            logger.info(f"Successfully copied {db}.{schema}.{table}")
-            return True, None
+            logger.info(f"Successfully copied {rows_unloaded} rows of {db}.{schema}.{table}")
+            return True, None, rows_unloaded
             
         except Exception as e:
             error_msg = f"Copy failed: {e}"
             logger.error(f"{error_msg} for {db}.{schema}.{table}")
-            return False, error_msg
+            return False, error_msg, 0
@@ -1,3 +1,4 @@
+import json
 import logging
 from collections import defaultdict
 from typing import List, Dict, Any
@@ -5,65 +6,53 @@ from typing import List, Dict, Any
 import yaml
 from tabulate import tabulate
 
+try:
+    # libyaml-backed C emitter, several times faster on large documents
+    from yaml import CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeDumper
+
 MSG_NO_TABLES = "No tables were found to count."
 
 logger = logging.getLogger(__name__)
 
 
-class KeyAwareDumper(yaml.SafeDumper):
-    """Custom YAML dumper that tracks current key context for smart formatting."""
-    
-    def __init__(self, stream, **kwargs):
-        super().__init__(stream, **kwargs)
-        self._current_key = None
-    
-    def represent_mapping(self, tag, mapping, flow_style=None):
-        """Override to track current key being processed."""
-        value = []
-        node = yaml.MappingNode(tag, value, flow_style=flow_style)
-        if self.alias_key is not None:
-            self.represented_objects[self.alias_key] = node
-        
-        if hasattr(mapping, 'items'):
-            mapping = mapping.items()
-        for item_key, item_value in mapping:
-            # Track the current key for context-aware string formatting
-            self._current_key = item_key
-            node_key = self.represent_data(item_key)
-            node_value = self.represent_data(item_value)
-            value.append((node_key, node_value))
-            
-        if flow_style is None:
-            node.flow_style = self.default_flow_style
-        else:
-            node.flow_style = flow_style
-            
-        return node
+LITERAL_BLOCK_KEYS = ('cleaning_query', 'copy_query', 'custom_schema')
+
+
+class LiteralStr(str):
+    """String written as a YAML literal block (|), used for multiline queries."""
+    pass
+
 
+class ResultDumper(SafeDumper):
+    """YAML dumper for result files: literal blocks for LiteralStr, quotes for every other string."""
+    pass
 
-def represent_str_simple(dumper, data) -> Any:
+
+# str(data): libyaml's emitter only accepts exact str values, not subclasses
+ResultDumper.add_representer(
+    LiteralStr, lambda dumper, data: dumper.represent_scalar('tag:yaml.org,2002:str', str(data), style='|')
+)
+ResultDumper.add_representer(
+    str, lambda dumper, data: dumper.represent_scalar('tag:yaml.org,2002:str', data, style="'")
+)
+
+
+def with_literal_blocks(table_info: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Simple key-aware YAML representer: quotes everything, literal blocks for specific multiline keys.
-    
+    Mark the multiline queries of a table for literal block style.
+
     Args:
-        dumper: KeyAwareDumper instance with current key context
-        data: String data to represent
-        
+        table_info: Table information dictionary
+
     Returns:
-        YAML scalar representation
+        Shallow copy of table_info with multiline LITERAL_BLOCK_KEYS values wrapped in LiteralStr
     """
-    current_key = getattr(dumper, '_current_key', None)
-    
-    # Use literal block scalars for specific multiline keys
-    if current_key in ('cleaning_query', 'copy_query', 'custom_schema') and '\n' in data:
-        return dumper.represent_scalar('tag:yaml.org,2002:str', data, style='|')
-    
-    # Quote everything else
-    return dumper.represent_scalar('tag:yaml.org,2002:str', data, style="'")
-
-
-# Register the simple key-aware representer
-KeyAwareDumper.add_representer(str, represent_str_simple)
+    return {
+        key: LiteralStr(value) if key in LITERAL_BLOCK_KEYS and isinstance(value, str) and '\n' in value else value
+        for key, value in table_info.items()
+    }
 
 
 def log_table_counts(table_list: List[Dict[str, Any]]) -> None:
@@ -94,31 +83,65 @@ def log_table_counts(table_list: List[Dict[str, Any]]) -> None:
     logger.info("\n" + formatted_table)
 
 
-def write_results_on_exit(succeeded_tables: List[Dict], failed_tables: List[Dict], 
-                         succeeded_file: str, failed_file: str) -> None:
+class ResultFileWriter:
     """
-    Write final results to YAML files upon script exit.
-    
-    Args:
-        succeeded_tables: List of successfully processed tables
-        failed_tables: List of failed/skipped tables  
-        succeeded_file: Path to success results file
-        failed_file: Path to failure results file
+    Write migration results to the succeeded/failed files as they happen.
+
+    Each table is appended as its own list item (YAML) or line (JSON Lines) and flushed
+    right away, so the files already hold every finished table if the process is killed,
+    and a YAML file still reads back as a single list.
     """
-    with open(succeeded_file, 'w') as f:
-        if succeeded_tables:
-            yaml.dump(succeeded_tables, f, Dumper=KeyAwareDumper, default_flow_style=False, sort_keys=False, allow_unicode=True)
-        else:
-            f.write('')
-    logger.info(f"Successfully processed {len(succeeded_tables)} table(s). Details in '{succeeded_file}'.")
 
-    with open(failed_file, 'w') as f:
-        if failed_tables:
-            yaml.dump(failed_tables, f, Dumper=KeyAwareDumper, default_flow_style=False, sort_keys=False, allow_unicode=True)
+    def __init__(self, succeeded_file: str, failed_file: str, file_format: str = 'yaml'):
+        """
+        Open (and truncate) both result files.
+
+        Args:
+            succeeded_file: Path to success results file
+            failed_file: Path to failure results file
+            file_format: 'yaml', or 'jsonl' for one JSON document per table, which is
+                         much faster to write for thousands of tables
+        """
+        self.succeeded_file = succeeded_file
+        self.failed_file = failed_file
+        self.file_format = file_format
+        self.succeeded_count = 0
+        self.failed_count = 0
+        self._succeeded = open(succeeded_file, 'w')
+        self._failed = open(failed_file, 'w')
+
+    def write(self, table_info: Dict[str, Any], success: bool) -> None:
+        """
+        Append one table's result to the matching file.
+
+        Args:
+            table_info: Table information dictionary (with 'error' for failures)
+            success: Whether the table migrated successfully
+        """
+        if success:
+            f = self._succeeded
+            self.succeeded_count += 1
+        else:
+            f = self._failed
+            self.failed_count += 1
+        
+        if self.file_format == 'jsonl':
+            f.write(json.dumps(table_info, ensure_ascii=False))
+            f.write('\n')
+        else:
+            yaml.dump([with_literal_blocks(table_info)], f, Dumper=ResultDumper,
+                      default_flow_style=False, sort_keys=False, allow_unicode=True)
+        f.flush()
+
+    def close(self) -> None:
+        """Close both files and log a summary of the results."""
+        if self._succeeded.closed:
+            return
+        self._succeeded.close()
+        self._failed.close()
+        
+        logger.info(f"Successfully processed {self.succeeded_count} table(s). Details in '{self.succeeded_file}'.")
+        if self.failed_count:
+            logger.error(f"Failed to process {self.failed_count} table(s). Details in '{self.failed_file}'.")
         else:
-            f.write('')
-    
-    if failed_tables:
-        logger.error(f"Failed to process {len(failed_tables)} table(s). Details in '{failed_file}'.")
-    else:
-        logger.info("All tables processed successfully!")
+            logger.info("All tables processed successfully!")
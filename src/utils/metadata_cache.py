@@ -0,0 +1,93 @@
+"""Local on-disk cache of Snowflake table metadata, so repeated runs can skip INFORMATION_SCHEMA queries."""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+DEFAULT_CACHE_DIR = os.path.join('~', '.cache', 'sf2bq')
+
+logger = logging.getLogger(__name__)
+
+
+class MetadataCache:
+    """
+    Stores metadata query results as JSON files named after a hash of the query.
+
+    An entry expires ttl_seconds after it was written (judged by the file's mtime).
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, ttl_seconds: float = 24 * 3600, refresh: bool = False):
+        """
+        Initialize the cache.
+
+        Args:
+            directory: Directory holding the cache files (created on first write)
+            ttl_seconds: How long an entry stays valid
+            refresh: Ignore existing entries, so every query runs again and rewrites its entry
+        """
+        self.directory = Path(directory).expanduser()
+        self.ttl_seconds = ttl_seconds
+        self.refresh = refresh
+
+    def _entry_path(self, connection_name: str, query: str, params: Sequence[Any]) -> Path:
+        """Build the file path of the entry for a query run on a connection."""
+        key = json.dumps([connection_name, query, list(params)])
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return self.directory / f"{digest}.json"
+
+    def get(self, connection_name: str, query: str, params: Sequence[Any]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Read the cached result of a query.
+
+        Args:
+            connection_name: Snowflake connection profile the query runs on
+            query: Metadata query text
+            params: Values bound to the query
+
+        Returns:
+            The cached tables, or None when missing, expired, unreadable or refreshing
+        """
+        if self.refresh:
+            return None
+
+        path = self._entry_path(connection_name, query, params)
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl_seconds:
+                return None
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable metadata cache entry {path}: {e}")
+            return None
+
+    def set(self, connection_name: str, query: str, params: Sequence[Any], tables: List[Dict[str, Any]]) -> None:
+        """
+        Store the result of a query. Failures are logged, never raised.
+
+        Args:
+            connection_name: Snowflake connection profile the query ran on
+            query: Metadata query text
+            params: Values bound to the query
+            tables: Table dictionaries returned for the query
+        """
+        path = self._entry_path(connection_name, query, params)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first so readers never see a partial entry
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(tables, f)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            logger.warning(f"Could not write metadata cache entry {path}: {e}")
@@ -0,0 +1,70 @@
+"""Retry with exponential backoff for transient Snowflake and BigQuery errors."""
+
+import functools
+import logging
+import random
+import time
+from typing import Any, Callable
+
+DEFAULT_MAX_ATTEMPTS = 6
+DEFAULT_INITIAL_DELAY = 1.0
+DEFAULT_MAX_DELAY = 30.0
+
+logger = logging.getLogger(__name__)
+
+
+def backoff_delay(attempt: int, initial_delay: float = DEFAULT_INITIAL_DELAY, max_delay: float = DEFAULT_MAX_DELAY) -> float:
+    """
+    Compute how long to wait before the next attempt ("full jitter" exponential backoff).
+
+    Args:
+        attempt: Number of the attempt that just failed, starting at 1
+        initial_delay: Upper bound of the first delay in seconds
+        max_delay: Upper bound of any delay in seconds
+
+    Returns:
+        float: Random delay between 0 and min(max_delay, initial_delay * 2 ** (attempt - 1))
+    """
+    return random.uniform(0, min(max_delay, initial_delay * 2 ** (attempt - 1)))
+
+
+def retry_transient(
+    is_transient: Callable[[Exception], bool],
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    initial_delay: float = DEFAULT_INITIAL_DELAY,
+    max_delay: float = DEFAULT_MAX_DELAY
+) -> Callable:
+    """
+    Decorator that retries a function while it raises transient errors.
+
+    Errors for which is_transient returns False, and the error of the last attempt,
+    are raised to the caller unchanged.
+
+    Args:
+        is_transient: Returns True for errors worth retrying (e.g. rate limits, 503s)
+        max_attempts: Maximum number of calls, including the first one
+        initial_delay: Upper bound of the first delay in seconds
+        max_delay: Upper bound of any delay in seconds
+
+    Returns:
+        The decorator
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs) -> Any:
+            attempt = 1
+            while True:
+                try:
+                    return func(*args, **kwargs)
+                except Exception as e:
+                    if attempt >= max_attempts or not is_transient(e):
+                        raise
+                    delay = backoff_delay(attempt, initial_delay, max_delay)
+                    logger.warning(
+                        f"Transient error in {func.__name__} (attempt {attempt}/{max_attempts}), "
+                        f"retrying in {delay:.1f}s: {e}"
+                    )
+                    time.sleep(delay)
+                    attempt += 1
+        return wrapper
+    return decorator
@@ -1,27 +1,68 @@
 """User interaction utilities for the migration tool."""
 
+import functools
 import json
 import logging
 import tempfile
+import shutil
 import subprocess
 import os
-from typing import Dict, Any, Tuple, List
+from pathlib import Path
+from typing import Dict, Any, Tuple, List, Optional
 
 import inquirer
 
-PROCEED_RESPONSES = ['yes', 'y']
-SKIP_RESPONSES = ['next']
-ABORT_RESPONSES = ['abort']
-RETRY_RESPONSES = ['retry']
-EDIT_RESPONSES = ['edit']
-EDIT_CLEANING_RESPONSES = ['edit-cleaning', 'ec']
-EDIT_COPY_RESPONSES = ['edit-copy', 'et']
-EDIT_SCHEMA_RESPONSES = ['edit-schema', 'es']
-EDIT_PARTITION_RESPONSES = ['edit-partition-key', 'ep']
-EDIT_CLUSTER_RESPONSES = ['edit-cluster-keys', 'ecl']
+from bigquery.bigquery_client import BigQueryClient
+
+PROCEED_RESPONSES = frozenset({'yes', 'y'})
+SKIP_RESPONSES = frozenset({'next'})
+ABORT_RESPONSES = frozenset({'abort'})
+RETRY_RESPONSES = frozenset({'retry'})
+EDIT_RESPONSES = frozenset({'edit'})
+EDIT_CLEANING_RESPONSES = frozenset({'edit-cleaning', 'ec'})
+EDIT_COPY_RESPONSES = frozenset({'edit-copy', 'et'})
+EDIT_SCHEMA_RESPONSES = frozenset({'edit-schema', 'es'})
+EDIT_PARTITION_RESPONSES = frozenset({'edit-partition-key', 'ep'})
+EDIT_CLUSTER_RESPONSES = frozenset({'edit-cluster-keys', 'ecl'})
+
+PER_TABLE_CHOICES = (
+    ('Proceed with migration', 'proceed'),
+    ('Skip to next table', 'skip'),
+    ('Edit cleaning query', 'edit-cleaning'),
+    ('Edit copy query', 'edit-copy'),
+    ('Abort migration', 'abort')
+)
+BQ_TABLE_CHOICES = (
+    ('Proceed with loading', 'proceed'),
+    ('Skip to next table', 'skip'),
+    ('Edit schema', 'edit-schema'),
+    ('Edit partition settings', 'edit-partition'),
+    ('Edit cluster settings', 'edit-cluster'),
+    ('Abort migration', 'abort')
+)
+PARTITION_TYPE_CHOICES = (('DAY', 'DAY'), ('HOUR', 'HOUR'), ('MONTH', 'MONTH'), ('YEAR', 'YEAR'))
+RETRY_CHOICES = (('Retry', 'retry'), ('Skip to next table', 'skip'))
+RETRY_CHOICES_WITH_EDIT = (('Retry', 'retry'), ('Edit query and retry', 'edit'), ('Skip to next table', 'skip'))
+
+# BigQuery column types a table can be partitioned on
+PARTITION_TYPES = frozenset({'DATE', 'DATETIME', 'TIMESTAMP'})
+
+# One prompt per clustering column; BigQuery allows up to 4
+CLUSTER_COLUMN_MESSAGES = (
+    "Select 1st clustering column for {table_name} (or select 'Done' to finish)",
+    "Select 2nd clustering column (or select 'Done' to finish)",
+    "Select 3rd clustering column (or select 'Done' to finish)",
+    "Select 4th clustering column (or select 'Done' to finish)"
+)
+
+SECTION_SEPARATOR = '=' * 60
+QUERY_SEPARATOR = '-' * 40
 
 logger = logging.getLogger(__name__)
 
+# Offline BigQueryClient used only for schema inference; created on first use
+_BQ_CLIENT = None
+
 
 def format_table_name(table_info: Dict[str, Any]) -> str:
     """
@@ -36,6 +77,64 @@ def format_table_name(table_info: Dict[str, Any]) -> str:
     return f"{table_info['database']}.{table_info['schema']}.{table_info['table']}"
 
 
+def _get_bq_client():
+    """
+    Get the shared BigQueryClient used for schema inference, creating it on first use.
+    
+    The client is never entered, so no BigQuery connection is opened. User interaction
+    is single-threaded, so no locking is needed.
+    
+    Returns:
+        BigQueryClient: Client with placeholder project and bucket
+    """
+    global _BQ_CLIENT
+    if _BQ_CLIENT is None:
+        _BQ_CLIENT = BigQueryClient('dummy-project', 'gs://dummy-bucket')
+    return _BQ_CLIENT
+
+
+def _schema_cache_key(table_info: Dict[str, Any]) -> Tuple[Any, ...]:
+    """Everything schema inference reads from table_info, as a hashable key."""
+    columns = tuple(
+        (column.get('column_name'), column.get('data_type'))
+        for column in table_info.get('columns', [])
+    )
+    return (
+        table_info.get('database'),
+        table_info.get('schema'),
+        table_info.get('table'),
+        table_info.get('copy_query', ''),
+        columns
+    )
+
+
+@functools.lru_cache(maxsize=128)
+def _infer_schema_fields_cached(cache_key: Tuple[Any, ...]) -> Tuple[Any, ...]:
+    """Infer the BigQuery schema fields for a _schema_cache_key, once per distinct key."""
+    copy_query, columns = cache_key[3], cache_key[4]
+    table_info = {
+        'columns': [{'column_name': name, 'data_type': data_type} for name, data_type in columns],
+        'copy_query': copy_query
+    }
+    return tuple(_get_bq_client().infer_schema_from_table_info(table_info))
+
+
+def _infer_schema_fields(table_info: Dict[str, Any]) -> Tuple[Any, ...]:
+    """
+    Infer BigQuery schema fields from a table's columns and COPY query.
+
+    Results are cached, so the edit menus can ask again without re-parsing the COPY
+    query. Editing the COPY query (or columns) changes the key and infers afresh.
+
+    Args:
+        table_info: Dictionary containing table information
+
+    Returns:
+        Tuple of bigquery.SchemaField
+    """
+    return _infer_schema_fields_cached(_schema_cache_key(table_info))
+
+
 def _generate_inferred_schema_json(table_info: Dict[str, Any]) -> str:
     """
     Generate inferred schema as JSON string from table info.
@@ -47,12 +146,7 @@ def _generate_inferred_schema_json(table_info: Dict[str, Any]) -> str:
         str: JSON representation of inferred schema
     """
     try:
-        # Import here to avoid circular imports
-        from bigquery.bigquery_client import BigQueryClient
-        
-        bq_client = BigQueryClient('dummy-project', 'gs://dummy-bucket')
-        
-        schema_fields = bq_client.infer_schema_from_table_info(table_info)
+        schema_fields = _infer_schema_fields(table_info)
         
         schema_json = []
         for field in schema_fields:
@@ -69,6 +163,45 @@ def _generate_inferred_schema_json(table_info: Dict[str, Any]) -> str:
         return ""
 
 
+@functools.lru_cache(maxsize=128)
+def _parse_custom_schema(custom_schema: str) -> Any:
+    """
+    Parse a custom schema JSON string, once per distinct string.
+    
+    The result is shared between callers and must not be modified.
+    
+    Args:
+        custom_schema: JSON schema as entered in the schema editor
+        
+    Returns:
+        Parsed JSON (a list of field objects for a valid schema)
+        
+    Raises:
+        json.JSONDecodeError: If custom_schema is not valid JSON
+    """
+    return json.loads(custom_schema)
+
+
+def _get_schema_columns(table_info: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """
+    Get (name, type) pairs of the table's BigQuery columns.
+    
+    Uses the custom schema when one is set, so an edited schema is respected and
+    nothing has to be inferred; otherwise infers the schema from the COPY query.
+    
+    Args:
+        table_info: Dictionary containing table information
+        
+    Returns:
+        List of (column name, BigQuery type) tuples
+    """
+    custom_schema = table_info.get('custom_schema')
+    if custom_schema:
+        return [(field['name'], field['type'].upper()) for field in _parse_custom_schema(custom_schema)]
+    
+    return [(field.name, field.field_type) for field in _infer_schema_fields(table_info)]
+
+
 def _get_partition_eligible_columns(table_info: Dict[str, Any]) -> List[Dict[str, str]]:
     """
     Get columns eligible for partitioning (DATE, DATETIME, TIMESTAMP types only).
@@ -80,20 +213,13 @@ def _get_partition_eligible_columns(table_info: Dict[str, Any]) -> List[Dict[str
         List of dictionaries with column info suitable for partitioning
     """
     try:
-        from bigquery.bigquery_client import BigQueryClient
-        
-        bq_client = BigQueryClient('dummy-project', 'gs://dummy-bucket')
-        schema_fields = bq_client.infer_schema_from_table_info(table_info)
-        
         eligible_columns = []
-        partition_types = {'DATE', 'DATETIME', 'TIMESTAMP'}
-        
-        for field in schema_fields:
-            if field.field_type in partition_types:
+        for name, field_type in _get_schema_columns(table_info):
+            if field_type in PARTITION_TYPES:
                 eligible_columns.append({
-                    'name': field.name,
-                    'type': field.field_type,
-                    'display': f"{field.name} ({field.field_type})"
+                    'name': name,
+                    'type': field_type,
+                    'display': f"{name} ({field_type})"
                 })
         
         return eligible_columns
@@ -114,17 +240,12 @@ def _get_available_columns(table_info: Dict[str, Any]) -> List[Dict[str, str]]:
         List of dictionaries with column info
     """
     try:
-        from bigquery.bigquery_client import BigQueryClient
-        
-        bq_client = BigQueryClient('dummy-project', 'gs://dummy-bucket')
-        schema_fields = bq_client.infer_schema_from_table_info(table_info)
-        
         columns = []
-        for field in schema_fields:
+        for name, field_type in _get_schema_columns(table_info):
             columns.append({
-                'name': field.name,
-                'type': field.field_type,
-                'display': f"{field.name} ({field.field_type})"
+                'name': name,
+                'type': field_type,
+                'display': f"{name} ({field_type})"
             })
         
         return columns
@@ -134,6 +255,33 @@ def _get_available_columns(table_info: Dict[str, Any]) -> List[Dict[str, str]]:
         return []
 
 
+def _ensure_custom_schema(table_info: Dict[str, Any], purpose: str) -> bool:
+    """
+    Make sure table_info has a custom schema, inferring one if needed.
+    
+    Partitioning and clustering need an explicit schema; the column menus then read
+    it through _get_schema_columns, so the schema is inferred at most once.
+    
+    Args:
+        table_info: Dictionary containing table information (may be modified)
+        purpose: What the schema is needed for, e.g. 'partitioning'
+        
+    Returns:
+        bool: True if a custom schema is available, False if it could not be inferred
+    """
+    if table_info.get('custom_schema'):
+        return True
+    
+    inferred_schema = _generate_inferred_schema_json(table_info)
+    if not inferred_schema:
+        logger.info(f"ERROR: Could not infer schema - {purpose} requires schema definition")
+        return False
+    
+    table_info['custom_schema'] = inferred_schema
+    logger.info(f"Auto-generated schema from table columns and COPY query for {purpose}")
+    return True
+
+
 def ask_user_permission_per_table(table_info: Dict[str, Any], verbose: bool = False) -> Tuple[bool, bool]:
     """
     Ask user for permission to proceed with table migration.
@@ -148,39 +296,23 @@ def ask_user_permission_per_table(table_info: Dict[str, Any], verbose: bool = Fa
     table_name = format_table_name(table_info)
     
     # Show queries if verbose mode is enabled
-    if verbose:
-        logger.info(f"\n{'='*60}")
-        logger.info(f"Table: {table_name}")
-        logger.info(f"{'='*60}")
+    if verbose and logger.isEnabledFor(logging.INFO):
+        lines = [f"\n{SECTION_SEPARATOR}", f"Table: {table_name}", SECTION_SEPARATOR]
         
         if 'cleaning_query' in table_info:
-            logger.info(f"\nCleaning Query:")
-            logger.info(f"{'-'*40}")
-            logger.info(table_info['cleaning_query'])
-            logger.info(f"{'-'*40}")
+            lines += ["\nCleaning Query:", QUERY_SEPARATOR, table_info['cleaning_query'], QUERY_SEPARATOR]
         
         if 'copy_query' in table_info:
-            logger.info(f"\nCopy Query:")
-            logger.info(f"{'-'*40}")
-            logger.info(table_info['copy_query'])
-            logger.info(f"{'-'*40}")
-        logger.info()
-    
-    # Build choices - edit options are always available now
-    choices = [
-        ('Proceed with migration', 'proceed'),
-        ('Skip to next table', 'skip'),
-        ('Edit cleaning query', 'edit-cleaning'),
-        ('Edit copy query', 'edit-copy'),
-        ('Abort migration', 'abort')
-    ]
+            lines += ["\nCopy Query:", QUERY_SEPARATOR, table_info['copy_query'], QUERY_SEPARATOR]
+        
+        logger.info("\n".join(lines) + "\n")
     
     while True:
         try:
             questions = [
                 inquirer.List('action',
                             message=f"What would you like to do with {table_name}?",
-                            choices=choices,
+                            choices=PER_TABLE_CHOICES,
                             carousel=True)
             ]
             
@@ -195,17 +327,13 @@ def ask_user_permission_per_table(table_info: Dict[str, Any], verbose: bool = Fa
                 if edit_cleaning_query(table_info):
                     logger.info(f"\nCleaning query updated for {table_name}")
                     if verbose:
-                        logger.info(f"{'-'*40}")
-                        logger.info(table_info['cleaning_query'])
-                        logger.info(f"{'-'*40}")
+                        logger.info(f"{QUERY_SEPARATOR}\n{table_info['cleaning_query']}\n{QUERY_SEPARATOR}")
                 continue
             elif action == 'edit-copy':
                 if edit_copy_query(table_info):
                     logger.info(f"\nCopy query updated for {table_name}")
                     if verbose:
-                        logger.info(f"{'-'*40}")
-                        logger.info(table_info['copy_query'])
-                        logger.info(f"{'-'*40}")
+                        logger.info(f"{QUERY_SEPARATOR}\n{table_info['copy_query']}\n{QUERY_SEPARATOR}")
                 continue
             elif action == 'proceed':
                 return True, False
@@ -224,73 +352,109 @@ def ask_user_permission_per_table(table_info: Dict[str, Any], verbose: bool = Fa
             return False, True
 
 
-def edit_cleaning_query(table_info: Dict[str, Any]) -> bool:
+def ask_user_permission_per_batch(table_infos: List[Dict[str, Any]]) -> str:
     """
-    Allow user to edit the cleaning query for a table using an external editor.
+    Ask user once what to do with a whole batch of tables.
 
     Args:
-        table_info: Dictionary containing table information (will be modified)
+        table_infos: Tables in the batch, already shown to the user
 
     Returns:
-        bool: True if query was edited and should be retried, False to skip
+        str: 'proceed' to migrate every table, 'review' to decide table by table,
+             'skip' to skip the batch, or 'abort'
     """
-    current_cleaning_query = table_info.get('cleaning_query', '')
-    table_name = format_table_name(table_info)
+    table_count = len(table_infos)
+    choices = [
+        (f'Migrate all {table_count} tables', 'proceed'),
+        ('Review tables one by one', 'review'),
+        ('Skip these tables', 'skip'),
+        ('Abort migration', 'abort')
+    ]
+    
+    try:
+        questions = [
+            inquirer.List('action',
+                        message=f"What would you like to do with these {table_count} tables?",
+                        choices=choices,
+                        carousel=True)
+        ]
+        
+        answers = inquirer.prompt(questions)
+        if not answers:  # User pressed Ctrl+C
+            return 'abort'
+        
+        return answers['action']
+        
+    except KeyboardInterrupt:
+        logger.info("\nMigration aborted by user.")
+        return 'abort'
+    except Exception as e:
+        logger.error(f"Error in user prompt: {e}")
+        return 'abort'
+
+
+@functools.lru_cache(maxsize=1)
+def _resolve_editor() -> str:
+    """
+    Find a fallback editor for when $EDITOR is not set. Resolved once per process.
     
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.sql', delete=False) as tmp_file:
-        tmp_file.write(current_cleaning_query)
-        tmp_file_path = tmp_file.name
+    Returns:
+        str: Editor command
+    """
+    if os.name == 'nt':  # Windows
+        return 'notepad'
+    # Unix-like (Linux, macOS)
+    for candidate in ['code', 'vim', 'nano', 'vi']:
+        if shutil.which(candidate):
+            return candidate
+    return 'vi'  # Last resort
+
+
+def _run_editor(text: str, suffix: str, instructions: List[str], description: str, on_failure: str) -> Optional[str]:
+    """
+    Open text in an external editor and return what the user saved.
     
+    Args:
+        text: Initial content of the file
+        suffix: Temporary file suffix, so editors pick the right syntax highlighting
+        instructions: Lines logged before the editor opens
+        description: What is being edited, e.g. "copy query for DB.SCHEMA.TABLE"
+        on_failure: Message logged after an editor failure, e.g. "Skipping table."
+        
+    Returns:
+        Optional[str]: Edited text (stripped), or None if the editor could not be run or failed
+    """
+    fd, tmp_file_path = tempfile.mkstemp(suffix=suffix)
     try:
-        editor = os.environ.get('EDITOR')
-        
-        if not editor:
-            if os.name == 'nt':  # Windows
-                editor = 'notepad'
-            else:  # Unix-like (Linux, macOS)
-                for candidate in ['code', 'vim', 'nano', 'vi']:
-                    if subprocess.run(['which', candidate], capture_output=True).returncode == 0:
-                        editor = candidate
-                        break
-                else:
-                    editor = 'vi'  # Last resort
-        
-        logger.info(f"\nOpening cleaning query for {table_name} in {editor}...")
-        logger.info("Edit the CLEANING query as needed.")
-        logger.info("Save and exit when done, or exit without saving to cancel.")
+        if text:  # mkstemp already created an empty file
+            os.write(fd, text.encode('utf-8'))
+    finally:
+        os.close(fd)
+    
+    editor = os.environ.get('EDITOR') or _resolve_editor()
+    try:
+        logger.info(f"\nOpening {description} in {editor}...")
+        for line in instructions:
+            logger.info(line)
         
         result = subprocess.run([editor, tmp_file_path])
         
-        if result.returncode == 0:
-            with open(tmp_file_path, 'r') as f:
-                edited_query = f.read().strip()
-            
-            if edited_query != current_cleaning_query and edited_query:
-                table_info['cleaning_query'] = edited_query
-                logger.info(f"Cleaning query updated for {table_name}")
-                logger.info("Cleaning query updated successfully!")
-                logger.info(f"DEBUG: New cleaning query stored: {edited_query}")
-                return True
-            elif not edited_query:
-                logger.info("Empty query detected. Skipping...")
-                return False
-            else:
-                logger.info("No changes made to query. Retrying with original query...")
-                return True
-        else:
-            logger.info("Editor exited with error. Skipping...")
-            return False
+        if result.returncode != 0:
+            logger.info(f"Editor exited with error. {on_failure}")
+            return None
+        
+        return Path(tmp_file_path).read_text(encoding='utf-8').strip()
             
     except FileNotFoundError:
         logger.info(f"Editor '{editor}' not found. Available options:")
         logger.info("- Set EDITOR environment variable to your preferred editor")
         logger.info("- Install one of: code, vim, nano")
-        logger.info("Skipping table.")
-        return False
+        logger.info(on_failure)
+        return None
     except Exception as e:
         logger.info(f"Error opening editor: {e}")
-        logger.info("Skipping table.")
-        return False
+        logger.info(on_failure)
+        return None
         
     finally:
         try:
@@ -299,79 +463,71 @@ def edit_cleaning_query(table_info: Dict[str, Any]) -> bool:
             pass
 
 
-def edit_copy_query(table_info: Dict[str, Any]) -> bool:
+def _edit_text_field(table_info: Dict[str, Any], field_key: str, suffix: str, label: str) -> bool:
     """
-    Allow user to edit the copy query for a table using an external editor.
+    Allow user to edit a query stored in table_info using an external editor.
 
     Args:
         table_info: Dictionary containing table information (will be modified)
+        field_key: Key of the query in table_info, e.g. 'copy_query'
+        suffix: Temporary file suffix, e.g. '.sql'
+        label: Query name used in messages, e.g. 'COPY'
 
     Returns:
         bool: True if query was edited and should be retried, False to skip
     """
-    current_copy_query = table_info.get('copy_query', '')
+    current_query = table_info.get(field_key, '')
     table_name = format_table_name(table_info)
+    description = f"{label.lower()} query"
     
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.sql', delete=False) as tmp_file:
-        tmp_file.write(current_copy_query)
-        tmp_file_path = tmp_file.name
+    edited_query = _run_editor(
+        current_query,
+        suffix,
+        [f"Edit the {label} query as needed.", "Save and exit when done, or exit without saving to cancel."],
+        f"{description} for {table_name}",
+        "Skipping table."
+    )
     
-    try:
-        editor = os.environ.get('EDITOR')
-        
-        if not editor:
-            if os.name == 'nt':  # Windows
-                editor = 'notepad'
-            else:  # Unix-like (Linux, macOS)
-                for candidate in ['code', 'vim', 'nano', 'vi']:
-                    if subprocess.run(['which', candidate], capture_output=True).returncode == 0:
-                        editor = candidate
-                        break
-                else:
-                    editor = 'vi'  # Last resort
-        
-        logger.info(f"\nOpening copy query for {table_name} in {editor}...")
-        logger.info("Edit the COPY query as needed.")
-        logger.info("Save and exit when done, or exit without saving to cancel.")
-        
-        result = subprocess.run([editor, tmp_file_path])
-        
-        if result.returncode == 0:
-            with open(tmp_file_path, 'r') as f:
-                edited_query = f.read().strip()
-            
-            if edited_query != current_copy_query and edited_query:
-                table_info['copy_query'] = edited_query
-                logger.info(f"Copy query updated for {table_name}")
-                logger.info("Copy query updated successfully!")
-                logger.info(f"DEBUG: New copy query stored: {edited_query}")
-                return True
-            elif not edited_query:
-                logger.info("Empty query detected. Skipping...")
-                return False
-            else:
-                logger.info("No changes made to query. Retrying with original query...")
-                return True
-        else:
-            logger.info("Editor exited with error. Skipping...")
-            return False
-            
-    except FileNotFoundError:
-        logger.info(f"Editor '{editor}' not found. Available options:")
-        logger.info("- Set EDITOR environment variable to your preferred editor")
-        logger.info("- Install one of: code, vim, nano")
-        logger.info("Skipping table.")
+    if edited_query is None:
         return False
-    except Exception as e:
-        logger.info(f"Error opening editor: {e}")
-        logger.info("Skipping table.")
+    if not edited_query:
+        logger.info("Empty query detected. Skipping...")
         return False
-        
-    finally:
-        try:
-            os.unlink(tmp_file_path)
-        except OSError:
-            pass
+    if edited_query == current_query:
+        logger.info("No changes made to query. Retrying with original query...")
+        return True
+    
+    table_info[field_key] = edited_query
+    logger.info(f"{description.capitalize()} updated for {table_name}")
+    # %-style so the (possibly large) query is only formatted when debug logging is on
+    logger.debug("New %s stored: %s", description, edited_query)
+    return True
+
+
+def edit_cleaning_query(table_info: Dict[str, Any]) -> bool:
+    """
+    Allow user to edit the cleaning query for a table using an external editor.
+
+    Args:
+        table_info: Dictionary containing table information (will be modified)
+
+    Returns:
+        bool: True if query was edited and should be retried, False to skip
+    """
+    return _edit_text_field(table_info, 'cleaning_query', '.sql', 'CLEANING')
+
+
+def edit_copy_query(table_info: Dict[str, Any]) -> bool:
+    """
+    Allow user to edit the copy query for a table using an external editor.
+
+    Args:
+        table_info: Dictionary containing table information (will be modified)
+
+    Returns:
+        bool: True if query was edited and should be retried, False to skip
+    """
+    return _edit_text_field(table_info, 'copy_query', '.sql', 'COPY')
 
 
 def ask_user_for_retry(table_info: Dict[str, Any], step_name: str) -> str:
@@ -387,10 +543,10 @@ def ask_user_for_retry(table_info: Dict[str, Any], step_name: str) -> str:
     """
     table_name = format_table_name(table_info)
     
-    choices = [('Retry', 'retry'), ('Skip to next table', 'skip')]
-    
     if "cleaning" in step_name or "COPY" in step_name:
-        choices.insert(1, ('Edit query and retry', 'edit'))
+        choices = RETRY_CHOICES_WITH_EDIT
+    else:
+        choices = RETRY_CHOICES
     
     try:
         questions = [
@@ -443,21 +599,12 @@ def ask_bigquery_table_permission(table_info: Dict[str, Any]) -> Tuple[bool, boo
     if not table_info.get('custom_schema') and (table_info.get('partition_field') or table_info.get('cluster_fields')):
         logger.info("Note: Custom schema required for partitioning/clustering options")
     
-    choices = [
-        ('Proceed with loading', 'proceed'),
-        ('Skip to next table', 'skip'),
-        ('Edit schema', 'edit-schema'),
-        ('Edit partition settings', 'edit-partition'),
-        ('Edit cluster settings', 'edit-cluster'),
-        ('Abort migration', 'abort')
-    ]
-    
     while True:
         try:
             questions = [
                 inquirer.List('action',
                             message=f"BigQuery table loading for {table_name}",
-                            choices=choices,
+                            choices=BQ_TABLE_CHOICES,
                             carousel=True)
             ]
             
@@ -537,91 +684,53 @@ def edit_schema(table_info: Dict[str, Any]) -> bool:
 ]'''
             logger.info(f"\nWARNING: Could not infer schema for {table_name}, using example template...")
 
-    # Create a temporary file with the current schema or template
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as tmp_file:
-        tmp_file.write(template_schema)
-        tmp_file_path = tmp_file.name
-
-    try:
-        editor = os.environ.get('EDITOR')
-
-        if not editor:
-            if os.name == 'nt':  # Windows
-                editor = 'notepad'
-            else:  # Unix-like (Linux, macOS)
-                for candidate in ['code', 'vim', 'nano', 'vi']:
-                    if subprocess.run(['which', candidate], capture_output=True).returncode == 0:
-                        editor = candidate
-                        break
-                else:
-                    editor = 'vi'  # Last resort
-
-        logger.info(f"\nOpening schema editor for {table_name} in {editor}...")
-        logger.info("Edit the JSON schema as needed.")
-        logger.info("Example field types: STRING, INTEGER, FLOAT, BOOLEAN, DATE, DATETIME, TIMESTAMP")
-        logger.info("Example modes: REQUIRED, NULLABLE, REPEATED")
-        logger.info("Save and exit when done, or delete all content to remove custom schema.")
-
-        result = subprocess.run([editor, tmp_file_path])
-
-        if result.returncode == 0:
-            with open(tmp_file_path, 'r') as f:
-                edited_schema = f.read().strip()
-
-            if not edited_schema:
-                if 'custom_schema' in table_info:
-                    del table_info['custom_schema']
-                    logger.info("Custom schema removed, will use auto-detection")
-                return True
-
-            try:
-                import json
-                parsed_schema = json.loads(edited_schema)
-
-                if not isinstance(parsed_schema, list):
-                    logger.info("WARNING: Schema must be an array of field objects")
-                    return False
-
-                for field in parsed_schema:
-                    if not isinstance(field, dict) or 'name' not in field or 'type' not in field:
-                        logger.info("WARNING: Each field must be an object with 'name' and 'type' properties")
-                        return False
-
-                table_info['custom_schema'] = edited_schema
-                logger.info("Custom schema updated")
+    edited_schema = _run_editor(
+        template_schema,
+        '.json',
+        [
+            "Edit the JSON schema as needed.",
+            "Example field types: STRING, INTEGER, FLOAT, BOOLEAN, DATE, DATETIME, TIMESTAMP",
+            "Example modes: REQUIRED, NULLABLE, REPEATED",
+            "Save and exit when done, or delete all content to remove custom schema."
+        ],
+        f"schema editor for {table_name}",
+        "Schema not updated."
+    )
+
+    if edited_schema is None:
+        return False
 
-                logger.info(f"Parsed {len(parsed_schema)} field(s):")
-                for field in parsed_schema:
-                    mode = field.get('mode', 'NULLABLE')
-                    logger.info(f"  - {field['name']}: {field['type']} ({mode})")
+    if not edited_schema:
+        if 'custom_schema' in table_info:
+            del table_info['custom_schema']
+            logger.info("Custom schema removed, will use auto-detection")
+        return True
 
-                return True
+    try:
+        parsed_schema = _parse_custom_schema(edited_schema)
+    except json.JSONDecodeError as e:
+        logger.info(f"WARNING: Invalid JSON format: {e}")
+        logger.info("Make sure to use proper JSON syntax with double quotes for strings")
+        return False
 
-            except json.JSONDecodeError as e:
-                logger.info(f"WARNING: Invalid JSON format: {e}")
-                logger.info("Make sure to use proper JSON syntax with double quotes for strings")
-                return False
+    if not isinstance(parsed_schema, list):
+        logger.info("WARNING: Schema must be an array of field objects")
+        return False
 
-        else:
-            logger.info("Editor exited with error. Schema not updated.")
+    for field in parsed_schema:
+        if not isinstance(field, dict) or 'name' not in field or 'type' not in field:
+            logger.info("WARNING: Each field must be an object with 'name' and 'type' properties")
             return False
 
-    except FileNotFoundError:
-        logger.info(f"Editor '{editor}' not found. Available options:")
-        logger.info("- Set EDITOR environment variable to your preferred editor")
-        logger.info("- Install one of: code, vim, nano")
-        logger.info("Schema not updated.")
-        return False
-    except Exception as e:
-        logger.info(f"Error opening editor: {e}")
-        logger.info("Schema not updated.")
-        return False
+    table_info['custom_schema'] = edited_schema
+    logger.info("Custom schema updated")
 
-    finally:
-        try:
-            os.unlink(tmp_file_path)
-        except OSError:
-            pass
+    logger.info(f"Parsed {len(parsed_schema)} field(s):")
+    for field in parsed_schema:
+        mode = field.get('mode', 'NULLABLE')
+        logger.info(f"  - {field['name']}: {field['type']} ({mode})")
+
+    return True
 
 
 def edit_partition_key(table_info: Dict[str, Any]) -> bool:
@@ -642,14 +751,8 @@ def edit_partition_key(table_info: Dict[str, Any]) -> bool:
     if current_field:
         logger.info(f"Current: {current_field} ({current_type})")
     
-    if not table_info.get('custom_schema'):
-        inferred_schema = _generate_inferred_schema_json(table_info)
-        if inferred_schema:
-            table_info['custom_schema'] = inferred_schema
-            logger.info("Auto-generated schema from table columns and COPY query for partitioning")
-        else:
-            logger.info("ERROR: Could not infer schema - partitioning requires schema definition")
-            return False
+    if not _ensure_custom_schema(table_info, 'partitioning'):
+        return False
     
     # Get partition-eligible columns (DATE, DATETIME, TIMESTAMP)
     eligible_columns = _get_partition_eligible_columns(table_info)
@@ -659,20 +762,29 @@ def edit_partition_key(table_info: Dict[str, Any]) -> bool:
         logger.info("   Partitioning requires columns with temporal data types.")
         return False
     
-    choices = ['(Remove partitioning)'] + [col['display'] for col in eligible_columns]
+    columns_by_display = {col['display']: col for col in eligible_columns}
+    columns_by_name = {col['name']: col for col in eligible_columns}
+    choices = ['(Remove partitioning)'] + list(columns_by_display)
     
-    current_choice = '(Remove partitioning)'
-    for col in eligible_columns:
-        if col['name'] == current_field:
-            current_choice = col['display']
-            break
+    current_column = columns_by_name.get(current_field)
+    current_choice = current_column['display'] if current_column else '(Remove partitioning)'
     
+    def column_label(answers: Dict[str, Any]) -> str:
+        column = columns_by_display[answers['partition_choice']]
+        return f"{column['name']} ({column['type']})"
+    
+    # Ask for column and type in one form; the type is skipped when partitioning is removed
     try:
         questions = [
             inquirer.List('partition_choice',
                          message=f"Select partition column for {table_name} (only DATE/DATETIME/TIMESTAMP columns shown)",
                          choices=choices,
-                         default=current_choice)
+                         default=current_choice),
+            inquirer.List('partition_type',
+                         message=lambda answers: f"Partition type for {column_label(answers)}",
+                         choices=PARTITION_TYPE_CHOICES,
+                         default=current_type,
+                         ignore=lambda answers: answers['partition_choice'] == '(Remove partitioning)')
         ]
         
         answers = inquirer.prompt(questions)
@@ -680,6 +792,7 @@ def edit_partition_key(table_info: Dict[str, Any]) -> bool:
             return False
             
         partition_choice = answers['partition_choice']
+        partition_type = answers.get('partition_type', current_type)
     except KeyboardInterrupt:
         logger.info("\nPartitioning configuration cancelled.")
         return False
@@ -691,33 +804,12 @@ def edit_partition_key(table_info: Dict[str, Any]) -> bool:
         logger.info("Partitioning removed")
         return True
     
-    selected_column = None
-    for col in eligible_columns:
-        if col['display'] == partition_choice:
-            selected_column = col
-            break
+    selected_column = columns_by_display.get(partition_choice)
     
     if not selected_column:
         logger.info("WARNING: Invalid column selection")
         return False
     
-    try:
-        questions = [
-            inquirer.List('partition_type',
-                         message=f"Partition type for {selected_column['name']} ({selected_column['type']})",
-                         choices=[('DAY', 'DAY'), ('HOUR', 'HOUR'), ('MONTH', 'MONTH'), ('YEAR', 'YEAR')],
-                         default=current_type)
-        ]
-        
-        answers = inquirer.prompt(questions)
-        if not answers:  # User pressed Ctrl+C
-            return False
-            
-        partition_type = answers['partition_type']
-    except KeyboardInterrupt:
-        logger.info("\nPartitioning configuration cancelled.")
-        return False
-    
     table_info['partition_field'] = selected_column['name']
     table_info['partition_type'] = partition_type
     logger.info(f"Will partition by {selected_column['name']} ({partition_type})")
@@ -741,14 +833,8 @@ def edit_cluster_keys(table_info: Dict[str, Any]) -> bool:
     if current_fields:
         logger.info(f"Current: {', '.join(current_fields)}")
     
-    if not table_info.get('custom_schema'):
-        inferred_schema = _generate_inferred_schema_json(table_info)
-        if inferred_schema:
-            table_info['custom_schema'] = inferred_schema
-            logger.info("Auto-generated schema from table columns and COPY query for clustering")
-        else:
-            logger.info("ERROR: Could not infer schema - clustering requires schema definition")
-            return False
+    if not _ensure_custom_schema(table_info, 'clustering'):
+        return False
     
     available_columns = _get_available_columns(table_info)
     
@@ -758,29 +844,18 @@ def edit_cluster_keys(table_info: Dict[str, Any]) -> bool:
     
     logger.info("NOTE: BigQuery supports up to 4 clustering fields. Order matters for performance.")
     
+    # Columns not selected yet, keyed by their display text
+    remaining_columns = {col['display']: col for col in available_columns}
     selected_columns = []
     
     # Allow user to select up to 4 columns
-    for i in range(4):
-        if i == 0:
-            message = f"Select 1st clustering column for {table_name} (or select 'Done' to finish)"
-        elif i == 1:
-            message = f"Select 2nd clustering column (or select 'Done' to finish)"
-        elif i == 2:
-            message = f"Select 3rd clustering column (or select 'Done' to finish)"
-        else:
-            message = f"Select 4th clustering column (or select 'Done' to finish)"
+    for message_template in CLUSTER_COLUMN_MESSAGES:
+        if not remaining_columns:
+            break
         
-        # Build choices (exclude already selected columns)
-        already_selected = [col['name'] for col in selected_columns]
+        message = message_template.format(table_name=table_name)
         choices = ['(Done - finish selection)', '(Remove all clustering)'] if selected_columns else ['(Remove all clustering)']
-        
-        for col in available_columns:
-            if col['name'] not in already_selected:
-                choices.append(col['display'])
-        
-        if len(choices) <= 2:  # Only "Done" and "Remove" options left
-            break
+        choices += remaining_columns
         
         try:
             questions = [
@@ -806,11 +881,8 @@ def edit_cluster_keys(table_info: Dict[str, Any]) -> bool:
                 del table_info['cluster_fields']
             logger.info("Clustering removed")
             return True
-        else:
-            for col in available_columns:
-                if col['display'] == choice:
-                    selected_columns.append(col)
-                    break
+        elif choice in remaining_columns:
+            selected_columns.append(remaining_columns.pop(choice))
     
     if not selected_columns:
         logger.info("ERROR: No columns selected for clustering")
@@ -8,13 +8,41 @@ import os
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
+from google.api_core.exceptions import BadRequest, Forbidden
+from google.cloud import bigquery
+from google.cloud.exceptions import GoogleCloudError, NotFound
+
 from bigquery.bigquery_client import (
     BigQueryClient, 
     BigQueryConnectionError, 
-    BigQueryDatasetError
+    BigQueryDatasetError,
+    DATASET_CACHE_TTL_SECONDS
 )
 
 
+@pytest.fixture(scope="module")
+def offline_client():
+    """BigQueryClient that is never connected, shared by tests that only read from it."""
+    return BigQueryClient("test-project", "gs://test-bucket")
+
+
+@pytest.fixture
+def bq_client():
+    """BigQueryClient with a mocked google-cloud client, as if inside `with client:`."""
+    client = BigQueryClient("test-project", "gs://test-bucket")
+    client.client = Mock(spec=bigquery.Client)
+    return client
+
+
+@pytest.fixture
+def entered_bq_client():
+    """BigQueryClient entered through `with`, backed by a patched bigquery.Client."""
+    with patch('bigquery.bigquery_client.bigquery.Client'):
+        client = BigQueryClient("test-project", "gs://test-bucket")
+        with client:
+            yield client
+
+
 def test_client_initialization():
     """Test that client initializes properly."""
     client = BigQueryClient(
@@ -51,14 +79,36 @@ def test_connection_context_manager(mock_bigquery_client):
     with client as bq:
         assert bq.client == mock_bq_client
     
-    # Verify client was closed
+    # Re-entering reuses the same client instead of reconnecting
+    with client as bq:
+        assert bq.client == mock_bq_client
+    mock_bigquery_client.assert_called_once()
+    mock_bq_client.close.assert_not_called()
+    
+    # Verify client is closed explicitly
+    client.close()
     mock_bq_client.close.assert_called_once()
+    assert client.client is None
+
+
+@patch('bigquery.bigquery_client.bigquery.Client')
+def test_connection_pool_sized_for_workers(mock_bigquery_client):
+    """Test that the shared HTTP session gets a connection pool large enough for the worker threads."""
+    import requests
+    session = requests.Session()
+    mock_bigquery_client.return_value._http = session
+    
+    with BigQueryClient("test-project", "gs://test-bucket", http_pool_size=32):
+        pass
+    
+    adapter = session.get_adapter("https://bigquery.googleapis.com")
+    assert adapter._pool_maxsize == 32
+    assert adapter._pool_connections == 32
 
 
 @patch('bigquery.bigquery_client.bigquery.Client')
 def test_connection_failure(mock_bigquery_client):
     """Test that connection failures are handled properly."""
-    from google.cloud.exceptions import GoogleCloudError
     mock_bigquery_client.side_effect = GoogleCloudError("Failed")
     
     client = BigQueryClient("test-project", "gs://test-bucket")
@@ -67,105 +117,92 @@ def test_connection_failure(mock_bigquery_client):
             pass
 
 
-def test_helper_methods():
+def test_helper_methods(offline_client):
     """Test utility helper methods."""
-    client = BigQueryClient("test-project", "gs://test-bucket")
-    
     # Test dataset ID building
-    dataset_id = client._build_dataset_id("TEST_DB", "PUBLIC")
+    database, schema, table = offline_client._lowered_names({'database': 'TEST_DB', 'schema': 'PUBLIC', 'table': 'MY_TABLE'})
+    assert (database, schema, table) == ("test_db", "public", "my_table")
+    
+    dataset_id = offline_client._build_dataset_id(database, schema)
     assert dataset_id == "snowflake_test_db_public"
     
     # Test GCS URI building
-    gcs_uri = client._build_gcs_source_uri("TEST_DB", "PUBLIC", "MY_TABLE")
+    gcs_uri = offline_client._build_gcs_source_uri(database, schema, table)
     assert gcs_uri == "gs://test-bucket/test_db/public/my_table/*"
 
 
-def test_load_job_config():
+def test_load_job_config(offline_client):
     """Test BigQuery load job configuration."""
-    client = BigQueryClient("test-project", "gs://test-bucket")
-    
-    job_config = client._create_load_job_config()
+    job_config = offline_client._create_load_job_config()
     
     # Check the main settings
-    from google.cloud import bigquery
     assert job_config.source_format == bigquery.SourceFormat.PARQUET
     assert job_config.write_disposition == bigquery.WriteDisposition.WRITE_TRUNCATE
     assert job_config.autodetect is True
     assert job_config.column_name_character_map == "V2"
+    
+    custom_schema = '[{"name": "id", "type": "INTEGER", "mode": "REQUIRED"}, {"name": "name", "type": "STRING"}]'
+    job_config = offline_client._create_load_job_config(custom_schema)
+    assert [(f.name, f.field_type, f.mode) for f in job_config.schema] == [
+        ('id', 'INTEGER', 'REQUIRED'),
+        ('name', 'STRING', 'NULLABLE'),
+    ]
 
 
-def test_external_table_config():
+def test_external_table_config(offline_client):
     """Test external table configuration."""
-    client = BigQueryClient("test-project", "gs://test-bucket")
-    
-    config = client._create_external_config("gs://test-bucket/path/to/data/*")
+    config = offline_client._create_external_config("gs://test-bucket/path/to/data/*")
     
     assert config.source_format == "PARQUET"
     assert config.source_uris == ["gs://test-bucket/path/to/data/*"]
     assert config.autodetect is True
 
 
-@patch('bigquery.bigquery_client.bigquery.Client')
-def test_create_table_success(mock_bigquery_client):
-    """Test successful table creation."""
-    # Setup mocks
-    mock_bq_client = Mock()
-    mock_bigquery_client.return_value = mock_bq_client
-    
-    # Mock dataset and table operations
-    mock_dataset_ref = Mock()
-    mock_table_ref = Mock()
-    mock_bq_client.dataset.return_value = mock_dataset_ref
-    mock_dataset_ref.table.return_value = mock_table_ref
-    
-    # Mock load job
+@pytest.mark.parametrize("bq_options,expected_partition_field,expected_cluster_fields", [
+    ({}, None, None),
+    (
+        {'partition_field': 'event_date', 'partition_type': 'DAY', 'cluster_fields': ['customer_id', 'region']},
+        'event_date',
+        ['customer_id', 'region']
+    ),
+])
+def test_create_table_success(bq_client, bq_options, expected_partition_field, expected_cluster_fields):
+    """Test successful table creation with autodetect, with and without partitioning/clustering."""
+    # Mock load job with the number of rows it wrote
     mock_load_job = Mock()
-    mock_bq_client.load_table_from_uri.return_value = mock_load_job
-    
-    # Mock final table with row count
-    mock_final_table = Mock()
-    mock_final_table.num_rows = 1000
-    mock_bq_client.get_table.return_value = mock_final_table
-    
-    client = BigQueryClient("test-project", "gs://test-bucket")
-    client.client = mock_bq_client
+    mock_load_job.output_rows = 1000
+    bq_client.client.load_table_from_uri.return_value = mock_load_job
     
     table_info = {
         'database': 'TEST_DB',
         'schema': 'PUBLIC',
-        'table': 'my_table'
+        'table': 'my_table',
+        **bq_options
     }
     
-    success, error, row_count = client.create_bq_table(table_info)
+    success, error, row_count = bq_client.create_bq_table(table_info)
     
     assert success is True
     assert error is None
     assert row_count == 1000
     
     # Verify the load job was called
-    mock_bq_client.load_table_from_uri.assert_called_once()
+    bq_client.client.load_table_from_uri.assert_called_once()
     mock_load_job.result.assert_called_once()
+    
+    job_config = bq_client.client.load_table_from_uri.call_args.kwargs['job_config']
+    assert job_config.autodetect is True
+    if expected_partition_field:
+        assert job_config.time_partitioning.field == expected_partition_field
+    else:
+        assert job_config.time_partitioning is None
+    assert job_config.clustering_fields == expected_cluster_fields
 
 
-@patch('bigquery.bigquery_client.bigquery.Client')
-def test_create_external_table_success(mock_bigquery_client):
+def test_create_external_table_success(bq_client):
     """Test successful external table creation."""
-    # Setup mocks
-    mock_bq_client = Mock()
-    mock_bigquery_client.return_value = mock_bq_client
-    
-    # Mock dataset and table operations
-    mock_dataset_ref = Mock()
-    mock_table_ref = Mock()
-    mock_bq_client.dataset.return_value = mock_dataset_ref
-    mock_dataset_ref.table.return_value = mock_table_ref
-    
     # Mock table deletion (table doesn't exist)
-    from google.cloud.exceptions import NotFound
-    mock_bq_client.get_table.side_effect = NotFound("Table not found")
-    
-    client = BigQueryClient("test-project", "gs://test-bucket")
-    client.client = mock_bq_client
+    bq_client.client.get_table.side_effect = NotFound("Table not found")
     
     table_info = {
         'database': 'TEST_DB',
@@ -173,31 +210,25 @@ def test_create_external_table_success(mock_bigquery_client):
         'table': 'my_table'
     }
     
-    success, error = client.create_bq_external_table(table_info)
+    success, error = bq_client.create_bq_external_table(table_info)
     
     assert success is True
     assert error is None
     
     # Verify external table was created
-    mock_bq_client.create_table.assert_called_once()
+    bq_client.client.create_table.assert_called_once()
 
 
-def test_ensure_client_no_connection():
+def test_ensure_client_no_connection(offline_client):
     """Test client check when no connection."""
-    client = BigQueryClient("test-project", "gs://test-bucket")
-    # No client set
-    
     with pytest.raises(BigQueryConnectionError, match="No active BigQuery client"):
-        client._ensure_client()
+        offline_client._ensure_client()
 
 
-def test_ensure_client_with_connection():
+def test_ensure_client_with_connection(bq_client):
     """Test client check when connection exists."""
-    client = BigQueryClient("test-project", "gs://test-bucket")
-    client.client = Mock()  # Set a mock client
-    
     # Should not raise an exception
-    client._ensure_client()
+    bq_client._ensure_client()
 
 
 @patch('bigquery.bigquery_client.bigquery.Client')
@@ -208,16 +239,10 @@ def test_end_to_end_table_loading(mock_bigquery_client):
     mock_bigquery_client.return_value = mock_bq_client
     
     # Mock all the BigQuery objects
-    mock_dataset_ref = Mock()
-    mock_table_ref = Mock()
     mock_load_job = Mock()
-    mock_final_table = Mock()
     
-    mock_bq_client.dataset.return_value = mock_dataset_ref
-    mock_dataset_ref.table.return_value = mock_table_ref
     mock_bq_client.load_table_from_uri.return_value = mock_load_job
-    mock_final_table.num_rows = 5000
-    mock_bq_client.get_table.return_value = mock_final_table
+    mock_load_job.output_rows = 5000
     
     # Test with context manager and table loading
     client = BigQueryClient(
@@ -245,53 +270,57 @@ def test_end_to_end_table_loading(mock_bigquery_client):
         # Verify load job was configured and executed
         mock_bq_client.load_table_from_uri.assert_called_once()
         mock_load_job.result.assert_called_once()
-
-
-def test_snowflake_type_conversion():
+        
+        assert mock_bq_client.load_table_from_uri.call_args[0][0] == ["gs://my-bucket/analytics_db/reporting/sales_data/*"]
+        destination = mock_bq_client.load_table_from_uri.call_args[0][1]
+        assert destination == bigquery.TableReference.from_string("my-project.test_analytics_db_reporting.sales_data")
+
+
+@pytest.mark.parametrize("sf_type,expected_bq_type", [
+    ('VARCHAR(255)', 'STRING'),
+    ('NUMBER(10,2)', 'NUMERIC'),
+    ('INTEGER', 'INTEGER'),
+    ('TIMESTAMP_NTZ', 'TIMESTAMP'),
+    ('BOOLEAN', 'BOOLEAN'),
+    ('DATE', 'DATE'),
+    ('VARIANT', 'JSON'),
+    ('UNKNOWN_TYPE', 'STRING'),  # fallback
+])
+def test_snowflake_type_conversion(offline_client, sf_type, expected_bq_type):
     """Test Snowflake to BigQuery type conversion."""
-    client = BigQueryClient("test-project", "gs://test-bucket")
-    
-    test_cases = [
-        ('VARCHAR(255)', 'STRING'),
-        ('NUMBER(10,2)', 'NUMERIC'), 
-        ('INTEGER', 'INTEGER'),
-        ('TIMESTAMP_NTZ', 'TIMESTAMP'),
-        ('BOOLEAN', 'BOOLEAN'),
-        ('DATE', 'DATE'),
-        ('VARIANT', 'JSON'),
-        ('UNKNOWN_TYPE', 'STRING'),  # fallback
-    ]
-    
-    for sf_type, expected_bq_type in test_cases:
-        result = client._convert_snowflake_type_to_bigquery(sf_type)
-        assert result == expected_bq_type, f"Expected {sf_type} -> {expected_bq_type}, got {result}"
+    assert offline_client._convert_snowflake_type_to_bigquery(sf_type) == expected_bq_type
+
+
+@pytest.mark.parametrize("input_name,expected", [
+    ('CUSTOMER_ID', 'customer_id'),                      # uppercase -> lowercase
+    ('customer.name', 'customer_name'),                  # dot replacement
+    ('user profile email', 'user_profile_email'),        # spaces
+    ('order-date', 'order_date'),                        # hyphen
+    ('2nd_priority', '_2nd_priority'),                   # starts with number
+    ('user@domain.com', 'user_domain_com'),              # special characters
+    ('trailing_underscores___', 'trailing_underscores'), # trailing underscores
+    ('', '_'),                                           # empty string -> _
+    ('_TABLE_reserved', '_table_reserved_'),             # reserved prefix -> lowercase
+])
+def test_column_name_normalization_v2(offline_client, input_name, expected):
+    """Test BigQuery V2 column name normalization with lowercase."""
+    assert offline_client._normalize_column_name_v2(input_name) == expected
 
 
-def test_column_name_normalization_v2():
-    """Test BigQuery V2 column name normalization with lowercase."""
-    client = BigQueryClient("test-project", "gs://test-bucket")
+def test_column_name_normalization_is_cached(offline_client):
+    """Test that repeated column names are normalized once."""
+    from bigquery import bigquery_client
+    bigquery_client._normalize_column_name_v2.cache_clear()
     
-    test_cases = [
-        ('CUSTOMER_ID', 'customer_id'),                      # uppercase -> lowercase
-        ('customer.name', 'customer_name'),                  # dot replacement
-        ('user profile email', 'user_profile_email'),       # spaces
-        ('order-date', 'order_date'),                        # hyphen
-        ('2nd_priority', '_2nd_priority'),                   # starts with number
-        ('user@domain.com', 'user_domain_com'),              # special characters
-        ('trailing_underscores___', 'trailing_underscores'), # trailing underscores
-        ('', '_'),                                            # empty string -> _
-        ('_TABLE_reserved', '_table_reserved_'),              # reserved prefix -> lowercase
-    ]
+    assert offline_client._normalize_column_name_v2('Order Date') == 'order_date'
+    assert offline_client._normalize_column_name_v2('Order Date') == 'order_date'
     
-    for input_name, expected in test_cases:
-        result = client._normalize_column_name_v2(input_name)
-        assert result == expected, f"Expected {input_name} -> {expected}, got {result}"
+    cache_info = bigquery_client._normalize_column_name_v2.cache_info()
+    assert (cache_info.hits, cache_info.misses) == (1, 1)
 
 
-def test_schema_inference_with_deduplication():
+def test_schema_inference_with_deduplication(offline_client):
     """Test schema inference with duplicate column name handling."""
-    client = BigQueryClient("test-project", "gs://test-bucket")
-    
     # Table info with columns that will create duplicates after normalization
     table_info = {
         'columns': [
@@ -312,7 +341,7 @@ def test_schema_inference_with_deduplication():
         )'''
     }
     
-    schema_fields = client.infer_schema_from_table_info(table_info)
+    schema_fields = offline_client.infer_schema_from_table_info(table_info)
     
     # Check that we have all fields
     assert len(schema_fields) == 5
@@ -328,10 +357,26 @@ def test_schema_inference_with_deduplication():
     assert actual_names == expected_names, f"Expected {expected_names}, got {actual_names}"
 
 
-def test_column_alias_extraction():
-    """Test extraction of column aliases from COPY queries."""
-    client = BigQueryClient("test-project", "gs://test-bucket")
+def test_schema_inference_deduplication_skips_taken_suffixes(offline_client):
+    """Test that generated suffixes never collide with columns that already carry them."""
+    table_info = {
+        'columns': [
+            {'column_name': 'id', 'data_type': 'NUMBER'},
+            {'column_name': 'id_3', 'data_type': 'NUMBER'},
+            {'column_name': 'id', 'data_type': 'NUMBER'},
+            {'column_name': 'id', 'data_type': 'NUMBER'},
+            {'column_name': 'id', 'data_type': 'NUMBER'},
+        ],
+        'copy_query': ''
+    }
+    
+    field_names = [field.name for field in offline_client.infer_schema_from_table_info(table_info)]
     
+    assert field_names == ['id', 'id_3', 'id_2', 'id_4', 'id_5']
+
+
+def test_column_alias_extraction(offline_client):
+    """Test extraction of column aliases from COPY queries."""
     copy_query = '''COPY INTO @stage/ FROM (
         SELECT
             \"customer.id\" AS \"customer_id\",
@@ -340,76 +385,194 @@ def test_column_alias_extraction():
         FROM table
     )'''
     
-    aliases = client._extract_column_aliases_from_copy_query(copy_query)
+    aliases = offline_client._extract_column_aliases_from_copy_query(copy_query)
     expected_aliases = ['customer_id', 'order_date', 'user_email']
     
     assert aliases == expected_aliases, f"Expected {expected_aliases}, got {aliases}"
 
 
-@patch('bigquery.bigquery_client.bigquery.Client')
-def test_get_table_row_count(mock_bigquery_client):
-    """Test getting row count from BigQuery table."""
-    mock_bq_client = Mock()
-    mock_bigquery_client.return_value = mock_bq_client
+def test_column_alias_extraction_is_cached(offline_client):
+    """Test that a COPY query is parsed once and callers get independent lists."""
+    from bigquery import bigquery_client
+    bigquery_client._extract_column_aliases.cache_clear()
+    copy_query = 'COPY INTO @stage/ FROM (SELECT "a b" AS "a_b" FROM table)'
     
-    mock_result = Mock()
-    mock_result.__iter__ = Mock(return_value=iter([{'count': 5000}]))
-    mock_bq_client.query.return_value.result.return_value = mock_result
+    first = offline_client._extract_column_aliases_from_copy_query(copy_query)
+    first.append('mutated')
+    second = offline_client._extract_column_aliases_from_copy_query(copy_query)
     
-    client = BigQueryClient("test-project", "gs://test-bucket")
+    assert second == ['a_b']
+    cache_info = bigquery_client._extract_column_aliases.cache_info()
+    assert (cache_info.hits, cache_info.misses) == (1, 1)
+
+
+def test_get_table_row_count(entered_bq_client):
+    """Test getting row count from BigQuery table."""
+    entered_bq_client.client.query.return_value.result.return_value = [{'count': 5000}]
     
-    with client:
-        count = client.get_table_row_count("test_dataset", "test_table")
+    count = entered_bq_client.get_table_row_count("test_dataset", "test_table", exact=True)
     
     assert count == 5000
 
 
-@patch('bigquery.bigquery_client.bigquery.Client')
-def test_create_bq_table_with_autodetect_and_partitioning(mock_bigquery_client):
-    """Test table creation with autodetect when partitioning is specified but no custom schema."""
-    mock_bq_client = Mock()
-    mock_bigquery_client.return_value = mock_bq_client
+def test_get_table_row_count_from_metadata(entered_bq_client):
+    """Test that the default row count reads table metadata instead of running a query."""
+    mock_bq_client = entered_bq_client.client
+    mock_bq_client.get_table.return_value.num_rows = 1234
     
-    mock_dataset = Mock()
-    mock_bq_client.dataset.return_value = mock_dataset
-    mock_bq_client.create_dataset.return_value = mock_dataset
+    assert entered_bq_client.get_table_row_count("test_dataset", "test_table") == 1234
+    mock_bq_client.get_table.assert_called_once_with("test-project.test_dataset.test_table")
     
-    mock_table = Mock()
-    mock_table.num_rows = 1000
-    mock_bq_client.get_table.return_value = mock_table
+    mock_bq_client.get_table.side_effect = NotFound("missing")
+    assert entered_bq_client.get_table_row_count("test_dataset", "missing_table") == 0
     
-    mock_load_job = Mock()
-    mock_load_job.result.return_value = None
-    mock_bq_client.load_table_from_uri.return_value = mock_load_job
+    mock_bq_client.query.assert_not_called()
+
+
+def test_load_uses_inferred_schema_when_enabled():
+    """Test that Parquet loads skip autodetect when the inferred schema is enabled."""
+    mock_bq_client = Mock(spec=bigquery.Client)
+    mock_bq_client.load_table_from_uri.return_value.output_rows = 1
     
-    client = BigQueryClient("test-project", "gs://test-bucket")
+    client = BigQueryClient("test-project", "gs://test-bucket", use_inferred_schema=True)
+    client.client = mock_bq_client
+    
+    table_info = {
+        'database': 'DB',
+        'schema': 'PUBLIC',
+        'table': 'USERS',
+        'columns': [
+            {'column_name': 'ID', 'data_type': 'NUMBER(38,0)'},
+            {'column_name': 'NAME', 'data_type': 'VARCHAR(100)'},
+        ],
+        'copy_query': 'COPY INTO @stage/ FROM (SELECT "ID" AS "ID", "NAME" AS "NAME" FROM t)'
+    }
+    
+    success, _, _ = client.create_bq_table(table_info)
+    
+    job_config = mock_bq_client.load_table_from_uri.call_args.kwargs['job_config']
+    assert success is True
+    assert not job_config.autodetect
+    assert [(f.name, f.field_type) for f in job_config.schema] == [('id', 'NUMERIC'), ('name', 'STRING')]
+
+
+def test_load_job_labels_and_reservation():
+    """Test that load jobs carry client and table labels and the configured reservation."""
+    mock_bq_client = Mock(spec=bigquery.Client)
+    mock_bq_client.load_table_from_uri.return_value.output_rows = 1
     
+    client = BigQueryClient(
+        "test-project", "gs://test-bucket",
+        labels={'migration_run_id': '2024-01-01_00-00-00'},
+        reservation='projects/p/locations/EU/reservations/r'
+    )
+    client.client = mock_bq_client
+    
+    client.create_bq_table({'database': 'DB', 'schema': 'PUBLIC', 'table': 'T', 'labels': {'team': 'data'}})
+    
+    job_config = mock_bq_client.load_table_from_uri.call_args.kwargs['job_config']
+    assert job_config.labels == {'source': 'snowflake', 'migration_run_id': '2024-01-01_00-00-00', 'team': 'data'}
+    assert job_config.reservation == 'projects/p/locations/EU/reservations/r'
+
+
+def test_load_job_uses_explicit_gcs_uris(bq_client):
+    """Test that all staged files listed in gcs_uris are loaded by a single job."""
+    bq_client.client.load_table_from_uri.return_value.output_rows = 1
+    
+    gcs_uris = ["gs://test-bucket/db/public/t/data_0_0_0.snappy.parquet", "gs://test-bucket/db/public/t/data_0_1_0.snappy.parquet"]
+    bq_client.create_bq_table({'database': 'DB', 'schema': 'PUBLIC', 'table': 'T', 'gcs_uris': gcs_uris})
+    
+    bq_client.client.load_table_from_uri.assert_called_once()
+    assert bq_client.client.load_table_from_uri.call_args[0][0] == gcs_uris
+
+
+@patch('utils.retry.time.sleep')
+def test_transient_load_failures_are_retried(mock_sleep, bq_client):
+    """Test that rate-limited load jobs are re-run, while permanent errors fail at once."""
+    mock_bq_client = bq_client.client
+    rate_limited_job = Mock()
+    rate_limited_job.result.side_effect = Forbidden("quota", errors=[{'reason': 'rateLimitExceeded'}])
+    good_job = Mock(output_rows=5)
+    mock_bq_client.load_table_from_uri.side_effect = [rate_limited_job, good_job]
+    table_info = {'database': 'DB', 'schema': 'PUBLIC', 'table': 'T'}
+    
+    assert bq_client.create_bq_table(table_info) == (True, None, 5)
+    assert mock_bq_client.load_table_from_uri.call_count == 2
+    mock_sleep.assert_called_once()
+    
+    mock_bq_client.load_table_from_uri.reset_mock(side_effect=True)
+    mock_bq_client.load_table_from_uri.return_value.result.side_effect = BadRequest("bad schema")
+    success, error, _ = bq_client.create_bq_table(table_info)
+    assert success is False
+    assert "bad schema" in error
+    mock_bq_client.load_table_from_uri.assert_called_once()
+
+
+def test_unsupported_partition_type_fails_table(bq_client):
+    """Test that an unknown partition type is reported as a table error."""
     table_info = {
         'database': 'PROD',
         'schema': 'ANALYTICS',
         'table': 'SALES_DATA',
         'partition_field': 'event_date',
-        'partition_type': 'DAY',
-        'cluster_fields': ['customer_id', 'region']
+        'partition_type': 'WEEK',
     }
     
-    with client:
-        success, error, row_count = client.create_bq_table(table_info)
+    success, error, row_count = bq_client.create_bq_table(table_info)
     
-    assert success is True
-    assert error is None
-    assert row_count == 1000
+    assert success is False
+    assert "Unsupported partition type 'WEEK'" in error
+    assert row_count == 0
+    bq_client.client.load_table_from_uri.assert_not_called()
+
+
+def test_create_bq_tables_loads_in_parallel(bq_client):
+    """Test bulk loading ensures each dataset once and returns results in input order."""
+    bq_client.client.load_table_from_uri.return_value.output_rows = 10
+    
+    table_infos = [
+        {'database': 'DB', 'schema': 'PUBLIC', 'table': 'a'},
+        {'database': 'DB', 'schema': 'PUBLIC', 'table': 'b'},
+        {'database': 'DB', 'schema': 'OTHER', 'table': 'c', 'cluster_fields': ['id']},
+    ]
     
-    load_call = mock_bq_client.load_table_from_uri.call_args
-    job_config = load_call.kwargs['job_config'] if 'job_config' in load_call.kwargs else load_call[0][2] if len(load_call[0]) > 2 else None
+    results = bq_client.create_bq_tables(table_infos, max_workers=2)
     
-    assert job_config is not None
-    assert job_config.autodetect is True
-    assert job_config.time_partitioning is not None
-    assert job_config.time_partitioning.field == 'event_date'
-    assert job_config.clustering_fields == ['customer_id', 'region']
+    assert results == [(True, None, 10)] * 3
+    assert bq_client.client.create_dataset.call_count == 2
+    assert bq_client.client.load_table_from_uri.call_count == 3
+    # Only the table with BigQuery options is replaced, and only once
+    bq_client.client.delete_table.assert_called_once()
+
+
+def test_dataset_creation_is_cached(bq_client):
+    """Test that a dataset is only created once per client."""
+    bq_client._create_dataset_if_needed("snowflake_db_public")
+    bq_client._create_dataset_if_needed("snowflake_db_public")
+    
+    bq_client.client.create_dataset.assert_called_once()
+
+
+def test_dataset_cache_expires_and_can_be_invalidated(bq_client):
+    """Test that ensured datasets are re-checked after the TTL or an explicit invalidation."""
+    with patch('bigquery.bigquery_client.time.monotonic', return_value=1000.0):
+        errors = bq_client.ensure_datasets([
+            {'database': 'DB', 'schema': 'PUBLIC', 'table': 'a'},
+            {'database': 'DB', 'schema': 'PUBLIC', 'table': 'b'},
+        ])
+        assert errors == {'snowflake_db_public': None}
+        bq_client._create_dataset_if_needed("snowflake_db_public")
+        assert bq_client.client.create_dataset.call_count == 1
+        
+        bq_client.invalidate_dataset_cache("snowflake_db_public")
+        bq_client._create_dataset_if_needed("snowflake_db_public")
+        assert bq_client.client.create_dataset.call_count == 2
+    
+    with patch('bigquery.bigquery_client.time.monotonic', return_value=1000.0 + DATASET_CACHE_TTL_SECONDS + 1):
+        bq_client._create_dataset_if_needed("snowflake_db_public")
+    assert bq_client.client.create_dataset.call_count == 3
+
 
 
 if __name__ == "__main__":
-    logger.info("Running essential BigQueryClient tests...")
     pytest.main([__file__, "-v"])
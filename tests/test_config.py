@@ -0,0 +1,101 @@
+"""
+Essential tests for MigrationConfig - just the main functionality.
+"""
+import pytest
+from unittest.mock import patch
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from config import MigrationConfig
+
+
+def test_log_files_share_one_run_id(tmp_path, monkeypatch):
+    """Test that all files created by one config use the same timestamp."""
+    monkeypatch.setenv('LOGS_PATH', str(tmp_path / 'logs'))
+    config = MigrationConfig()
+    
+    with patch('config.datetime') as mock_datetime:
+        mock_datetime.now.return_value.strftime.side_effect = ['2024-01-01_00-00-00', '2024-01-01_00-00-01']
+        succeeded_file, failed_file = config.create_log_files()
+        dry_run_file = config.create_dry_run_file()
+    
+    assert succeeded_file.endswith('succeeded_tables_2024-01-01_00-00-00.yml')
+    assert failed_file.endswith('failed_tables_2024-01-01_00-00-00.yml')
+    assert dry_run_file.endswith('dry_mode_2024-01-01_00-00-00.yml')
+    mock_datetime.now.assert_called_once()
+    assert (tmp_path / 'logs').is_dir()
+
+
+def test_unload_compression_is_validated(monkeypatch):
+    """Test that an unknown Parquet compression codec is rejected up front."""
+    monkeypatch.setenv('EXTERNAL_STAGE', 'DB.PUBLIC.stage')
+    monkeypatch.setenv('PROJECT_ID', 'test-project')
+    monkeypatch.setenv('GCS_URI', 'gs://test-bucket')
+    
+    monkeypatch.setenv('UNLOAD_COMPRESSION', 'lzo')
+    config = MigrationConfig()
+    config.validate()
+    assert config.unload_compression == 'LZO'
+    
+    monkeypatch.setenv('UNLOAD_COMPRESSION', 'gzip')
+    with pytest.raises(ValueError, match="UNLOAD_COMPRESSION"):
+        MigrationConfig().validate()
+
+
+def test_dry_run_file_extension_follows_format(tmp_path, monkeypatch):
+    """Test that the jsonl dry-run format gets a .jsonl file."""
+    monkeypatch.setenv('LOGS_PATH', str(tmp_path))
+    monkeypatch.setenv('DRY_RUN_FORMAT', 'JSONL')
+    
+    config = MigrationConfig()
+    assert config.dry_run_format == 'jsonl'
+    assert config.create_dry_run_file().endswith('.jsonl')
+
+
+def test_result_file_extension_follows_format(tmp_path, monkeypatch):
+    """Test that the jsonl result format gets .jsonl files and unknown formats are rejected."""
+    monkeypatch.setenv('LOGS_PATH', str(tmp_path))
+    monkeypatch.setenv('EXTERNAL_STAGE', 'DB.PUBLIC.stage')
+    monkeypatch.setenv('PROJECT_ID', 'test-project')
+    monkeypatch.setenv('GCS_URI', 'gs://test-bucket')
+    monkeypatch.setenv('RESULT_FILE_FORMAT', 'jsonl')
+    
+    config = MigrationConfig()
+    config.validate()
+    assert all(path.endswith('.jsonl') for path in config.create_log_files())
+    
+    monkeypatch.setenv('RESULT_FILE_FORMAT', 'csv')
+    with pytest.raises(ValueError, match="RESULT_FILE_FORMAT"):
+        MigrationConfig().validate()
+
+
+@pytest.mark.parametrize("name,value,message", [
+    ('MIGRATION_PARALLELISM', 'four', "MIGRATION_PARALLELISM must be an integer, got 'four'"),
+    ('SAMPLE_LIMIT', '1e3', "SAMPLE_LIMIT must be an integer, got '1e3'"),
+    ('UNLOAD_MAX_FILE_SIZE', '256MB', "UNLOAD_MAX_FILE_SIZE must be an integer, got '256MB'"),
+    ('METADATA_CACHE_TTL_HOURS', 'a day', "METADATA_CACHE_TTL_HOURS must be a number, got 'a day'"),
+])
+def test_invalid_numbers_name_their_variable(monkeypatch, name, value, message):
+    """Test that a malformed numeric setting is reported with the variable's name."""
+    monkeypatch.setenv(name, value)
+    with pytest.raises(ValueError, match=message):
+        MigrationConfig()
+
+
+def test_numeric_settings_are_parsed(monkeypatch):
+    """Test that numeric settings are converted, and empty values fall back to the defaults."""
+    monkeypatch.setenv('MIGRATION_PARALLELISM', '4')
+    monkeypatch.setenv('METADATA_CACHE_TTL_HOURS', '1.5')
+    monkeypatch.setenv('UNLOAD_MAX_FILE_SIZE', '')
+    
+    config = MigrationConfig()
+    
+    assert config.parallelism == 4
+    assert config.metadata_cache_ttl_hours == 1.5
+    assert config.unload_max_file_size is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
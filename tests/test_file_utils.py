@@ -0,0 +1,89 @@
+"""
+Essential tests for file utilities - just the main functionality.
+"""
+import json
+import pytest
+import sys
+import os
+
+import yaml
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.file_utils import ResultFileWriter
+
+
+def test_result_writer_appends_each_result_as_it_happens(tmp_path):
+    """Test that results are on disk before the writer is closed and read back as YAML lists."""
+    succeeded_file = tmp_path / 'succeeded.yml'
+    failed_file = tmp_path / 'failed.yml'
+    writer = ResultFileWriter(str(succeeded_file), str(failed_file))
+    
+    writer.write({'database': 'DB', 'schema': 'PUBLIC', 'table': 'a',
+                  'copy_query': 'COPY INTO @stage\nFROM a'}, True)
+    writer.write({'database': 'DB', 'schema': 'PUBLIC', 'table': 'b', 'error': 'boom'}, False)
+    writer.write({'database': 'DB', 'schema': 'PUBLIC', 'table': 'c'}, True)
+    
+    # Readable mid-run, e.g. after the process was killed
+    succeeded = yaml.safe_load(succeeded_file.read_text())
+    assert [t['table'] for t in succeeded] == ['a', 'c']
+    assert succeeded[0]['copy_query'] == 'COPY INTO @stage\nFROM a'
+    
+    writer.close()
+    writer.close()
+    assert yaml.safe_load(failed_file.read_text()) == [
+        {'database': 'DB', 'schema': 'PUBLIC', 'table': 'b', 'error': 'boom'}
+    ]
+    assert (writer.succeeded_count, writer.failed_count) == (2, 1)
+
+
+def test_result_writer_formats_queries_as_literal_blocks(tmp_path):
+    """Test that multiline queries are literal blocks and other strings are quoted."""
+    succeeded_file = tmp_path / 'succeeded.yml'
+    writer = ResultFileWriter(str(succeeded_file), str(tmp_path / 'failed.yml'))
+    
+    writer.write({'table': 'a', 'copy_query': 'COPY INTO @stage\nFROM a', 'cleaning_query': 'REMOVE @stage/a/',
+                  'columns': [{'column_name': 'ID'}]}, True)
+    writer.close()
+    
+    assert succeeded_file.read_text() == (
+        "- 'table': 'a'\n"
+        "  'copy_query': |-\n"
+        "    COPY INTO @stage\n"
+        "    FROM a\n"
+        "  'cleaning_query': 'REMOVE @stage/a/'\n"
+        "  'columns':\n"
+        "  - 'column_name': 'ID'\n"
+    )
+
+
+def test_result_writer_jsonl(tmp_path):
+    """Test that the JSON Lines format writes one JSON document per table."""
+    succeeded_file = tmp_path / 'succeeded.jsonl'
+    failed_file = tmp_path / 'failed.jsonl'
+    writer = ResultFileWriter(str(succeeded_file), str(failed_file), file_format='jsonl')
+    
+    writer.write({'table': 'a', 'copy_query': 'COPY INTO @stage\nFROM a'}, True)
+    writer.write({'table': 'b'}, True)
+    writer.write({'table': 'c', 'error': 'boom'}, False)
+    writer.close()
+    
+    lines = succeeded_file.read_text().splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {'table': 'a', 'copy_query': 'COPY INTO @stage\nFROM a'},
+        {'table': 'b'}
+    ]
+    assert json.loads(failed_file.read_text()) == {'table': 'c', 'error': 'boom'}
+
+
+def test_result_writer_creates_empty_files(tmp_path):
+    """Test that both result files exist even when nothing was migrated."""
+    writer = ResultFileWriter(str(tmp_path / 'succeeded.yml'), str(tmp_path / 'failed.yml'))
+    writer.close()
+    
+    assert (tmp_path / 'succeeded.yml').read_text() == ''
+    assert (tmp_path / 'failed.yml').read_text() == ''
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -2,32 +2,59 @@
 Essential integration tests - just the key workflows.
 Since we already have solid unit tests, keeping this minimal.
 
-Note: All test artifacts are isolated in tests/logs/ directory.
+Note: Result files are written to a per-test temporary directory (see logs_dir).
 """
 import pytest
 import os
 import sys
-import shutil
-from pathlib import Path
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, patch
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from main import main, parse_arguments
+from bigquery.bigquery_client import BigQueryClient
+from snowflake.snowflake_client import SnowflakeClient
 
 
-class TestEssentialIntegration:
-    """Just the essential end-to-end tests."""
+class FakeClientContext:
+    """Stands in for a client instance used as `with Client(...) as client:`."""
+    
+    def __init__(self, client):
+        self.client = client
     
-    def setup_method(self):
-        """Set up test environment with isolated logs directory."""
-        self.test_logs_dir = Path('tests/logs')
-        self.test_logs_dir.mkdir(parents=True, exist_ok=True)
+    def __enter__(self):
+        return self.client
     
-    def teardown_method(self):
-        """Clean up test artifacts after each test."""
-        # Note: We don't clean up immediately because atexit handlers might still run
-        # Let pytest handle cleanup or clean manually if needed
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+def mock_clients(mock_sf_class, mock_bq_class):
+    """Make the patched client classes yield spec'd mocks; returns (snowflake, bigquery) mocks."""
+    mock_sf_context = Mock(spec=SnowflakeClient)
+    mock_bq_context = Mock(spec=BigQueryClient)
+    mock_sf_class.return_value = FakeClientContext(mock_sf_context)
+    mock_bq_class.return_value = FakeClientContext(mock_bq_context)
+    return mock_sf_context, mock_bq_context
+
+
+@pytest.fixture
+def logs_dir(tmp_path):
+    """Isolated LOGS_PATH for the result files of one test."""
+    return tmp_path
+
+
+@pytest.fixture
+def migration_env(monkeypatch, logs_dir):
+    """Set the environment variables a migration run needs."""
+    monkeypatch.setenv('EXTERNAL_STAGE', 'test.stage')
+    monkeypatch.setenv('PROJECT_ID', 'test-project')
+    monkeypatch.setenv('GCS_URI', 'gs://test-bucket')
+    monkeypatch.setenv('LOGS_PATH', str(logs_dir))
+
+
+class TestEssentialIntegration:
+    """Just the essential end-to-end tests."""
 
     def test_argument_parsing(self):
         """Test CLI arguments work."""
@@ -38,13 +65,10 @@ class TestEssentialIntegration:
 
     @patch('main.SnowflakeClient')
     @patch('main.BigQueryClient')
-    def test_dry_run_workflow(self, mock_bq_class, mock_sf_class):
+    def test_dry_run_workflow(self, mock_bq_class, mock_sf_class, migration_env, monkeypatch):
         """Test complete dry run - the most common use case."""
-        # Setup mocks
-        mock_sf_context = MagicMock()
-        mock_bq_context = MagicMock()
-        mock_sf_class.return_value.__enter__.return_value = mock_sf_context
-        mock_bq_class.return_value.__enter__.return_value = mock_bq_context
+        monkeypatch.setenv('SAMPLE_LIMIT', '5')
+        mock_sf_context, mock_bq_context = mock_clients(mock_sf_class, mock_bq_class)
         
         mock_sf_context.list_tables_from_yaml.return_value = [
             {'database': 'TEST_DB', 'schema': 'PUBLIC', 'table': 'test_table'}
@@ -58,28 +82,18 @@ class TestEssentialIntegration:
             }
         ]
         
-        env_vars = {
-            'EXTERNAL_STAGE': 'test.stage',
-            'PROJECT_ID': 'test-project',
-            'GCS_URI': 'gs://test-bucket',
-            'LOGS_PATH': 'tests/logs'
-        }
+        main(dry_run=True, interactive=False, sample=False)
         
-        with patch.dict(os.environ, env_vars):
-            main(dry_run=True, interactive=False, sample=False)
-            
-            # Verify dry run behavior - no actual execution
-            mock_sf_context.run_copy_query.assert_not_called()
-            mock_bq_context.create_bq_table.assert_not_called()
+        # Verify dry run behavior - no actual execution
+        mock_sf_context.run_copy_query.assert_not_called()
+        mock_bq_context.create_bq_table.assert_not_called()
+        assert mock_sf_context.generate_copy_queries.call_args.kwargs['sample_limit'] == 5
 
     @patch('main.SnowflakeClient')
     @patch('main.BigQueryClient')
-    def test_actual_migration_workflow(self, mock_bq_class, mock_sf_class):
+    def test_actual_migration_workflow(self, mock_bq_class, mock_sf_class, migration_env):
         """Test actual migration (not dry run)."""
-        mock_sf_context = MagicMock()
-        mock_bq_context = MagicMock()
-        mock_sf_class.return_value.__enter__.return_value = mock_sf_context
-        mock_bq_class.return_value.__enter__.return_value = mock_bq_context
+        mock_sf_context, mock_bq_context = mock_clients(mock_sf_class, mock_bq_class)
         
         mock_sf_context.list_tables_from_yaml.return_value = [
             {'database': 'TEST_DB', 'schema': 'PUBLIC', 'table': 'test_table'}
@@ -93,29 +107,21 @@ class TestEssentialIntegration:
             }
         ]
         mock_sf_context.run_cleaning_query.return_value = (True, None)
-        mock_sf_context.run_copy_query.return_value = (True, None)
-        mock_sf_context.get_table_row_count.return_value = 100
+        mock_sf_context.run_copy_query.return_value = (True, None, 100)
         mock_bq_context.create_bq_table.return_value = (True, None, 100)
         
-        env_vars = {
-            'EXTERNAL_STAGE': 'test.stage',
-            'PROJECT_ID': 'test-project',
-            'GCS_URI': 'gs://test-bucket',
-            'LOGS_PATH': 'tests/logs'
-        }
+        main(dry_run=False, interactive=False, sample=False)
         
-        with patch.dict(os.environ, env_vars):
-            main(dry_run=False, interactive=False, sample=False)
-            
-            # Verify actual migration happened
-            mock_sf_context.run_copy_query.assert_called_once()
-            mock_bq_context.create_bq_table.assert_called_once()
+        # Verify actual migration happened
+        mock_sf_context.run_copy_query.assert_called_once()
+        mock_bq_context.create_bq_table.assert_called_once()
+        mock_bq_context.close.assert_called_once()
 
     @patch('inquirer.prompt')
     @patch('main.SnowflakeClient')
     @patch('main.BigQueryClient')
     @patch('config.load_dotenv')
-    def test_interactive_bigquery_permission(self, mock_load_dotenv, mock_bq_class, mock_sf_class, mock_prompt):
+    def test_interactive_bigquery_permission(self, mock_load_dotenv, mock_bq_class, mock_sf_class, mock_prompt, migration_env):
         """Test that interactive mode prompts for BigQuery table loading permission."""
         # Mock user responses - first for table permission, then for BigQuery loading
         mock_prompt.side_effect = [
@@ -123,11 +129,7 @@ class TestEssentialIntegration:
             {'action': 'proceed'}   # Proceed with BigQuery loading
         ]
         
-        # Mock clients
-        mock_sf_context = Mock()
-        mock_bq_context = Mock()
-        mock_sf_class.return_value.__enter__.return_value = mock_sf_context
-        mock_bq_class.return_value.__enter__.return_value = mock_bq_context
+        mock_sf_context, mock_bq_context = mock_clients(mock_sf_class, mock_bq_class)
         
         # Mock successful operations
         mock_sf_context.list_tables_from_yaml.return_value = [
@@ -141,34 +143,23 @@ class TestEssentialIntegration:
             }
         ]
         mock_sf_context.run_cleaning_query.return_value = (True, None)
-        mock_sf_context.run_copy_query.return_value = (True, None)
-        mock_sf_context.get_table_row_count.return_value = 100
+        mock_sf_context.run_copy_query.return_value = (True, None, 100)
         mock_bq_context.create_bq_table.return_value = (True, None, 100)
         
-        env_vars = {
-            'EXTERNAL_STAGE': 'test.stage',
-            'PROJECT_ID': 'test-project',
-            'GCS_URI': 'gs://test-bucket',
-            'LOGS_PATH': 'tests/logs'
-        }
-        
-        with patch.dict(os.environ, env_vars):
-            main(dry_run=False, interactive=True, sample=False)
-            
-            # Verify BigQuery table was called
-            mock_bq_context.create_bq_table.assert_called_once()
-            
-            # Verify we got two input prompts (table permission + BigQuery permission)
-            assert mock_prompt.call_count == 2
+        main(dry_run=False, interactive=True, sample=False)
+        
+        # Verify BigQuery table was called
+        mock_bq_context.create_bq_table.assert_called_once()
+        
+        # Verify we got two input prompts (table permission + BigQuery permission)
+        assert mock_prompt.call_count == 2
 
     @patch('subprocess.run')
-    @patch('builtins.open')
-    @patch('tempfile.NamedTemporaryFile')
     @patch('inquirer.prompt')
     @patch('main.SnowflakeClient')
     @patch('main.BigQueryClient')
     @patch('config.load_dotenv')
-    def test_bigquery_edit_options(self, mock_load_dotenv, mock_bq_class, mock_sf_class, mock_prompt, mock_temp_file, mock_open, mock_subprocess):
+    def test_bigquery_edit_options(self, mock_load_dotenv, mock_bq_class, mock_sf_class, mock_prompt, mock_subprocess, migration_env):
         """Test BigQuery edit options in interactive mode."""
         # Mock user responses - edit schema via external editor, then proceed
         mock_prompt.side_effect = [
@@ -177,19 +168,17 @@ class TestEssentialIntegration:
             {'action': 'proceed'}      # Proceed with BigQuery loading after schema edit
         ]
         
-        # Mock the temporary file and editor process
-        mock_temp_file.return_value.__enter__.return_value.name = '/tmp/test_schema.json'
-        mock_subprocess.return_value.returncode = 0
+        # Mock the editor process: it saves the edited schema into the temporary file
+        edited_schema = '[{"name": "id", "type": "INTEGER"}]'
         
-        # Mock reading the edited schema file
-        mock_file_handle = mock_open.return_value.__enter__.return_value
-        mock_file_handle.read.return_value = '[{"name": "id", "type": "INTEGER"}]'
+        def fake_editor(args, **kwargs):
+            with open(args[-1], 'w') as f:
+                f.write(edited_schema)
+            return Mock(returncode=0)
         
-        # Mock clients
-        mock_sf_context = Mock()
-        mock_bq_context = Mock()
-        mock_sf_class.return_value.__enter__.return_value = mock_sf_context
-        mock_bq_class.return_value.__enter__.return_value = mock_bq_context
+        mock_subprocess.side_effect = fake_editor
+        
+        mock_sf_context, mock_bq_context = mock_clients(mock_sf_class, mock_bq_class)
         
         # Mock successful operations
         mock_sf_context.list_tables_from_yaml.return_value = [
@@ -203,35 +192,25 @@ class TestEssentialIntegration:
             }
         ]
         mock_sf_context.run_cleaning_query.return_value = (True, None)
-        mock_sf_context.run_copy_query.return_value = (True, None)
-        mock_sf_context.get_table_row_count.return_value = 100
+        mock_sf_context.run_copy_query.return_value = (True, None, 100)
         mock_bq_context.create_bq_table.return_value = (True, None, 100)
         
-        env_vars = {
-            'EXTERNAL_STAGE': 'test.stage',
-            'PROJECT_ID': 'test-project',
-            'GCS_URI': 'gs://test-bucket',
-            'LOGS_PATH': 'tests/logs'
-        }
-        
-        with patch.dict(os.environ, env_vars):
-            main(dry_run=False, interactive=True, sample=False)
-            
-            # Verify BigQuery table was called with custom schema
-            mock_bq_context.create_bq_table.assert_called_once()
-            call_args = mock_bq_context.create_bq_table.call_args[0][0]
-            assert 'custom_schema' in call_args
+        main(dry_run=False, interactive=True, sample=False)
+        
+        # Verify BigQuery table was called with custom schema
+        mock_bq_context.create_bq_table.assert_called_once()
+        call_args = mock_bq_context.create_bq_table.call_args[0][0]
+        assert call_args['custom_schema'] == edited_schema
 
     @patch('main.SnowflakeClient')
     @patch('main.BigQueryClient')
     @patch('config.load_dotenv')  # Prevent .env file loading
-    def test_config_validation_error(self, mock_load_dotenv, mock_bq_class, mock_sf_class):
+    def test_config_validation_error(self, mock_load_dotenv, mock_bq_class, mock_sf_class, logs_dir):
         """Test config validation catches missing env vars."""
-        with patch.dict(os.environ, {'LOGS_PATH': 'tests/logs'}, clear=True):
+        with patch.dict(os.environ, {'LOGS_PATH': str(logs_dir)}, clear=True):
             with pytest.raises(ValueError, match="EXTERNAL_STAGE"):
                 main(dry_run=False, interactive=False, sample=False)
 
 
 if __name__ == "__main__":
-    logger.info("Running essential integration tests...")
     pytest.main([__file__, "-v"])
@@ -0,0 +1,62 @@
+"""
+Essential tests for the metadata cache - just the main functionality.
+"""
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.metadata_cache import MetadataCache
+
+TABLES = [{'database': 'DB', 'schema': 'PUBLIC', 'table': 'T', 'table_type': 'BASE TABLE',
+           'columns': [{'column_name': 'ID', 'data_type': 'NUMBER'}]}]
+
+
+def test_cache_round_trip(tmp_path):
+    """Test that a stored result is returned for the same connection, query and bind values only."""
+    cache = MetadataCache(directory=str(tmp_path), ttl_seconds=60)
+    
+    assert cache.get('default', 'SELECT 1', []) is None
+    cache.set('default', 'SELECT 1', [], TABLES)
+    
+    assert cache.get('default', 'SELECT 1', []) == TABLES
+    assert cache.get('other', 'SELECT 1', []) is None
+    assert cache.get('default', 'SELECT 2', []) is None
+    assert cache.get('default', 'SELECT 1', ['PUBLIC']) is None
+
+
+def test_cache_entries_expire(tmp_path):
+    """Test that entries older than the TTL are ignored."""
+    cache = MetadataCache(directory=str(tmp_path), ttl_seconds=60)
+    cache.set('default', 'SELECT 1', [], TABLES)
+    
+    for entry in tmp_path.iterdir():
+        os.utime(entry, (0, 0))
+    
+    assert cache.get('default', 'SELECT 1', []) is None
+
+
+def test_refresh_ignores_existing_entries(tmp_path):
+    """Test that a refreshing cache misses but still rewrites entries."""
+    MetadataCache(directory=str(tmp_path), ttl_seconds=60).set('default', 'SELECT 1', [], TABLES)
+    
+    refreshing_cache = MetadataCache(directory=str(tmp_path), ttl_seconds=60, refresh=True)
+    assert refreshing_cache.get('default', 'SELECT 1', []) is None
+    
+    refreshing_cache.set('default', 'SELECT 1', [], [])
+    assert MetadataCache(directory=str(tmp_path), ttl_seconds=60).get('default', 'SELECT 1', []) == []
+
+
+def test_unreadable_entry_is_a_miss(tmp_path):
+    """Test that a corrupt entry is treated as missing."""
+    cache = MetadataCache(directory=str(tmp_path), ttl_seconds=60)
+    cache.set('default', 'SELECT 1', [], TABLES)
+    for entry in tmp_path.iterdir():
+        entry.write_text('{not json')
+    
+    assert cache.get('default', 'SELECT 1', []) is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,360 @@
+"""
+Essential tests for the migration workflow - just the main functionality.
+"""
+import pytest
+from unittest.mock import Mock, patch
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from migration_workflow import run_dry_mode, run_migration_workflow
+
+
+def make_config(parallelism=1, interactive=False):
+    """Build a minimal config for workflow tests."""
+    config = Mock()
+    config.parallelism = parallelism
+    config.interactive = interactive
+    config.batch_confirm = 1
+    config.result_writer = None
+    config.verbose = False
+    config.verify_source_row_count = False
+    config.external_stage = 'DB.PUBLIC.stage'
+    config.snowflake_connection_name = 'default'
+    return config
+
+
+def make_tables(count):
+    """Build a list of table infos."""
+    return [{'database': 'DB', 'schema': 'PUBLIC', 'table': f't{i}'} for i in range(count)]
+
+
+@patch('migration_workflow.SnowflakeClient')
+def test_parallel_workflow_uses_per_worker_snowflake_clients(mock_sf_class):
+    """Test that parallel runs migrate every table with worker-owned Snowflake sessions."""
+    worker_sf = mock_sf_class.return_value
+    worker_sf.run_cleaning_query.return_value = (True, None)
+    worker_sf.run_copy_query.return_value = (True, None, 10)
+    
+    bq_client = Mock()
+    bq_client.create_bq_table.return_value = (True, None, 10)
+    shared_sf = Mock()
+    shared_sf.get_table_row_counts.return_value = {}
+    
+    succeeded, failed = run_migration_workflow(make_tables(6), shared_sf, bq_client, make_config(parallelism=3))
+    
+    assert len(succeeded) == 6
+    assert failed == []
+    assert bq_client.create_bq_table.call_count == 6
+    shared_sf.run_copy_query.assert_not_called()
+    assert 1 <= mock_sf_class.call_count <= 3
+    assert mock_sf_class.return_value.__exit__.call_count == mock_sf_class.call_count
+
+
+@patch('migration_workflow.SnowflakeClient')
+def test_parallel_workflow_records_failures(mock_sf_class):
+    """Test that a failing table does not stop the other tables."""
+    worker_sf = mock_sf_class.return_value
+    worker_sf.run_cleaning_query.return_value = (True, None)
+    worker_sf.run_copy_query.side_effect = lambda table_info, stage: (
+        (False, 'boom', 0) if table_info['table'] == 't1' else (True, None, 10)
+    )
+    
+    bq_client = Mock()
+    bq_client.create_bq_table.return_value = (True, None, 10)
+    shared_sf = Mock()
+    shared_sf.get_table_row_counts.return_value = {}
+    
+    succeeded, failed = run_migration_workflow(make_tables(3), shared_sf, bq_client, make_config(parallelism=2))
+    
+    assert sorted(t['table'] for t in succeeded) == ['t0', 't2']
+    assert [t['table'] for t in failed] == ['t1']
+    assert failed[0]['error'] == 'Snowflake COPY failed: boom'
+
+
+@patch('migration_workflow.SnowflakeClient')
+def test_parallel_ctrl_c_waits_for_running_tables(mock_sf_class):
+    """Test that Ctrl+C lets running tables finish before their Snowflake sessions are closed."""
+    import threading
+    import time
+    copies_started = threading.Barrier(3, timeout=5)
+    closed_during_copy = []
+    
+    def copy(table_info, stage):
+        copies_started.wait()
+        time.sleep(0.1)
+        closed_during_copy.append(mock_sf_class.return_value.__exit__.called)
+        return True, None, 10
+    
+    def interrupted(futures):
+        copies_started.wait()
+        raise KeyboardInterrupt()
+    
+    worker_sf = mock_sf_class.return_value
+    worker_sf.run_cleaning_query.return_value = (True, None)
+    worker_sf.run_copy_query.side_effect = copy
+    bq_client = Mock()
+    bq_client.create_bq_table.return_value = (True, None, 10)
+    shared_sf = Mock()
+    shared_sf.get_table_row_counts.return_value = {}
+    
+    with patch('migration_workflow.as_completed', side_effect=interrupted):
+        succeeded, failed = run_migration_workflow(make_tables(4), shared_sf, bq_client, make_config(parallelism=2))
+    
+    assert closed_during_copy == [False, False]
+    assert sorted(t['table'] for t in succeeded) == ['t0', 't1']
+    assert [t['table'] for t in failed] == ['t2', 't3']
+    assert all(t['error'] == 'Aborted by user (Ctrl+C)' for t in failed)
+    assert worker_sf.__exit__.call_count == mock_sf_class.call_count
+
+
+def test_parallel_runs_start_with_the_largest_tables():
+    """Test that tables are ordered by Snowflake row count, largest first, before a parallel run."""
+    from migration_workflow import _largest_tables_first
+    from snowflake.snowflake_client import SnowflakeQueryError
+    sf_client = Mock()
+    sf_client.get_table_row_counts.return_value = {('DB', 'PUBLIC', 't1'): 500, ('DB', 'PUBLIC', 't3'): 20}
+    
+    ordered = _largest_tables_first(iter(make_tables(4)), sf_client)
+    assert [t['table'] for t in ordered] == ['t1', 't3', 't0', 't2']
+    assert all(set(t) == {'database', 'schema', 'table'} for t in ordered)
+    
+    sf_client.get_table_row_counts.side_effect = SnowflakeQueryError("no access")
+    assert [t['table'] for t in _largest_tables_first(make_tables(3), sf_client)] == ['t0', 't1', 't2']
+
+
+def test_pipelined_workflow_uses_given_snowflake_client():
+    """Test that the default workflow unloads on the caller's Snowflake client and loads every staged table."""
+    sf_client = Mock()
+    sf_client.run_cleaning_query.return_value = (True, None)
+    sf_client.run_copy_query.side_effect = lambda table_info, stage: (
+        (False, 'boom', 0) if table_info['table'] == 't1' else (True, None, 10)
+    )
+    bq_client = Mock()
+    bq_client.create_bq_table.return_value = (True, None, 10)
+    
+    succeeded, failed = run_migration_workflow(make_tables(3), sf_client, bq_client, make_config())
+    
+    assert sorted(t['table'] for t in succeeded) == ['t0', 't2']
+    assert [t['table'] for t in failed] == ['t1']
+    assert sf_client.run_copy_query.call_count == 3
+    assert bq_client.create_bq_table.call_count == 2
+
+
+def test_pipelined_workflow_records_loads_as_they_finish():
+    """Test that a finished BigQuery load is recorded before the remaining tables are staged."""
+    import threading
+    import time
+    t0_loaded = threading.Event()
+    recorded_before_t2 = []
+    config = make_config()
+    config.result_writer = Mock()
+    
+    def copy(table_info, stage):
+        if table_info['table'] == 't1':
+            t0_loaded.wait(timeout=5)
+            time.sleep(0.1)
+        elif table_info['table'] == 't2':
+            recorded_before_t2.extend(call.args[0]['table'] for call in config.result_writer.write.call_args_list)
+        return True, None, 10
+    
+    def load(table_info):
+        if table_info['table'] == 't0':
+            t0_loaded.set()
+        return True, None, 10
+    
+    sf_client = Mock()
+    sf_client.run_cleaning_query.return_value = (True, None)
+    sf_client.run_copy_query.side_effect = copy
+    bq_client = Mock()
+    bq_client.create_bq_table.side_effect = load
+    
+    succeeded, failed = run_migration_workflow(make_tables(3), sf_client, bq_client, config)
+    
+    assert recorded_before_t2 == ['t0']
+    assert sorted(t['table'] for t in succeeded) == ['t0', 't1', 't2']
+    assert config.result_writer.write.call_count == 3
+
+
+def test_pipelined_ctrl_c_keeps_finished_loads():
+    """Test that Ctrl+C records the loads that finished and aborts only the tables without a result."""
+    import threading
+    t0_loading = threading.Event()
+    
+    def copy(table_info, stage):
+        if table_info['table'] == 't2':
+            t0_loading.wait(timeout=5)
+            raise KeyboardInterrupt()
+        return True, None, 10
+    
+    def load(table_info):
+        if table_info['table'] == 't0':
+            t0_loading.set()
+        return True, None, 10
+    
+    sf_client = Mock()
+    sf_client.run_cleaning_query.return_value = (True, None)
+    sf_client.run_copy_query.side_effect = copy
+    bq_client = Mock()
+    bq_client.create_bq_table.side_effect = load
+    
+    succeeded, failed = run_migration_workflow(iter(make_tables(4)), sf_client, bq_client, make_config())
+    
+    # t1's load may still have been queued behind t0's, in which case it is cancelled
+    loaded = [call.args[0]['table'] for call in bq_client.create_bq_table.call_args_list]
+    assert 't0' in loaded
+    assert sorted(t['table'] for t in succeeded) == sorted(loaded)
+    assert sorted(t['table'] for t in succeeded + failed) == ['t0', 't1', 't2', 't3']
+    assert all(t['error'] == 'Aborted by user (Ctrl+C)' for t in failed)
+
+
+
+def test_workflow_consumes_lazy_table_stream():
+    """Test that a generator of tables is migrated as it is produced."""
+    produced = []
+    
+    def table_stream():
+        for table_info in make_tables(3):
+            produced.append(table_info['table'])
+            yield table_info
+    
+    sf_client = Mock()
+    sf_client.run_cleaning_query.return_value = (True, None)
+    sf_client.run_copy_query.return_value = (True, None, 10)
+    bq_client = Mock()
+    bq_client.create_bq_table.return_value = (True, None, 10)
+    
+    succeeded, failed = run_migration_workflow(table_stream(), sf_client, bq_client, make_config())
+    
+    assert produced == ['t0', 't1', 't2']
+    assert sorted(t['table'] for t in succeeded) == ['t0', 't1', 't2']
+    assert failed == []
+
+
+@patch('migration_workflow.ask_user_permission_per_table')
+def test_interactive_abort_drains_remaining_tables(mock_ask):
+    """Test that aborting marks the current and every remaining table of the stream as aborted."""
+    mock_ask.return_value = (False, True)
+    
+    succeeded, failed = run_migration_workflow(
+        iter(make_tables(3)), Mock(), Mock(), make_config(interactive=True)
+    )
+    
+    assert succeeded == []
+    assert [t['table'] for t in failed] == ['t0', 't1', 't2']
+    assert all(t['error'] == 'Aborted by user' for t in failed)
+
+
+
+@patch('migration_workflow.ask_bigquery_table_permission', return_value=(True, False))
+@patch('migration_workflow.ask_user_permission_per_table')
+def test_ctrl_c_aborts_each_unfinished_table_once(mock_ask_table, mock_ask_bq):
+    """Test that Ctrl+C records every table without a result exactly once."""
+    mock_ask_table.side_effect = [(True, False), KeyboardInterrupt()]
+    sf_client = Mock()
+    sf_client.run_cleaning_query.return_value = (True, None)
+    sf_client.run_copy_query.return_value = (True, None, 10)
+    bq_client = Mock()
+    bq_client.create_bq_table.return_value = (True, None, 10)
+    
+    succeeded, failed = run_migration_workflow(
+        iter(make_tables(4)), sf_client, bq_client, make_config(interactive=True)
+    )
+    
+    assert [t['table'] for t in succeeded] == ['t0']
+    assert [t['table'] for t in failed] == ['t1', 't2', 't3']
+    assert all(t['error'] == 'Aborted by user (Ctrl+C)' for t in failed)
+
+
+@patch('migration_workflow.ask_bigquery_table_permission')
+@patch('migration_workflow.ask_user_permission_per_table')
+@patch('migration_workflow.ask_user_permission_per_batch')
+def test_batch_confirm_asks_once_per_batch(mock_ask_batch, mock_ask_table, mock_ask_bq):
+    """Test that batched interactive runs prompt once per batch, falling back to per-table review."""
+    mock_ask_batch.side_effect = ['proceed', 'review']
+    mock_ask_table.return_value = (False, False)
+    sf_client = Mock()
+    sf_client.run_cleaning_query.return_value = (True, None)
+    sf_client.run_copy_query.return_value = (True, None, 10)
+    bq_client = Mock()
+    bq_client.create_bq_table.return_value = (True, None, 10)
+    config = make_config(interactive=True)
+    config.batch_confirm = 3
+    
+    succeeded, failed = run_migration_workflow(iter(make_tables(5)), sf_client, bq_client, config)
+    
+    assert [len(c.args[0]) for c in mock_ask_batch.call_args_list] == [3, 2]
+    assert [t['table'] for t in succeeded] == ['t0', 't1', 't2']
+    mock_ask_bq.assert_not_called()
+    assert mock_ask_table.call_count == 2
+    assert [(t['table'], t['error']) for t in failed] == [('t3', 'Skipped by user'), ('t4', 'Skipped by user')]
+
+
+def test_dry_run_logs_one_record_per_table(tmp_path, caplog):
+    """Test that each table's dry-run details are emitted as a single log record."""
+    config = Mock()
+    config.create_dry_run_file.return_value = str(tmp_path / 'dry_mode.yml')
+    config.dry_run_format = 'yaml'
+    tables = [dict(t, copy_query=f"COPY INTO @stage/{t['table']}") for t in make_tables(2)]
+    
+    with caplog.at_level('INFO', logger='migration_workflow'):
+        run_dry_mode(tables, config)
+    
+    table_records = [r.getMessage() for r in caplog.records if 'Generated COPY Query' in r.getMessage()]
+    assert len(table_records) == 2
+    assert 'Table 1/2: DB.PUBLIC.t0' in table_records[0]
+    assert 'COPY INTO @stage/t0' in table_records[0]
+    assert (tmp_path / 'dry_mode.yml').exists()
+
+
+def test_dry_run_file_as_json_lines(tmp_path):
+    """Test that the jsonl dry-run format writes one JSON document per table."""
+    import json
+    from migration_workflow import write_dry_run_file
+    tables = [dict(t, copy_query=f"COPY INTO @stage/{t['table']}\nFROM x") for t in make_tables(2)]
+    dry_run_file = tmp_path / 'dry_mode.jsonl'
+    
+    write_dry_run_file(tables, str(dry_run_file), 'jsonl')
+    
+    lines = dry_run_file.read_text().splitlines()
+    assert [json.loads(line) for line in lines] == tables
+
+
+
+def test_strict_source_row_count_is_opt_in():
+    """Test that the Snowflake row count is only queried when verify_source_row_count is set."""
+    sf_client = Mock()
+    sf_client.run_cleaning_query.return_value = (True, None)
+    sf_client.run_copy_query.return_value = (True, None, 10)
+    sf_client.get_table_row_count.return_value = 12
+    bq_client = Mock()
+    bq_client.create_bq_table.return_value = (True, None, 10)
+    
+    succeeded, _ = run_migration_workflow(make_tables(1), sf_client, bq_client, make_config())
+    assert len(succeeded) == 1
+    sf_client.get_table_row_count.assert_not_called()
+    
+    config = make_config()
+    config.verify_source_row_count = True
+    _, failed = run_migration_workflow(make_tables(1), sf_client, bq_client, config)
+    assert failed[0]['error'] == 'Row count mismatch: Snowflake=12, BigQuery=10'
+
+
+@patch('migration_workflow.ask_user_for_retry', return_value='skip')
+def test_interactive_skip_after_copy_failure(mock_ask_retry):
+    """Test that choosing to skip a failed COPY gives up on the table instead of re-running it."""
+    from migration_workflow import stage_table_in_snowflake
+    sf_client = Mock()
+    sf_client.run_cleaning_query.return_value = (True, None)
+    sf_client.run_copy_query.return_value = (False, 'boom', 0)
+    
+    result = stage_table_in_snowflake(make_tables(1)[0], sf_client, make_config(interactive=True))
+    
+    assert result == (False, "Snowflake COPY failed: boom", 0)
+    sf_client.run_copy_query.assert_called_once()
+    mock_ask_retry.assert_called_once()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
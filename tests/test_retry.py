@@ -0,0 +1,54 @@
+"""
+Essential tests for the retry helper - just the main functionality.
+"""
+import pytest
+from unittest.mock import Mock, patch
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.retry import backoff_delay, retry_transient
+
+
+class TransientError(Exception):
+    pass
+
+
+@patch('utils.retry.time.sleep')
+def test_retries_transient_errors_until_success(mock_sleep):
+    """Test that transient errors are retried with a backoff sleep in between."""
+    func = Mock(side_effect=[TransientError(), TransientError(), 'done'])
+    func.__name__ = 'func'
+    wrapped = retry_transient(lambda e: isinstance(e, TransientError))(func)
+    
+    assert wrapped('arg') == 'done'
+    assert func.call_count == 3
+    assert mock_sleep.call_count == 2
+
+
+@patch('utils.retry.time.sleep')
+def test_gives_up_after_max_attempts_and_on_permanent_errors(mock_sleep):
+    """Test that the last transient error and any permanent error reach the caller."""
+    func = Mock(side_effect=TransientError())
+    func.__name__ = 'func'
+    with pytest.raises(TransientError):
+        retry_transient(lambda e: isinstance(e, TransientError), max_attempts=3)(func)()
+    assert func.call_count == 3
+    
+    func = Mock(side_effect=ValueError())
+    func.__name__ = 'func'
+    with pytest.raises(ValueError):
+        retry_transient(lambda e: isinstance(e, TransientError))(func)()
+    assert func.call_count == 1
+
+
+def test_backoff_delay_is_capped():
+    """Test that the jittered delay grows exponentially but never exceeds the cap."""
+    for attempt in range(1, 10):
+        delay = backoff_delay(attempt, initial_delay=1.0, max_delay=30.0)
+        assert 0 <= delay <= min(30.0, 2 ** (attempt - 1))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
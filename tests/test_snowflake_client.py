@@ -2,13 +2,32 @@
 Essential tests for SnowflakeClient - just the main functionality.
 """
 import pytest
-from unittest.mock import Mock, patch, mock_open
+from unittest.mock import Mock, patch
+import io
+import re
 import sys
 import os
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from snowflake.snowflake_client import SnowflakeClient, SnowflakeConnectionError
+from snowflake.snowflake_client import SnowflakeClient, SnowflakeConnectionError, close_pooled_connections
+from config import DEFAULT_SAMPLE_LIMIT
+from utils.metadata_cache import MetadataCache
+
+# Metadata rows Snowflake returns for TEST_DB.PUBLIC.MY_TABLE
+MY_TABLE_ROWS = (
+    {'DATABASE_NAME': 'TEST_DB', 'SCHEMA_NAME': 'PUBLIC', 'TABLE_NAME': 'MY_TABLE',
+     'COLUMN_NAME': 'ID', 'DATA_TYPE': 'NUMBER', 'TABLE_TYPE': 'BASE TABLE'},
+    {'DATABASE_NAME': 'TEST_DB', 'SCHEMA_NAME': 'PUBLIC', 'TABLE_NAME': 'MY_TABLE',
+     'COLUMN_NAME': 'NAME', 'DATA_TYPE': 'VARCHAR', 'TABLE_TYPE': 'BASE TABLE'},
+)
+
+# Clause order of an unsampled COPY query for TEST_DB.PUBLIC.my_table
+COPY_QUERY_CLAUSES = re.compile(
+    r'COPY INTO @\S+\nFROM \(\n\s+SELECT\n.*\n\s+FROM TEST_DB\.PUBLIC\.my_table\n\)\n'
+    r'FILE_FORMAT = \(.*\)\nOVERWRITE = TRUE\n',
+    re.DOTALL
+)
 
 
 def test_client_initialization():
@@ -18,26 +37,79 @@ def test_client_initialization():
     assert client.conn is None
 
 
-@patch('snowflake.snowflake_client.snowflake.connector.connect')
-def test_connection_context_manager(mock_connect):
+@pytest.fixture(autouse=True)
+def empty_connection_pool():
+    """Keep pooled connections from leaking between tests."""
+    close_pooled_connections()
+    yield
+    close_pooled_connections()
+
+
+def open_yaml(yaml_content):
+    """Stand-in for open() that serves yaml_content as the file's text."""
+    return lambda *args, **kwargs: io.StringIO(yaml_content)
+
+
+@pytest.fixture
+def client():
+    """Client that has not connected to Snowflake."""
+    return SnowflakeClient()
+
+
+@pytest.fixture
+def mock_connect(monkeypatch):
+    """Replace snowflake.connector.connect with a Mock for one test."""
+    connect = Mock()
+    monkeypatch.setattr('snowflake.snowflake_client.snowflake.connector.connect', connect)
+    return connect
+
+
+@pytest.fixture
+def mock_conn(mock_connect):
+    """Open connection returned by the mocked connect()."""
+    conn = Mock()
+    conn.is_closed.return_value = False
+    mock_connect.return_value = conn
+    return conn
+
+
+@pytest.fixture
+def mock_cursor(mock_conn):
+    """Cursor of the mocked connection."""
+    return mock_conn.cursor.return_value
+
+
+def test_connection_context_manager(mock_connect, mock_conn, mock_cursor):
     """Test the main connection workflow."""
-    # Setup mock
-    mock_conn = Mock()
-    mock_cursor = Mock()
-    mock_conn.cursor.return_value = mock_cursor
-    mock_connect.return_value = mock_conn
-    
     # Test context manager
     client = SnowflakeClient("test")
     with client as sf:
         assert sf.conn == mock_conn
         assert sf.cursor == mock_cursor
     
+    # The connection is kept open for the next client
+    mock_conn.close.assert_not_called()
+    with SnowflakeClient("test") as sf:
+        assert sf.conn == mock_conn
+    mock_connect.assert_called_once_with(connection_name="test", client_session_keep_alive=True)
+    
     # Verify connection was closed
+    close_pooled_connections()
     mock_conn.close.assert_called_once()
 
 
-@patch('snowflake.snowflake_client.snowflake.connector.connect')
+def test_connection_closed_when_block_fails(mock_connect, mock_conn):
+    """Test that a connection used by a failing block is closed instead of pooled."""
+    with pytest.raises(KeyboardInterrupt):
+        with SnowflakeClient("test"):
+            raise KeyboardInterrupt()
+    
+    mock_conn.close.assert_called_once()
+    with SnowflakeClient("test"):
+        pass
+    assert mock_connect.call_count == 2
+
+
 def test_connection_failure(mock_connect):
     """Test that connection failures are handled properly."""
     from snowflake.connector.errors import OperationalError
@@ -49,7 +121,50 @@ def test_connection_failure(mock_connect):
             pass
 
 
-def test_yaml_config_loading():
+def test_execute_query_streams_rows_as_dicts(client):
+    """Test that query results are fetched in batches and keyed by column name, without pandas."""
+    client.conn = Mock()
+    client.cursor = Mock()
+    client.cursor.description = [('TABLE_NAME',), ('COLUMN_NAME',)]
+    client.cursor.fetchmany.side_effect = [[('ORDERS', 'ID')], [('ORDERS', 'AMOUNT')], []]
+    
+    rows = client.execute_query("SELECT 1")
+    
+    # The query runs right away, rows are only fetched while iterating
+    client.cursor.execute.assert_called_once()
+    client.cursor.fetchmany.assert_not_called()
+    assert list(rows) == [
+        {'TABLE_NAME': 'ORDERS', 'COLUMN_NAME': 'ID'},
+        {'TABLE_NAME': 'ORDERS', 'COLUMN_NAME': 'AMOUNT'}
+    ]
+    client.cursor.fetch_pandas_all.assert_not_called()
+
+
+def test_process_query_results_consumes_a_stream(client):
+    """Test that rows are folded into tables straight from an iterator."""
+    rows = iter([
+        {'DATABASE_NAME': 'DB', 'SCHEMA_NAME': 'S', 'TABLE_NAME': 'A', 'COLUMN_NAME': 'ID',
+         'DATA_TYPE': 'NUMBER', 'TABLE_TYPE': 'BASE TABLE'},
+        {'DATABASE_NAME': 'DB', 'SCHEMA_NAME': 'S', 'TABLE_NAME': 'A', 'COLUMN_NAME': 'NAME',
+         'DATA_TYPE': 'TEXT', 'TABLE_TYPE': 'BASE TABLE'},
+        {'DATABASE_NAME': 'DB', 'SCHEMA_NAME': 'S', 'TABLE_NAME': 'B', 'COLUMN_NAME': 'ID',
+         'DATA_TYPE': 'NUMBER', 'TABLE_TYPE': 'VIEW'},
+    ])
+    
+    tables = client._process_query_results(rows)
+    
+    assert list(tables) == [('DB', 'S', 'A'), ('DB', 'S', 'B')]
+    assert tables[('DB', 'S', 'A')] == {
+        'database': 'DB', 'schema': 'S', 'table': 'A', 'table_type': 'BASE TABLE',
+        'columns': [
+            {'column_name': 'ID', 'data_type': 'NUMBER'},
+            {'column_name': 'NAME', 'data_type': 'TEXT'}
+        ]
+    }
+    assert tables[('DB', 'S', 'B')]['table_type'] == 'VIEW'
+
+
+def test_yaml_config_loading(client):
     """Test loading YAML configuration for tables."""
     yaml_content = """
     - database: TEST_DB
@@ -60,8 +175,7 @@ def test_yaml_config_loading():
       table: important_table
     """
     
-    client = SnowflakeClient()
-    with patch('builtins.open', mock_open(read_data=yaml_content)):
+    with patch('builtins.open', open_yaml(yaml_content)):
         config = client._load_yaml_config("test.yml")
     
     assert len(config) == 2
@@ -69,10 +183,8 @@ def test_yaml_config_loading():
     assert config[1]['table'] == 'important_table'
 
 
-def test_copy_query_generation():
+def test_copy_query_generation(client):
     """Test generating beautifully formatted COPY INTO queries."""
-    client = SnowflakeClient()
-    
     columns = [
         {'column_name': 'ID', 'data_type': 'NUMBER'},
         {'column_name': 'NAME', 'data_type': 'VARCHAR'},
@@ -89,20 +201,23 @@ def test_copy_query_generation():
         sample=False
     )
     
-    # Check the essential components are there (now lowercase)
-    assert 'COPY INTO @my_stage/test_db/public/my_table/' in query
-    assert '"ID" AS "id"' in query
-    assert '"CREATED_AT"::TIMESTAMP_NTZ' in query  # Timestamp casting
-    assert '"user.profile.name" AS "user_profile_name"' in query  # Dot replacement with underscore
-    assert 'PARQUET' in query
-    assert 'OVERWRITE = TRUE' in query
-    
-    # Check the new beautiful formatting structure
-    assert 'FROM (' in query  # Nested structure with parentheses
-    assert 'SELECT\n    ' in query  # Proper SELECT formatting with newline and indentation
-    assert ',\n    ' in query  # Columns separated by newlines with indentation
-    assert 'FROM TEST_DB.PUBLIC.my_table' in query  # FROM clause on separate line
-    assert ')' in query.split('FILE_FORMAT')[0]  # Closing parenthesis before file format
+    expected_parts = (
+        # Essential components (now lowercase)
+        'COPY INTO @my_stage/test_db/public/my_table/',
+        '"ID" AS "id"',
+        '"CREATED_AT"::TIMESTAMP_NTZ',                    # Timestamp casting
+        '"user.profile.name" AS "user_profile_name"',     # Dot replacement with underscore
+        'FILE_FORMAT = (TYPE = PARQUET, COMPRESSION = SNAPPY)',
+        'OVERWRITE = TRUE',
+        # Formatting structure
+        'FROM (',                                         # Nested structure with parentheses
+        'SELECT\n    ',                                   # SELECT followed by an indented column
+        ',\n    ',                                        # Columns separated by newlines with indentation
+        'FROM TEST_DB.PUBLIC.my_table',                   # FROM clause on separate line
+    )
+    missing = [part for part in expected_parts if part not in query]
+    assert not missing, f"Missing from COPY query: {missing}\n{query}"
+    assert COPY_QUERY_CLAUSES.match(query), f"COPY query clauses out of order:\n{query}"
     
     # Test with sampling to check LIMIT formatting
     query_with_sample = client.generate_copy_query(
@@ -114,14 +229,37 @@ def test_copy_query_generation():
         sample=True
     )
     assert 'LIMIT ' in query_with_sample  # LIMIT clause should be present for sampling
+    
+    uncompressed_query = client.generate_copy_query(
+        external_stage="my_stage",
+        db="TEST_DB", 
+        schema="PUBLIC",
+        table="my_table",
+        columns=columns,
+        compression="NONE"
+    )
+    assert 'COMPRESSION = NONE' in uncompressed_query
+    assert 'MAX_FILE_SIZE' not in uncompressed_query
+    
+    split_query = client.generate_copy_query(
+        external_stage="my_stage",
+        db="TEST_DB", 
+        schema="PUBLIC",
+        table="my_table",
+        columns=columns,
+        max_file_size=268435456
+    )
+    assert split_query.endswith('HEADER = TRUE\nSINGLE = FALSE\nMAX_FILE_SIZE = 268435456;')
 
 
-def test_copy_query_execution():
+def test_copy_query_execution(client):
     """Test executing COPY queries."""
-    client = SnowflakeClient()
     client.conn = Mock()
     client.cursor = Mock()
     client.current_db = "TEST_DB"
+    # COPY INTO <location> reports rows_unloaded, input_bytes, output_bytes
+    client.cursor.description = [('rows_unloaded',), ('input_bytes',), ('output_bytes',)]
+    client.cursor.fetchall.return_value = [(1500, 20480, 10240)]
     
     table_info = {
         'database': 'TEST_DB',
@@ -131,47 +269,25 @@ def test_copy_query_execution():
         'copy_query': 'COPY INTO @stage/path FROM (SELECT * FROM table)'
     }
     
-    success, error = client.run_copy_query(table_info, "my_stage")
+    success, error, rows_unloaded = client.run_copy_query(table_info, "my_stage")
     
     assert success is True
     assert error is None
+    assert rows_unloaded == 1500
     # Should call only COPY (cleaning is done separately now)
     assert client.cursor.execute.call_count >= 1
 
 
-def test_end_to_end_workflow():
+def test_end_to_end_workflow(client):
     """Test the main workflow: YAML -> tables -> queries."""
-    yaml_content = """
-    - database: TEST_DB
-      schema: PUBLIC
-    """
-    
-    # Mock query results (what Snowflake would return)
-    mock_query_results = [
-        {
-            'DATABASE_NAME': 'TEST_DB',
-            'SCHEMA_NAME': 'PUBLIC', 
-            'TABLE_NAME': 'MY_TABLE',
-            'COLUMN_NAME': 'ID',
-            'DATA_TYPE': 'NUMBER',
-            'TABLE_TYPE': 'BASE TABLE'
-        },
-        {
-            'DATABASE_NAME': 'TEST_DB',
-            'SCHEMA_NAME': 'PUBLIC',
-            'TABLE_NAME': 'MY_TABLE', 
-            'COLUMN_NAME': 'NAME',
-            'DATA_TYPE': 'VARCHAR',
-            'TABLE_TYPE': 'BASE TABLE'
-        }
-    ]
+    # The YAML parsing itself is covered by test_yaml_config_loading
+    config_items = [{'database': 'TEST_DB', 'schema': 'PUBLIC'}]
     
-    client = SnowflakeClient()
     client.conn = Mock()
     client.cursor = Mock()
     
-    with patch('builtins.open', mock_open(read_data=yaml_content)):
-        with patch.object(client, 'execute_query', return_value=mock_query_results):
+    with patch.object(client, '_load_yaml_config', return_value=config_items):
+        with patch.object(client, 'execute_query', return_value=MY_TABLE_ROWS):
             tables = client.list_tables_from_yaml("test.yml")
     
     # Should find one table with two columns
@@ -188,73 +304,298 @@ def test_end_to_end_workflow():
     assert 'COPY INTO' in tables_with_queries[0]['copy_query']
 
 
-def test_bigquery_column_normalization():
-    """Test BigQuery V2 column name normalization."""
-    client = SnowflakeClient("test_connection")
-    
-    # Test various column name normalization cases (now lowercase)
-    test_cases = [
-        # (input, expected_output)
-        ('CUSTOMER_ID', 'customer_id'),                      # already valid -> lowercase
-        ('customer.name', 'customer_name'),                  # dot replacement
-        ('user profile email', 'user_profile_email'),       # spaces
-        ('order-date', 'order_date'),                        # hyphen
-        ('2nd_priority', '_2nd_priority'),                   # starts with number
-        ('user@domain.com', 'user_domain_com'),              # special characters
-        ('"quoted.column"', 'quoted_column'),                # quoted with dot
-        ('trailing_underscores___', 'trailing_underscores'), # trailing underscores
-        ('', '_'),                                            # empty string -> _ (not _column)
-        ('_TABLE_reserved', '_table_reserved_'),              # reserved prefix -> lowercase
+def test_iter_tables_from_yaml_yields_each_table_once(client):
+    """Test that tables matched by several config items are streamed only once."""
+    yaml_content = """
+- database: TEST_DB
+  schema: PUBLIC
+- database: TEST_DB
+  schema: PUBLIC
+  table: MY_TABLE
+"""
+    
+    client.conn = Mock()
+    client.cursor = Mock()
+    
+    with patch('builtins.open', open_yaml(yaml_content)):
+        with patch.object(client, 'execute_query', return_value=MY_TABLE_ROWS[:1]) as mock_execute:
+            table_stream = client.iter_tables_from_yaml("test.yml")
+            first = next(table_stream)
+            # Both items target TEST_DB, so they share one metadata query
+            assert mock_execute.call_count == 1
+            rest = list(table_stream)
+    
+    assert first['table'] == 'MY_TABLE'
+    assert rest == []
+    
+    tables_with_queries = list(client.iter_copy_queries([first], "my_stage"))
+    assert 'COPY INTO' in tables_with_queries[0]['copy_query']
+
+
+def test_iter_tables_from_yaml_queries_each_database_once(client):
+    """Test that config items are grouped into one metadata query per database."""
+    yaml_content = """
+- database: DB_A
+  schema: SALES
+- database: DB_B
+- database: DB_A
+  schema: HR
+  table: EMPLOYEES
+  with_views: true
+"""
+    
+    client.conn = Mock()
+    client.cursor = Mock()
+    
+    with patch('builtins.open', open_yaml(yaml_content)):
+        with patch.object(client, 'execute_query', return_value=[]) as mock_execute:
+            assert client.list_tables_from_yaml("test.yml") == []
+    
+    assert mock_execute.call_count == 2
+    # Databases are queried concurrently, so the call order is not fixed
+    calls = sorted((call.args for call in mock_execute.call_args_list), key=lambda args: args[1][0])
+    (db_a_query, db_a_params), (db_b_query, db_b_params) = calls
+    
+    assert "(t.table_type = %s AND c.table_schema = %s) OR (c.table_schema = %s AND c.table_name = %s)" in db_a_query
+    assert db_a_params == [
+        'DB_A.INFORMATION_SCHEMA.COLUMNS', 'DB_A.INFORMATION_SCHEMA.TABLES',
+        'BASE TABLE', 'SALES', 'HR', 'EMPLOYEES'
+    ]
+    assert "WHERE (t.table_type = %s) ORDER BY" in db_b_query
+    # Both databases share the query template, only the bind values differ
+    assert db_a_query.split(" WHERE ")[0] == db_b_query.split(" WHERE ")[0]
+    assert db_b_params == ['DB_B.INFORMATION_SCHEMA.COLUMNS', 'DB_B.INFORMATION_SCHEMA.TABLES', 'BASE TABLE']
+
+
+def test_exclude_patterns_use_like_any(client):
+    """Test that exclude patterns become one NOT LIKE ANY condition per column."""
+    where_clauses, params = client._build_item_conditions({
+        'database': 'DB',
+        'with_views': True,
+        'exclude_schema_like': ['tmp_%'],
+        'exclude_table_like': ['%_old', '', 'bak_%'],
+    })
+    
+    assert where_clauses == [
+        "NOT (c.table_schema LIKE ANY (%s))",
+        "NOT (c.table_name LIKE ANY (%s, %s))"
     ]
+    assert params == ['TMP_%', '%_OLD', 'BAK_%']
+
+
+def test_iter_tables_from_yaml_queries_databases_on_separate_cursors(client):
+    """Test that concurrent database queries use their own pooled cursors and yield in config order."""
+    import threading
+    yaml_content = """
+- database: DB_A
+- database: DB_B
+"""
+    both_queries_running = threading.Barrier(2, timeout=5)
+    
+    def results_for(query, params, cursor=None):
+        both_queries_running.wait()
+        database = params[0].split('.')[0]
+        return [{
+            'DATABASE_NAME': database,
+            'SCHEMA_NAME': 'PUBLIC',
+            'TABLE_NAME': 'T',
+            'COLUMN_NAME': 'ID',
+            'DATA_TYPE': 'NUMBER',
+            'TABLE_TYPE': 'BASE TABLE'
+        }]
+    
+    client.conn = Mock()
+    client.conn.cursor.side_effect = lambda: Mock()
+    client.cursor = Mock()
+    
+    with patch('builtins.open', open_yaml(yaml_content)):
+        with patch.object(client, 'execute_query', side_effect=results_for) as mock_execute:
+            tables = client.list_tables_from_yaml("test.yml")
+            # A second pass reuses the idle cursors
+            client.list_tables_from_yaml("test.yml")
+    
+    assert [table['database'] for table in tables] == ['DB_A', 'DB_B']
+    cursors = {id(call.kwargs['cursor']): call.kwargs['cursor'] for call in mock_execute.call_args_list}
+    assert len(cursors) == 2
+    assert client.conn.cursor.call_count == 2
+    
+    client.__exit__(None, None, None)
+    for cursor in cursors.values():
+        cursor.close.assert_called_once()
+
+
+def test_iter_tables_from_yaml_uses_metadata_cache(tmp_path):
+    """Test that cached metadata is reused by the next run instead of querying Snowflake."""
+    config_items = [{'database': 'TEST_DB', 'schema': 'PUBLIC'}]
+    
+    def run_once():
+        client = SnowflakeClient(metadata_cache=MetadataCache(directory=str(tmp_path), ttl_seconds=60))
+        client.conn = Mock()
+        client.cursor = Mock()
+        with patch.object(client, '_load_yaml_config', return_value=config_items):
+            with patch.object(client, 'execute_query', return_value=MY_TABLE_ROWS[:1]) as mock_execute:
+                tables = client.list_tables_from_yaml("test.yml")
+        return tables, mock_execute.call_count
     
-    for input_name, expected in test_cases:
-        result = client._normalize_column_name_for_bigquery(input_name)
-        assert result == expected, f"Expected {input_name} -> {expected}, got {result}"
+    first_tables, first_queries = run_once()
+    second_tables, second_queries = run_once()
+    
+    assert first_queries == 1
+    assert second_queries == 0
+    assert second_tables == first_tables
+    assert second_tables[0]['columns'] == [{'column_name': 'ID', 'data_type': 'NUMBER'}]
 
 
-def test_column_expression_with_normalization():
+def test_copy_queries_sample_limit(client):
+    """Test that sampled COPY queries use the given limit, falling back to the config default."""
+    def make_tables():
+        return [
+            {'database': 'TEST_DB', 'schema': 'PUBLIC', 'table': f'T{i}',
+             'columns': [{'column_name': 'ID', 'data_type': 'NUMBER'}]}
+            for i in range(2)
+        ]
+    
+    tables = client.generate_copy_queries(make_tables(), "my_stage", sample=True, sample_limit=7)
+    assert all(t['copy_query'].count('LIMIT 7') == 1 for t in tables)
+    
+    # The SAMPLE_LIMIT environment variable is read by MigrationConfig, not by the client
+    with patch.dict(os.environ, {'SAMPLE_LIMIT': '5'}):
+        tables = client.generate_copy_queries(make_tables(), "my_stage", sample=True)
+    assert all(f'LIMIT {DEFAULT_SAMPLE_LIMIT}' in t['copy_query'] for t in tables)
+
+
+@pytest.mark.parametrize("input_name,expected", [
+    ('CUSTOMER_ID', 'customer_id'),                      # already valid -> lowercase
+    ('customer.name', 'customer_name'),                  # dot replacement
+    ('user profile email', 'user_profile_email'),        # spaces
+    ('order-date', 'order_date'),                        # hyphen
+    ('2nd_priority', '_2nd_priority'),                   # starts with number
+    ('user@domain.com', 'user_domain_com'),              # special characters
+    ('"quoted.column"', 'quoted_column'),                # quoted with dot
+    ('trailing_underscores___', 'trailing_underscores'), # trailing underscores
+    ('', '_'),                                           # empty string -> _ (not _column)
+    ('_TABLE_reserved', '_table_reserved_'),             # reserved prefix -> lowercase
+    ('a' + '_' * 50 + 'b', 'a_b'),                       # long underscore run collapsed
+    ('a - . - b', 'a_b'),                                # mixed special characters collapsed
+    ('café', 'café'),                                    # non-ASCII letters kept
+])
+def test_bigquery_column_normalization(input_name, expected):
+    """Test BigQuery V2 column name normalization."""
+    assert SnowflakeClient._normalize_column_name_for_bigquery(input_name) == expected
+
+
+@pytest.mark.parametrize("column,cast_timestamp_to_string,expected", [
+    ({'column_name': 'customer.id', 'data_type': 'INTEGER'}, False,
+     '"customer.id" AS "customer_id"'),
+    ({'column_name': 'order.date', 'data_type': 'TIMESTAMP_TZ'}, True,
+     '"order.date"::TIMESTAMP_NTZ AS "order_date"'),
+    ({'column_name': 'user email@domain', 'data_type': 'VARCHAR'}, False,
+     '"user email@domain" AS "user_email_domain"'),
+])
+def test_column_expression_with_normalization(column, cast_timestamp_to_string, expected):
     """Test column expression building with BigQuery V2 normalization."""
-    client = SnowflakeClient("test_connection")
+    assert SnowflakeClient._build_column_expression(column, cast_timestamp_to_string=cast_timestamp_to_string) == expected
+
+
+def test_column_expressions_are_cached_across_tables(client):
+    """Test that a column shared by several tables is only built once."""
+    from snowflake.snowflake_client import _column_expression
+    _column_expression.cache_clear()
     
-    # Test regular column (now lowercase)
-    column = {'column_name': 'customer.id', 'data_type': 'INTEGER'}
-    expression = client._build_column_expression(column, cast_timestamp_to_string=False)
-    expected = '"customer.id" AS "customer_id"'
-    assert expression == expected, f"Expected: {expected}, got: {expression}"
+    for table in ('orders', 'customers', 'invoices'):
+        client.generate_copy_query("stage", "DB", "PUBLIC", table,
+                                   [{'column_name': 'created.at', 'data_type': 'TIMESTAMP_TZ'}])
+    
+    info = _column_expression.cache_info()
+    assert (info.misses, info.hits) == (1, 2)
+
+
+@patch('utils.retry.time.sleep')
+def test_copy_query_retries_connection_errors(mock_sleep, mock_cursor):
+    """Test that a COPY failing on a transient connection error is executed again."""
+    from snowflake.connector.errors import OperationalError
+    mock_cursor.execute.side_effect = [None, OperationalError("connection reset"), None]
+    mock_cursor.description = [('rows_unloaded',)]
+    mock_cursor.fetchall.return_value = [(3,)]
     
-    # Test timestamp column with casting (now lowercase)
-    timestamp_column = {'column_name': 'order.date', 'data_type': 'TIMESTAMP_TZ'}
-    expression = client._build_column_expression(timestamp_column, cast_timestamp_to_string=True)
-    expected = '"order.date"::TIMESTAMP_NTZ AS "order_date"'
-    assert expression == expected, f"Expected: {expected}, got: {expression}"
+    table_info = {'database': 'DB', 'schema': 'PUBLIC', 'table': 'T', 'copy_query': 'COPY INTO @stage/t FROM t'}
+    with SnowflakeClient("test") as client:
+        assert client.run_copy_query(table_info, "my_stage") == (True, None, 3)
     
-    # Test column with special characters (now lowercase)
-    special_column = {'column_name': 'user email@domain', 'data_type': 'VARCHAR'}
-    expression = client._build_column_expression(special_column, cast_timestamp_to_string=False)
-    expected = '"user email@domain" AS "user_email_domain"'
-    assert expression == expected, f"Expected: {expected}, got: {expression}"
+    # USE DATABASE, then the COPY twice
+    assert mock_cursor.execute.call_count == 3
+    mock_sleep.assert_called_once()
 
 
-@patch('snowflake.snowflake_client.snowflake.connector.connect')
-def test_get_table_row_count(mock_connect):
+def test_fully_qualified_stage_skips_use_database(mock_cursor):
+    """Test that no USE DATABASE is issued when the stage name includes database and schema."""
+    mock_cursor.description = [('rows_unloaded',)]
+    mock_cursor.fetchall.return_value = [(3,)]
+    
+    table_info = {'database': 'DB', 'schema': 'PUBLIC', 'table': 'T',
+                  'cleaning_query': 'REMOVE @STAGE_DB.PUBLIC.stage/t/',
+                  'copy_query': 'COPY INTO @STAGE_DB.PUBLIC.stage/t/ FROM t'}
+    with SnowflakeClient("test") as client:
+        assert client.run_cleaning_query(table_info, "STAGE_DB.PUBLIC.stage") == (True, None)
+        assert client.run_copy_query(table_info, "STAGE_DB.PUBLIC.stage") == (True, None, 3)
+    
+    executed = [call.args[0] for call in mock_cursor.execute.call_args_list]
+    assert executed == [table_info['cleaning_query'], table_info['copy_query']]
+
+
+def test_get_table_row_count(mock_cursor):
     """Test getting row count from Snowflake table."""
-    mock_conn = Mock()
-    mock_cursor = Mock()
     mock_cursor.fetchone.return_value = [5000]
-    mock_conn.cursor.return_value = mock_cursor
-    mock_connect.return_value = mock_conn
     
     client = SnowflakeClient("test")
     
     with client:
-        count = client.get_table_row_count("PROD", "ANALYTICS", "SALES")
+        count = client.get_table_row_count("PROD", "ANALYTICS", "SALES", exact=True)
     
     assert count == 5000
     mock_cursor.execute.assert_called_once()
-    call_args = mock_cursor.execute.call_args[0][0]
-    assert "SELECT COUNT(*) as count FROM PROD.ANALYTICS.SALES" in call_args
+    query, params = mock_cursor.execute.call_args.args
+    assert "SELECT COUNT(*) as count FROM IDENTIFIER(%s)" in query
+    assert params == ("PROD.ANALYTICS.SALES",)
+
+
+def test_get_table_row_counts_from_metadata(mock_cursor):
+    """Test that row counts come from INFORMATION_SCHEMA metadata, one query per database."""
+    mock_cursor.fetchall.side_effect = [
+        [('ANALYTICS', 'SALES', 5000), ('ANALYTICS', 'USERS', 20)],
+        [('RAW', 'EVENTS', 7)],
+    ]
+    
+    tables = [
+        {'database': 'PROD', 'schema': 'ANALYTICS', 'table': 'SALES'},
+        {'database': 'PROD', 'schema': 'ANALYTICS', 'table': 'USERS'},
+        {'database': 'STAGING', 'schema': 'RAW', 'table': 'EVENTS'},
+    ]
+    
+    with SnowflakeClient("test") as client:
+        counts = client.get_table_row_counts(tables)
+    
+    assert counts == {
+        ('PROD', 'ANALYTICS', 'SALES'): 5000,
+        ('PROD', 'ANALYTICS', 'USERS'): 20,
+        ('STAGING', 'RAW', 'EVENTS'): 7,
+    }
+    assert mock_cursor.execute.call_count == 2
+    query, params = mock_cursor.execute.call_args_list[0].args
+    assert "FROM IDENTIFIER(%s)" in query
+    assert params == ['PROD.INFORMATION_SCHEMA.TABLES', 'ANALYTICS', 'SALES', 'ANALYTICS', 'USERS']
+
+
+def test_get_table_row_count_falls_back_to_count_for_views(mock_cursor):
+    """Test that a table without metadata row count (e.g. a view) is counted with COUNT(*)."""
+    mock_cursor.fetchall.return_value = []
+    mock_cursor.fetchone.return_value = [42]
+    
+    with SnowflakeClient("test") as client:
+        assert client.get_table_row_count("PROD", "ANALYTICS", "SALES_VIEW") == 42
+    
+    assert "COUNT(*)" in mock_cursor.execute.call_args.args[0]
 
 
 if __name__ == "__main__":
-    logger.info("Running essential SnowflakeClient tests...")
     pytest.main([__file__, "-v"])
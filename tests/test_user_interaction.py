@@ -0,0 +1,288 @@
+"""
+Essential tests for user interaction helpers - just the main functionality.
+"""
+import pytest
+from unittest.mock import Mock, patch
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils import user_interaction
+from utils.user_interaction import _get_available_columns, _get_partition_eligible_columns
+
+
+def make_table_info():
+    return {
+        'database': 'DB', 'schema': 'PUBLIC', 'table': 'ORDERS',
+        'columns': [
+            {'column_name': 'ID', 'data_type': 'NUMBER'},
+            {'column_name': 'CREATED_AT', 'data_type': 'TIMESTAMP_NTZ'},
+        ],
+        'copy_query': 'COPY INTO @stage/db/public/orders/\nFROM (\n    SELECT\n        "ID" AS "id",\n'
+                      '        "CREATED_AT" AS "created_at"\n    FROM DB.PUBLIC.ORDERS\n)',
+    }
+
+
+def test_schema_inference_is_cached_until_copy_query_changes():
+    """Test that the edit menus reuse the inferred schema and re-infer after a COPY query edit."""
+    user_interaction._infer_schema_fields_cached.cache_clear()
+    table_info = make_table_info()
+    
+    with patch('bigquery.bigquery_client.BigQueryClient.infer_schema_from_table_info',
+               autospec=True, side_effect=lambda self, info: []) as mock_infer:
+        _get_available_columns(table_info)
+        _get_partition_eligible_columns(table_info)
+        assert mock_infer.call_count == 1
+        
+        table_info['copy_query'] += '\nLIMIT 10'
+        _get_available_columns(table_info)
+        assert mock_infer.call_count == 2
+
+
+def test_available_and_partition_columns():
+    """Test that inferred columns are projected into the menu shapes."""
+    user_interaction._infer_schema_fields_cached.cache_clear()
+    table_info = make_table_info()
+    
+    available = _get_available_columns(table_info)
+    eligible = _get_partition_eligible_columns(table_info)
+    
+    assert [column['name'] for column in available] == ['id', 'created_at']
+    assert eligible == [{'name': 'created_at', 'type': 'TIMESTAMP', 'display': 'created_at (TIMESTAMP)'}]
+
+
+def test_custom_schema_skips_inference():
+    """Test that column menus read an existing custom schema instead of inferring one."""
+    table_info = make_table_info()
+    table_info['custom_schema'] = '[{"name": "id", "type": "INTEGER"}, {"name": "day", "type": "date"}]'
+    
+    with patch.object(user_interaction, '_infer_schema_fields') as mock_infer:
+        available = _get_available_columns(table_info)
+        eligible = _get_partition_eligible_columns(table_info)
+    
+    mock_infer.assert_not_called()
+    assert [column['display'] for column in available] == ['id (INTEGER)', 'day (DATE)']
+    assert [column['name'] for column in eligible] == ['day']
+
+
+@patch('utils.user_interaction.inquirer.prompt')
+def test_partition_then_cluster_infers_schema_once(mock_prompt):
+    """Test that editing partitioning and clustering infers the schema a single time."""
+    user_interaction._infer_schema_fields_cached.cache_clear()
+    table_info = make_table_info()
+    mock_prompt.side_effect = [
+        {'partition_choice': 'created_at (TIMESTAMP)', 'partition_type': 'DAY'},
+        {'column_choice': 'id (NUMERIC)'},
+        {'column_choice': '(Done - finish selection)'},
+    ]
+    
+    with patch.object(user_interaction, '_infer_schema_fields', wraps=user_interaction._infer_schema_fields) as mock_infer:
+        assert user_interaction.edit_partition_key(table_info) is True
+        assert user_interaction.edit_cluster_keys(table_info) is True
+    
+    assert mock_infer.call_count == 1
+    assert 'custom_schema' in table_info
+    assert table_info['cluster_fields'] == ['id']
+
+
+def test_bigquery_client_is_created_once():
+    """Test that schema inference reuses one offline BigQueryClient."""
+    user_interaction._infer_schema_fields_cached.cache_clear()
+    
+    with patch.object(user_interaction, '_BQ_CLIENT', None), \
+         patch('bigquery.bigquery_client.BigQueryClient.__init__', return_value=None) as mock_init, \
+         patch('bigquery.bigquery_client.BigQueryClient.infer_schema_from_table_info', return_value=[]):
+        table_info = make_table_info()
+        _get_available_columns(table_info)
+        table_info['copy_query'] += '\nLIMIT 10'
+        _get_available_columns(table_info)
+        
+        mock_init.assert_called_once_with('dummy-project', 'gs://dummy-bucket')
+
+
+def test_resolve_editor_uses_path_lookup_once():
+    """Test that the fallback editor is found without spawning processes and only once."""
+    user_interaction._resolve_editor.cache_clear()
+    
+    with patch('utils.user_interaction.os.name', 'posix'), \
+         patch('utils.user_interaction.shutil.which', side_effect=lambda name: '/usr/bin/nano' if name == 'nano' else None) as mock_which, \
+         patch('utils.user_interaction.subprocess.run') as mock_run:
+        assert user_interaction._resolve_editor() == 'nano'
+        assert user_interaction._resolve_editor() == 'nano'
+        
+        assert mock_which.call_count == 3
+        mock_run.assert_not_called()
+    
+    user_interaction._resolve_editor.cache_clear()
+
+
+def fake_editor(new_text):
+    """Build a subprocess.run side effect that 'edits' the file by overwriting it."""
+    def run(args, **kwargs):
+        with open(args[-1], 'w') as f:
+            f.write(new_text)
+        return Mock(returncode=0)
+    return run
+
+
+def test_edit_copy_query_stores_edited_query():
+    """Test that an edited COPY query is stored and asks for a retry."""
+    table_info = make_table_info()
+    
+    with patch.dict(os.environ, {'EDITOR': 'fake-editor'}), \
+         patch('utils.user_interaction.subprocess.run', side_effect=fake_editor('COPY INTO @other\n')):
+        with patch.object(user_interaction, 'logger') as mock_logger:
+            assert user_interaction.edit_copy_query(table_info) is True
+    
+    assert table_info['copy_query'] == 'COPY INTO @other'
+    mock_logger.debug.assert_called_once_with("New %s stored: %s", "copy query", 'COPY INTO @other')
+    assert all('COPY INTO @other' not in str(call) for call in mock_logger.info.call_args_list)
+
+
+def test_edit_cleaning_query_empty_skips():
+    """Test that saving an empty cleaning query skips the table and keeps the old query."""
+    table_info = make_table_info()
+    table_info['cleaning_query'] = 'REMOVE @stage/db/public/orders/'
+    
+    with patch.dict(os.environ, {'EDITOR': 'fake-editor'}), \
+         patch('utils.user_interaction.subprocess.run', side_effect=fake_editor('')):
+        assert user_interaction.edit_cleaning_query(table_info) is False
+    
+    assert table_info['cleaning_query'] == 'REMOVE @stage/db/public/orders/'
+
+
+def test_edit_empty_cleaning_query_skips_write():
+    """Test that an empty query opens an empty file without writing to it."""
+    table_info = make_table_info()
+    
+    with patch.dict(os.environ, {'EDITOR': 'fake-editor'}), \
+         patch('utils.user_interaction.os.write') as mock_write, \
+         patch('utils.user_interaction.subprocess.run', side_effect=fake_editor('REMOVE @stage/db/')):
+        assert user_interaction.edit_cleaning_query(table_info) is True
+    
+    mock_write.assert_not_called()
+    assert table_info['cleaning_query'] == 'REMOVE @stage/db/'
+
+
+def test_edit_schema_rejects_invalid_json():
+    """Test that invalid JSON from the editor leaves custom_schema unset."""
+    table_info = make_table_info()
+    
+    with patch.dict(os.environ, {'EDITOR': 'fake-editor'}), \
+         patch('utils.user_interaction.subprocess.run', side_effect=fake_editor('[{"name": ')):
+        assert user_interaction.edit_schema(table_info) is False
+    
+    assert 'custom_schema' not in table_info
+
+
+@patch('utils.user_interaction.inquirer.prompt', return_value={'action': 'proceed'})
+def test_verbose_table_prompt_logs_queries_once(mock_prompt):
+    """Test that verbose mode shows both queries in a single log record."""
+    table_info = make_table_info()
+    table_info['cleaning_query'] = 'REMOVE @stage/db/public/orders/'
+    
+    with patch.object(user_interaction, 'logger') as mock_logger:
+        mock_logger.isEnabledFor.return_value = True
+        result = user_interaction.ask_user_permission_per_table(table_info, verbose=True)
+    
+    assert result == (True, False)
+    mock_logger.info.assert_called_once()
+    message = mock_logger.info.call_args[0][0]
+    assert 'Table: DB.PUBLIC.ORDERS' in message
+    assert 'REMOVE @stage/db/public/orders/' in message
+    assert 'COPY INTO @stage/db/public/orders/' in message
+
+
+@pytest.mark.parametrize("step_name,expected", [
+    ("COPY query", user_interaction.RETRY_CHOICES_WITH_EDIT),
+    ("BigQuery table creation", user_interaction.RETRY_CHOICES),
+])
+@patch('utils.user_interaction.inquirer.List')
+@patch('utils.user_interaction.inquirer.prompt', return_value={'action': 'retry'})
+def test_retry_choices_depend_on_step(mock_prompt, mock_list, step_name, expected):
+    """Test that only query steps offer editing on retry."""
+    assert user_interaction.ask_user_for_retry(make_table_info(), step_name) == 'retry'
+    assert mock_list.call_args.kwargs['choices'] is expected
+
+
+@patch('utils.user_interaction.inquirer.prompt')
+def test_edit_partition_key_selects_column(mock_prompt):
+    """Test that the chosen partition column and type are stored."""
+    table_info = make_table_info()
+    table_info['custom_schema'] = '[{"name": "id", "type": "INTEGER"}, {"name": "created_at", "type": "TIMESTAMP"}]'
+    mock_prompt.return_value = {'partition_choice': 'created_at (TIMESTAMP)', 'partition_type': 'MONTH'}
+    
+    assert user_interaction.edit_partition_key(table_info) is True
+    mock_prompt.assert_called_once()
+    assert table_info['partition_field'] == 'created_at'
+    assert table_info['partition_type'] == 'MONTH'
+
+
+def test_edit_partition_key_form_skips_type_when_removing():
+    """Test that the partition type question only applies when a column is chosen."""
+    table_info = make_table_info()
+    table_info['custom_schema'] = '[{"name": "created_at", "type": "TIMESTAMP"}]'
+    table_info['partition_field'] = 'created_at'
+    
+    with patch('utils.user_interaction.inquirer.prompt') as mock_prompt:
+        mock_prompt.return_value = {'partition_choice': '(Remove partitioning)'}
+        assert user_interaction.edit_partition_key(table_info) is True
+    
+    type_question = mock_prompt.call_args[0][0][1]
+    assert type_question.name == 'partition_type'
+    type_question.answers = {'partition_choice': '(Remove partitioning)'}
+    assert type_question.ignore is True
+    type_question.answers = {'partition_choice': 'created_at (TIMESTAMP)'}
+    assert type_question.ignore is False
+    assert type_question.message == 'Partition type for created_at (TIMESTAMP)'
+    assert 'partition_field' not in table_info
+
+
+@patch('utils.user_interaction.inquirer.prompt')
+def test_edit_cluster_keys_keeps_selection_order(mock_prompt):
+    """Test that cluster columns are stored in the order they were picked."""
+    table_info = make_table_info()
+    table_info['custom_schema'] = '[{"name": "id", "type": "INTEGER"}, {"name": "created_at", "type": "TIMESTAMP"}]'
+    mock_prompt.side_effect = [
+        {'column_choice': 'created_at (TIMESTAMP)'},
+        {'column_choice': 'id (INTEGER)'},
+    ]
+    
+    assert user_interaction.edit_cluster_keys(table_info) is True
+    assert table_info['cluster_fields'] == ['created_at', 'id']
+
+
+def test_edited_schema_is_parsed_once():
+    """Test that the schema saved in the editor is not parsed again by the column menus."""
+    user_interaction._parse_custom_schema.cache_clear()
+    table_info = make_table_info()
+    edited = '[{"name": "id", "type": "INTEGER"}, {"name": "created_at", "type": "TIMESTAMP"}]'
+    
+    with patch.dict(os.environ, {'EDITOR': 'fake-editor'}), \
+         patch('utils.user_interaction.subprocess.run', side_effect=fake_editor(edited)):
+        assert user_interaction.edit_schema(table_info) is True
+    
+    with patch('utils.user_interaction.json.loads') as mock_loads:
+        eligible = _get_partition_eligible_columns(table_info)
+    
+    mock_loads.assert_not_called()
+    assert [column['name'] for column in eligible] == ['created_at']
+
+
+@patch('utils.user_interaction.inquirer.List')
+@patch('utils.user_interaction.inquirer.prompt')
+def test_edit_cluster_keys_offers_only_unselected_columns(mock_prompt, mock_list):
+    """Test that picked columns leave the menu and a single-column table can still be clustered."""
+    table_info = make_table_info()
+    table_info['custom_schema'] = '[{"name": "id", "type": "INTEGER"}]'
+    mock_prompt.side_effect = [{'column_choice': 'id (INTEGER)'}]
+    
+    assert user_interaction.edit_cluster_keys(table_info) is True
+    assert table_info['cluster_fields'] == ['id']
+    assert mock_list.call_count == 1
+    assert mock_list.call_args.kwargs['choices'] == ['(Remove all clustering)', 'id (INTEGER)']
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])